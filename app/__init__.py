@@ -18,6 +18,43 @@ except ImportError as e:
 
 db = SQLAlchemy() 
 
+MIGRATED_COLUMNS = (  # Kolom yang ditambahkan setelah tabel dibuat: (tabel, kolom)
+    ('preprocessing', 'source_hash'),
+    ('preprocessing', 'text_key'),
+    ('preprocessing', 'lexicon_score'),
+    ('preprocessing', 'lexicon_polarity'),
+    ('preprocessing', 'lexicon_terms'),
+    ('data_pakar', 'text_key'),
+)
+
+def add_missing_columns():
+    # db.create_all() tidak menambah kolom ke tabel lama; tambahkan kolom MIGRATED_COLUMNS yang belum ada
+    from sqlalchemy import inspect, text
+    inspector = inspect(db.engine)
+    quote = db.engine.dialect.identifier_preparer.quote
+    for table_name, column_name in MIGRATED_COLUMNS:
+        if not inspector.has_table(table_name):
+            continue
+        if column_name in {col['name'] for col in inspector.get_columns(table_name)}:
+            continue
+        table = db.metadata.tables[table_name]
+        column_type = table.c[column_name].type.compile(dialect=db.engine.dialect)
+        db.session.execute(text(f"ALTER TABLE {quote(table_name)} ADD COLUMN {quote(column_name)} {column_type}"))
+        db.session.commit()
+        for index in table.indexes:
+            if column_name in index.columns:
+                index.create(bind=db.engine, checkfirst=True)
+
+def backfill_text_keys(chunk_size=1000):
+    # Isi text_key untuk baris lama (sebelum kolom ada); setelah sekali jalan kueri ini tidak menemukan baris lagi
+    from .models import Preprocessing, DataPakar, normalized_text_key
+    for model in (Preprocessing, DataPakar):
+        rows = db.session.query(model.id, model.full_text).filter(model.text_key.is_(None)).all()
+        updates = [{'id': row.id, 'text_key': normalized_text_key(row.full_text)} for row in rows]
+        for start in range(0, len(updates), chunk_size):
+            db.session.bulk_update_mappings(model, updates[start:start + chunk_size])
+    db.session.commit()
+
 def create_app(config_name='default'):
     app = Flask(__name__, 
                 static_folder='static', 
@@ -44,6 +81,21 @@ def create_app(config_name='default'):
 
     db.init_app(app)
 
+    # Registry model bersama: model & vectorizer tersimpan dimuat sekali dan dimuat ulang bila file berubah
+    from .module.model_registry import ModelRegistry
+    app.extensions['model_registry'] = ModelRegistry(app.config['MODEL_FOLDER_PATH'])
+    # Kamus sentimen bersama: diparse sekali dan dimuat ulang hanya bila file CSV di KAMUS_FOLDER_PATH berubah
+    from .module.labelling import LexiconService
+    app.extensions['lexicon_service'] = LexiconService(app.config['KAMUS_FOLDER_PATH'])
+    # Statistik label (GROUP BY) disimpan di cache dan dihitung ulang hanya setelah label/data berubah
+    from .module.label_stats import LabelStatsService
+    app.extensions['label_stats'] = LabelStatsService()
+    # Micro-batcher untuk /api/predict: permintaan kecil yang bersamaan digabung menjadi satu panggilan model
+    from .module.micro_batching import MicroBatcher
+    app.extensions['micro_batcher'] = MicroBatcher(app.extensions['model_registry'],
+                                                   app.config.get('PREDICT_BATCH_WINDOW_MS', 5),
+                                                   app.config.get('PREDICT_MAX_BATCH', 256))
+
     # Impor dan daftarkan Blueprints
     from .routes.main_routes import main_bp
     from .routes.dataset_routes import dataset_bp
@@ -58,6 +110,7 @@ def create_app(config_name='default'):
     from .routes.svm_classification_routes import svm_classification_bp
     
     from .routes.utility_routes import utility_bp
+    from .routes.api_routes import api_bp
     from .routes.comparison_routes import comparison_bp
 
     app.register_blueprint(main_bp) 
@@ -72,8 +125,11 @@ def create_app(config_name='default'):
     app.register_blueprint(comparison_bp, url_prefix='/compare')
     
     app.register_blueprint(utility_bp, url_prefix='/utils')
+    app.register_blueprint(api_bp, url_prefix='/api')
     app.register_blueprint(kesimpulan_bp)
     with app.app_context():
         db.create_all()
+        add_missing_columns()
+        backfill_text_keys()
 
     return app
\ No newline at end of file
@@ -6,11 +6,20 @@ import numpy as np
 from scipy import sparse
 import os
 import json
+import hashlib
 
 def get_wib_time():
     """Get current time in WIB (UTC+7)"""
     return datetime.utcnow() + timedelta(hours=7)
 
+def normalized_text_key(text):
+    """Kunci full_text ternormalisasi (strip + casefold, SHA-1) yang menautkan Preprocessing dan DataPakar"""
+    return hashlib.sha1((text or '').strip().casefold().encode('utf-8')).hexdigest()
+
+def text_key_default(context):
+    # Default kolom text_key saat INSERT (termasuk insert massal): dihitung dari full_text baris yang sama
+    return normalized_text_key(context.get_current_parameters().get('full_text'))
+
 class Dataset(db.Model):
     __tablename__ = 'dataset'
     id = db.Column(db.Integer, primary_key=True)
@@ -44,6 +53,11 @@ class Preprocessing(db.Model):
     text_stem = db.Column(db.Text, nullable=True)
     created_at = db.Column(db.String(255), nullable=True)
     label_otomatis = db.Column(db.String(50), nullable=True)
+    source_hash = db.Column(db.String(40), nullable=True, index=True)  # Sidik jari full_text + versi pipeline (preprocessing inkremental)
+    text_key = db.Column(db.String(40), nullable=True, index=True, default=text_key_default)  # Kunci full_text ternormalisasi (join ke DataPakar)
+    lexicon_score = db.Column(db.Integer, nullable=True)  # Skor lexicon saat pelabelan otomatis
+    lexicon_polarity = db.Column(db.String(50), nullable=True)  # Polaritas dari skor lexicon
+    lexicon_terms = db.Column(db.Text, nullable=True)  # JSON [istilah, bobot, negasi] yang membentuk skor (penjelasan di halaman label)
     klasifikasi_nbs = db.relationship('KlasifikasiNB', backref='preprocessing', lazy=True)
     klasifikasi_svms = db.relationship('KlasifikasiSVM', backref='preprocessing', lazy=True)
 
@@ -58,6 +72,14 @@ class Preprocessing(db.Model):
         db.session.delete(self)
         db.session.commit()
 
+class PreprocessingSkip(db.Model):
+    __tablename__ = 'preprocessing_skip'
+    # Sidik jari teks yang sudah diproses tetapi hasilnya kosong (tidak disimpan di Preprocessing)
+    source_hash = db.Column(db.String(40), primary_key=True)
+
+    def __repr__(self):
+        return f'<PreprocessingSkip {self.source_hash}>'
+
 class DataPakar(db.Model):
     __tablename__ = 'data_pakar'
     id = db.Column(db.Integer, primary_key=True)
@@ -69,6 +91,7 @@ class DataPakar(db.Model):
     text_stem = db.Column(db.Text, nullable=True)
     created_at = db.Column(db.String(255), nullable=True)
     label = db.Column(db.String(50), nullable=False)
+    text_key = db.Column(db.String(40), nullable=True, index=True, default=text_key_default)  # Kunci full_text ternormalisasi (join ke Preprocessing)
 
     def __repr__(self):
         return f'<DataPakar {self.id}: {self.label}>'
@@ -85,8 +108,8 @@ class DataPakar(db.Model):
 # 1. Hapus baris 'from app.models import ...' yang menyebabkan circular import.
 # 2. Perbaiki variabel __all__ agar mencakup semua model yang relevan dan hapus 'Klasifikasi' yang tidak ada.
 __all__ = [
-    'DataPakar', 'Dataset', 'Preprocessing', 
-    'KlasifikasiNB', 'KlasifikasiSVM', 'DataSplit', 'ComparisonHistory'
+    'DataPakar', 'Dataset', 'Preprocessing', 'PreprocessingSkip',
+    'KlasifikasiNB', 'KlasifikasiSVM', 'PrediksiBatch', 'DataSplit', 'ComparisonHistory'
 ]
 # --- AKHIR PERBAIKAN ---
 
@@ -144,6 +167,19 @@ class KlasifikasiSVM(db.Model):
         db.session.delete(self)
         db.session.commit()
 
+class PrediksiBatch(db.Model):
+    __tablename__ = 'prediksi_batch'
+    # Hasil penilaian massal seluruh tabel Preprocessing dengan model tersimpan (score.py)
+    id = db.Column(db.Integer, primary_key=True)
+    preprocessing_id = db.Column(db.Integer, db.ForeignKey('preprocessing.id'), nullable=False, index=True)
+    model_name = db.Column(db.String(50), nullable=False, index=True)
+    label_source = db.Column(db.String(50), nullable=False)
+    label_prediksi = db.Column(db.String(50), nullable=False)
+    created_at = db.Column(db.DateTime, default=get_wib_time)
+
+    def __repr__(self):
+        return f'<PrediksiBatch {self.id} - Model: {self.model_name} ({self.label_source})>'
+
 class DataSplit(db.Model):
     __tablename__ = 'data_split'
     id = db.Column(db.Integer, primary_key=True)
@@ -0,0 +1,46 @@
+import contextlib  # Modul untuk context manager koneksi baca
+import time  # Modul untuk mengukur throughput
+from flask import current_app  # Logger aplikasi aktif
+from app.models import db, Preprocessing, PrediksiBatch  # Impor database dan model tabel
+from app.module.model_registry import MODEL_FILES  # Normalisasi TF-IDF per model
+
+SCORING_CHUNK_SIZE = 1000  # Jumlah baris Preprocessing per potongan (yield_per) saat penilaian massal
+
+def iter_preprocessing_chunks(connection, chunk_size=SCORING_CHUNK_SIZE):
+    # Mengalirkan (id, text_stem) Preprocessing per potongan lewat yield_per, tanpa memuat seluruh tabel
+    query = (
+        db.select(Preprocessing.id, Preprocessing.text_stem)
+        .where(Preprocessing.text_stem.isnot(None), Preprocessing.text_stem != '')
+        .order_by(Preprocessing.id)
+    )
+    result = connection.execution_options(yield_per=chunk_size).execute(query)  # Cursor streaming di sisi server
+    for partition in result.partitions():  # Setiap partisi berisi paling banyak chunk_size baris
+        yield partition
+
+def score_preprocessing(registry, model_name, source, chunk_size=SCORING_CHUNK_SIZE):
+    # Menilai seluruh Preprocessing.text_stem dengan model dari ModelRegistry dan menulis hasil ke PrediksiBatch secara massal
+    model, vectorizer = registry.get(model_name, source)  # Pemuat bersama (cache mtime); FileNotFoundError sebelum data lama dihapus
+    normalize = MODEL_FILES[model_name][2]  # Normalisasi TF-IDF sama seperti saat pelatihan
+    PrediksiBatch.query.filter_by(model_name=model_name, label_source=source).delete()  # Hapus hasil penilaian lama
+    total_rows, start = 0, time.perf_counter()
+    if db.engine.dialect.name == 'sqlite':
+        # SQLite mengunci seluruh file: koneksi baca terpisah akan memblokir penulisan sesi, jadi baca lewat koneksi sesi
+        reader = contextlib.nullcontext(db.session.connection())
+    else:
+        reader = db.engine.connect()  # Koneksi baca terpisah agar insert sesi tidak mengganggu cursor streaming (server-side)
+    with reader as connection:
+        for chunk in iter_preprocessing_chunks(connection, chunk_size):  # Iterasi per potongan
+            ids = [row.id for row in chunk]
+            X = vectorizer.transform([row.text_stem for row in chunk], normalize=normalize, use_cache=False)  # Potongan sekali pakai: lewati cache korpus
+            labels = model.predict(X)  # Prediksi satu potongan sekaligus
+            db.session.bulk_insert_mappings(PrediksiBatch, [
+                {'preprocessing_id': row_id, 'model_name': model_name, 'label_source': source, 'label_prediksi': str(label)}
+                for row_id, label in zip(ids, labels)
+            ])  # INSERT massal per potongan
+            db.session.flush()  # Kirim ke database agar memori sesi tetap kecil
+            total_rows += len(ids)
+    db.session.commit()  # Satu commit setelah semua potongan ditulis
+    elapsed = time.perf_counter() - start
+    rows_per_sec = total_rows / elapsed if elapsed else 0.0
+    current_app.logger.info(f"[Scoring] {model_name} ({source}): {total_rows} rows in {elapsed:.2f} s ({rows_per_sec:.0f} rows/sec).")  # Log throughput
+    return {'model_name': model_name, 'source': source, 'rows': total_rows, 'seconds': elapsed, 'rows_per_sec': rows_per_sec}
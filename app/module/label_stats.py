@@ -0,0 +1,70 @@
+import threading  # Modul untuk mengunci cache statistik
+from types import MappingProxyType  # Tampilan statistik hanya-baca
+from flask import current_app  # Layanan statistik aplikasi aktif
+from sqlalchemy import and_, case, func  # Ekspresi GROUP BY
+from app.models import db, Preprocessing, DataPakar  # Impor database dan model
+
+LABELS = ('positif', 'negatif', 'netral')  # Label sentimen yang dihitung
+
+def count_by_label(label_column):
+    # Jumlah baris per label dalam satu kueri GROUP BY -> {label: jumlah}
+    return dict(db.session.execute(db.select(label_column, func.count()).group_by(label_column)).all())
+
+def compute_label_stats():
+    # Statistik halaman label dari dua kueri GROUP BY (Preprocessing dan DataPakar)
+    has_stem = case((and_(Preprocessing.text_stem.isnot(None), Preprocessing.text_stem != ''), 1), else_=0)  # Data siap dilabeli
+    rows = db.session.execute(
+        db.select(Preprocessing.label_otomatis, has_stem, func.count()).group_by(Preprocessing.label_otomatis, has_stem)
+    ).all()
+    otomatis = dict.fromkeys(LABELS, 0)  # Label otomatis per kelas (seluruh data)
+    total_data = total_data_for_labeling = total_unlabeled = 0
+    for label, stemmed, count in rows:
+        total_data += count
+        if label in otomatis:
+            otomatis[label] += count
+        if stemmed:
+            total_data_for_labeling += count
+            if label is None:
+                total_unlabeled += count
+
+    pakar_counts = count_by_label(DataPakar.label)
+    pakar = {label: pakar_counts.get(label, 0) for label in LABELS}  # Label pakar per kelas
+    return MappingProxyType({
+        'total_data': total_data,  # Jumlah seluruh data preprocessing
+        'total_data_for_labeling': total_data_for_labeling,  # Data dengan text_stem tidak kosong
+        'total_unlabeled': total_unlabeled,  # Data siap dilabeli yang belum memiliki label otomatis
+        'otomatis': MappingProxyType(otomatis),
+        'pakar': MappingProxyType(pakar),
+        'total_pakar_data': sum(count for label, count in pakar_counts.items() if label is not None),  # Data pakar berlabel
+    })
+
+class LabelStatsService:
+    # Cache statistik label per aplikasi; dihitung ulang hanya setelah invalidate() dipanggil oleh rute yang mengubah label
+    def __init__(self):
+        self._stats = None
+        self._generation = 0  # Naik setiap invalidate(); hasil hitungan yang balapan dengan invalidate tidak disimpan
+        self._lock = threading.Lock()
+        self.computations = 0  # Jumlah perhitungan ulang, untuk pemantauan
+
+    def get(self):
+        stats = self._stats
+        if stats is not None:
+            return stats
+        with self._lock:
+            generation = self._generation
+        stats = compute_label_stats()
+        with self._lock:
+            self.computations += 1
+            if generation == self._generation:  # Simpan hanya bila tidak ada perubahan label selama perhitungan
+                self._stats = stats
+        return stats
+
+    def invalidate(self):
+        # Dipanggil setelah label otomatis, data pakar, atau data preprocessing berubah
+        with self._lock:
+            self._generation += 1
+            self._stats = None
+
+def get_label_stats():
+    # Layanan statistik label bersama milik aplikasi aktif (dibuat di create_app)
+    return current_app.extensions['label_stats']
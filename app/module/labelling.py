@@ -1,5 +1,19 @@
 import csv  # Modul untuk membaca file CSV
+import json  # Modul untuk menyimpan istilah lexicon yang cocok
+import os  # Modul untuk path dan mtime file kamus
+import threading  # Modul untuk mengunci pemuatan ulang kamus
+from itertools import chain, repeat  # Modul untuk meratakan token seluruh dokumen
+from types import MappingProxyType  # Tampilan kamus hanya-baca
+import numpy as np  # Modul untuk operasi numerik
+from flask import current_app  # Layanan kamus aplikasi aktif
+from sqlalchemy import or_  # Operator OR untuk filter kueri
 from app.models import db, Preprocessing  # Impor database dan model Preprocessing
+from app.module.preprocessing import NEGATION_WORDS  # Kata negasi (juga dikecualikan dari stopwords)
+from app.module.label_stats import get_label_stats  # Statistik label bersama
+
+LABEL_UPDATE_CHUNK_SIZE = 1000  # Jumlah baris per perintah UPDATE massal label otomatis
+DOC_SEPARATOR = '\x00'  # Token pemisah dokumen saat seluruh teks ditokenisasi sekaligus
+NEGATION_SCOPE = 3  # Negasi berlaku untuk kecocokan berikutnya yang dimulai paling jauh 3 token setelah kata negasi
 
 def load_weighted_lexicon(file_path):
     # Memuat kamus berbobot dari file CSV
@@ -16,16 +30,8 @@ def load_weighted_lexicon(file_path):
         print(f"Error loading lexicon from {file_path}: {str(e)}")  # Tampilkan pesan error
     return lexicon  # Kembalikan kamus
 
-try:
-    positive_lexicon = load_weighted_lexicon("kamus/positive.csv")  # Muat kamus positif
-    negative_lexicon = load_weighted_lexicon("kamus/negative.csv")  # Muat kamus negatif
-except FileNotFoundError as e:  # Tangani file tidak ditemukan
-    print(f"Warning: Lexicon file not found: {e}")  # Tampilkan peringatan
-    positive_lexicon = {}  # Inisialisasi kamus positif kosong
-    negative_lexicon = {}  # Inisialisasi kamus negatif kosong
-
-def sentiment_analysis_lexicon(text):
-    # Analisis sentimen berbasis kamus
+def sentiment_analysis_lexicon(text, positive_lexicon, negative_lexicon):
+    # Analisis sentimen berbasis kamus untuk satu teks (untuk banyak teks gunakan LexiconScorer.score_texts)
     score = 0  # Inisialisasi skor
     text = text.lower().split()  # Konversi ke huruf kecil dan pisah menjadi token
     for word in text:  # Iterasi setiap token
@@ -42,13 +48,233 @@ def sentiment_analysis_lexicon(text):
         polarity = 'netral'  # Skor nol
     return score, polarity  # Kembalikan skor dan polaritas
 
+class LexiconScorer:
+    # Penilai lexicon batch: entri (kata atau frasa) diindeks dalam trie token; seluruh dokumen ditelusuri sekaligus lewat array
+    def __init__(self, positive_lexicon, negative_lexicon, phrases=True, negation=True):
+        self.positive_lexicon = MappingProxyType(dict(positive_lexicon))  # Salinan hanya-baca, aman dibagi antar-request
+        self.negative_lexicon = MappingProxyType(dict(negative_lexicon))
+        self.negation = negation  # Terapkan aturan cakupan negasi
+        entries = {}  # tuple token -> bobot; kata yang ada di kedua kamus mendapat jumlah kedua bobot
+        for lexicon in (positive_lexicon, negative_lexicon):
+            for word, weight in lexicon.items():
+                tokens = tuple(word.split()) if phrases else (word,)  # Tanpa frasa: entri multi-kata tidak pernah cocok (perilaku lama)
+                if tokens:
+                    entries[tokens] = entries.get(tokens, 0) + weight
+        self.token_ids = {}  # token -> id, hanya token yang muncul di kamus (dan kata negasi)
+        edges = {}  # (node induk, id token) -> node anak
+        node_weight, node_terminal, self._node_terms = [0], [False], ['']  # Node 0 = akar trie
+        for tokens, weight in entries.items():
+            node = 0
+            for token in tokens:
+                token_id = self.token_ids.setdefault(token, len(self.token_ids))
+                child = edges.get((node, token_id))
+                if child is None:
+                    child = edges[(node, token_id)] = len(node_weight)
+                    node_weight.append(0)
+                    node_terminal.append(False)
+                    self._node_terms.append(self._node_terms[node] + (' ' if node else '') + token)
+                node = child
+            node_weight[node] += weight
+            node_terminal[node] = True
+        negators = sorted(NEGATION_WORDS) if negation else []
+        self._negator_ids = np.array([self.token_ids.setdefault(word, len(self.token_ids)) for word in negators], dtype=np.int64)
+        self._n_token_ids = max(len(self.token_ids), 1)
+        edge_keys = np.array([parent * self._n_token_ids + token_id for parent, token_id in edges], dtype=np.int64)
+        order = np.argsort(edge_keys)
+        self._edge_keys = edge_keys[order]  # Kunci sisi trie terurut untuk pencarian biner vektor
+        self._edge_children = np.array(list(edges.values()), dtype=np.int64)[order]
+        self._node_weight = np.array(node_weight, dtype=np.int64)
+        self._node_terminal = np.array(node_terminal, dtype=bool)
+        self.max_phrase_len = max(map(len, entries), default=0)
+        self._node_terms_json = None  # Dibuat saat analyze_json pertama
+        self._lookup = dict(self.token_ids)  # Id token + token pemisah dokumen (-2); token lain -1
+        self._lookup[DOC_SEPARATOR] = -2
+
+    def __bool__(self):
+        return bool(self._node_terminal.any())  # False jika kedua kamus kosong
+
+    def _tokenize(self, texts):
+        # (id token, dokumen tiap token, jumlah token per dokumen) untuk seluruh teks, tokenisasi sama seperti sentiment_analysis_lexicon
+        texts = [text or '' for text in texts]
+        # Seluruh teks digabung dengan token pemisah lalu di-split sekali, tanpa loop per dokumen di Python
+        tokens = f' {DOC_SEPARATOR} '.join(texts).lower().split()
+        ids = np.fromiter(map(self._lookup.get, tokens, repeat(-1)), dtype=np.int64, count=len(tokens))
+        separators = np.flatnonzero(ids == -2)
+        if not texts or len(separators) != len(texts) - 1:  # Pemisah ikut muncul di dalam teks: tokenisasi per dokumen
+            docs = [text.lower().split() for text in texts]
+            lengths = np.fromiter(map(len, docs), dtype=np.int64, count=len(docs))
+            ids = np.fromiter(map(self.token_ids.get, chain.from_iterable(docs), repeat(-1)), dtype=np.int64, count=int(lengths.sum()))
+        else:
+            lengths = np.diff(np.concatenate(([-1], separators, [len(tokens)]))) - 1  # Jumlah token di antara pemisah
+            ids = np.delete(ids, separators)
+        return ids, np.repeat(np.arange(len(texts)), lengths), lengths
+
+    def _longest_matches(self, ids, token_docs):
+        # Panjang dan node entri terpanjang yang dimulai di setiap posisi: satu langkah trie per kedalaman untuk semua posisi
+        n = len(ids)
+        best_len = np.zeros(n, dtype=np.int64)
+        best_node = np.zeros(n, dtype=np.int64)
+        nodes = np.zeros(n, dtype=np.int64)  # Node trie aktif per posisi awal
+        active = np.arange(n)  # Posisi awal yang masih bisa diperpanjang
+        for depth in range(1, self.max_phrase_len + 1):
+            pos = active + depth - 1
+            active, pos = active[pos < n], pos[pos < n]
+            valid = (ids[pos] >= 0) & (token_docs[pos] == token_docs[active])  # Frasa tidak melewati batas dokumen
+            active, pos = active[valid], pos[valid]
+            keys = nodes[active] * self._n_token_ids + ids[pos]
+            idx = np.minimum(np.searchsorted(self._edge_keys, keys), len(self._edge_keys) - 1)
+            found = self._edge_keys[idx] == keys
+            active, children = active[found], self._edge_children[idx[found]]
+            if not len(active):
+                break
+            nodes[active] = children
+            terminal = self._node_terminal[children]
+            best_len[active[terminal]] = depth
+            best_node[active[terminal]] = children[terminal]
+        return best_len, best_node
+
+    def _resolve(self, texts):
+        # Semua kecocokan terpilih (kiri ke kanan, terpanjang dulu) beserta bobot efektif setelah aturan negasi
+        ids, token_docs, lengths = self._tokenize(texts)
+        if not self or not len(ids):
+            empty = np.zeros(0, dtype=np.int64)
+            return lengths, empty, empty, empty, empty, empty, np.zeros(0, dtype=bool)
+        best_len, best_node = self._longest_matches(ids, token_docs)
+        covered = np.zeros(len(ids) + 1, dtype=np.int64)  # Posisi di dalam frasa terpilih (selain token pertamanya)
+        last_end = -1
+        for start in np.flatnonzero(best_len > 1).tolist():  # Frasa multi-kata jarang: seleksi serakah kiri ke kanan
+            if start >= last_end:
+                last_end = start + int(best_len[start])
+                covered[start + 1] += 1
+                covered[last_end] -= 1
+        inside = np.cumsum(covered[:-1]) > 0
+        starts = np.flatnonzero((best_len > 0) & ~inside)
+        nodes = best_node[starts]
+        ends = starts + best_len[starts]
+        weights = self._node_weight[nodes]
+        negated = np.zeros(len(starts), dtype=bool)
+        if self.negation and len(self._negator_ids):
+            # Kata negasi di luar kamus ikut sebagai kejadian berbobot 0 (node -1)
+            extra = np.flatnonzero(np.isin(ids, self._negator_ids) & (best_len == 0) & ~inside)
+            order = np.argsort(np.concatenate((starts, extra)), kind='stable')
+            starts = np.concatenate((starts, extra))[order]
+            ends = np.concatenate((ends, extra + 1))[order]
+            nodes = np.concatenate((nodes, np.full(len(extra), -1)))[order]
+            weights = np.concatenate((weights, np.zeros(len(extra), dtype=np.int64)))[order]
+            is_negator = (ends - starts == 1) & np.isin(ids[starts], self._negator_ids)
+            docs = token_docs[starts]
+            # Negasi membalik kecocokan berikutnya bila dimulai dalam NEGATION_SCOPE token; bobot kata negasinya sendiri diabaikan
+            applies = np.zeros(len(starts), dtype=bool)
+            negated = np.zeros(len(starts), dtype=bool)
+            applies[:-1] = is_negator[:-1] & (docs[1:] == docs[:-1]) & (starts[1:] - ends[:-1] < NEGATION_SCOPE)
+            negated[1:] = applies[:-1]
+            weights = np.where(applies, 0, weights) * np.where(negated, -1, 1)
+            keep = nodes >= 0  # Buang kejadian negasi di luar kamus
+            starts, ends, nodes, weights, negated = starts[keep], ends[keep], nodes[keep], weights[keep], negated[keep]
+        return lengths, token_docs[starts], starts, ends, nodes, weights, negated
+
+    def score_texts(self, texts):
+        # (skor, polaritas) untuk seluruh teks; skor = jumlah bobot efektif kecocokan per dokumen
+        lengths, docs, _, _, _, weights, _ = self._resolve(texts)
+        scores = np.bincount(docs, weights=weights, minlength=len(lengths)).astype(np.int64)
+        polarities = np.where(scores > 0, 'positif', np.where(scores < 0, 'negatif', 'netral'))
+        return scores, polarities
+
+    def analyze(self, texts):
+        # (skor, polaritas, span per dokumen); span = istilah yang cocok, posisi token [awal, akhir), bobot efektif, status negasi
+        lengths, docs, starts, ends, nodes, weights, negated = self._resolve(texts)
+        scores = np.bincount(docs, weights=weights, minlength=len(lengths)).astype(np.int64)
+        polarities = np.where(scores > 0, 'positif', np.where(scores < 0, 'negatif', 'netral'))
+        offsets = np.concatenate(([0], np.cumsum(lengths)))  # Posisi token pertama tiap dokumen
+        spans = [[] for _ in range(len(lengths))]
+        for doc, start, end, node, weight, neg in zip(docs.tolist(), starts.tolist(), ends.tolist(), nodes.tolist(), weights.tolist(), negated.tolist()):
+            spans[doc].append({'term': self._node_terms[node], 'start': start - int(offsets[doc]), 'end': end - int(offsets[doc]), 'weight': weight, 'negated': neg})
+        return scores, polarities, spans
+
+    def analyze_json(self, texts):
+        # Seperti analyze, tetapi istilah tiap dokumen langsung berupa JSON ringkas [[istilah, bobot, negasi], ...] untuk disimpan
+        lengths, docs, _, _, nodes, weights, negated = self._resolve(texts)
+        scores = np.bincount(docs, weights=weights, minlength=len(lengths)).astype(np.int64)
+        polarities = np.where(scores > 0, 'positif', np.where(scores < 0, 'negatif', 'netral'))
+        if self._node_terms_json is None:  # Istilah per node dalam bentuk JSON, dibuat sekali
+            self._node_terms_json = [json.dumps(term, ensure_ascii=False) for term in self._node_terms]
+        fragments = list(map('[{},{},{}]'.format, map(self._node_terms_json.__getitem__, nodes.tolist()), weights.tolist(),
+                             map(('false', 'true').__getitem__, negated.tolist())))
+        bounds = np.searchsorted(docs, np.arange(len(lengths) + 1)).tolist()  # Kecocokan terurut per dokumen
+        terms = ['[' + ','.join(fragments[a:b]) + ']' for a, b in zip(bounds[:-1], bounds[1:])]
+        return scores, polarities, terms
+
+class LexiconService:
+    # Kamus sentimen dari folder kamus, diparse sekali per proses menjadi LexiconScorer; dimuat ulang hanya bila file berubah
+    def __init__(self, kamus_folder):
+        self.paths = (os.path.join(kamus_folder, 'positive.csv'), os.path.join(kamus_folder, 'negative.csv'))
+        self._version = None  # (mtime_ns, ukuran) kedua file saat terakhir dimuat
+        self._scorer = None
+        self._lock = threading.Lock()
+        self.disk_loads = 0  # Jumlah parsing CSV, untuk pemantauan
+
+    def _file_version(self):
+        versions = []
+        for path in self.paths:
+            try:
+                stat = os.stat(path)
+                versions.append((stat.st_mtime_ns, stat.st_size))
+            except OSError:  # File belum ada: dimuat sebagai kamus kosong
+                versions.append(None)
+        return tuple(versions)
+
+    def scorer(self):
+        # LexiconScorer bersama; hanya os.stat per panggilan selama file kamus tidak berubah
+        version = self._file_version()
+        if self._scorer is not None and version == self._version:
+            return self._scorer
+        with self._lock:
+            if self._scorer is None or version != self._version:  # Periksa lagi setelah mendapat lock
+                positive, negative = (load_weighted_lexicon(path) for path in self.paths)
+                if not positive and not negative:
+                    print(f"Warning: Kamus sentimen (positive.csv/negative.csv) kosong atau tidak ditemukan: {self.paths}")
+                self._scorer = LexiconScorer(positive, negative)
+                self._version = version
+                self.disk_loads += 1
+        return self._scorer
+
+def get_lexicon_service():
+    # Layanan kamus bersama milik aplikasi aktif (dibuat di create_app)
+    return current_app.extensions['lexicon_service']
+
+def decode_lexicon_terms(value):
+    # Kolom lexicon_terms -> list dict {'term', 'weight', 'negated'} untuk tampilan
+    if not value:
+        return []
+    return [{'term': term, 'weight': weight, 'negated': negated} for term, weight, negated in json.loads(value)]
+
+def auto_label_preprocessing(scorer, chunk_size=LABEL_UPDATE_CHUNK_SIZE):
+    # Menyimpan skor/polaritas/istilah lexicon untuk baris yang belum dinilai dan mengisi label_otomatis yang masih kosong;
+    # ditulis dengan UPDATE massal, commit oleh pemanggil
+    rows = db.session.query(Preprocessing.id, Preprocessing.text_stem, Preprocessing.label_otomatis).filter(
+        Preprocessing.text_stem.isnot(None),
+        Preprocessing.text_stem != '',
+        or_(Preprocessing.label_otomatis.is_(None), Preprocessing.lexicon_score.is_(None))
+    ).all()  # Hanya kolom yang dibutuhkan, tanpa objek ORM
+    if not rows:
+        return 0
+    scores, polarities, terms = scorer.analyze_json([row.text_stem for row in rows])
+    updates, labeled = [], 0
+    for row, score, polarity, row_terms in zip(rows, scores.tolist(), polarities.tolist(), terms):
+        mapping = {'id': row.id, 'lexicon_score': score, 'lexicon_polarity': polarity, 'lexicon_terms': row_terms}
+        if row.label_otomatis is None:  # Label manual/yang sudah ada tidak ditimpa
+            mapping['label_otomatis'] = polarity
+            labeled += 1
+        updates.append(mapping)
+    for start in range(0, len(updates), chunk_size):  # executemany per potongan
+        db.session.bulk_update_mappings(Preprocessing, updates[start:start + chunk_size])
+    return labeled  # Jumlah baris yang baru dilabeli
+
 def count_labels():
-    # Menghitung jumlah data per label
-    total_data = Preprocessing.query.count()  # Jumlah total data
-    total_positif = Preprocessing.query.filter_by(label_otomatis="positif").count()  # Jumlah label positif
-    total_negatif = Preprocessing.query.filter_by(label_otomatis="negatif").count()  # Jumlah label negatif
-    total_netral = Preprocessing.query.filter_by(label_otomatis="netral").count()  # Jumlah label netral
-    return total_data, total_positif, total_negatif, total_netral  # Kembalikan jumlah
+    # Menghitung jumlah data per label (dari cache statistik label, satu kueri GROUP BY)
+    stats = get_label_stats().get()  # Statistik label tersimpan
+    otomatis = stats['otomatis']
+    return stats['total_data'], otomatis['positif'], otomatis['negatif'], otomatis['netral']  # Kembalikan jumlah
 
 def reset_labels():
     # Mengatur ulang label di database
@@ -0,0 +1,69 @@
+import queue  # Modul antrean thread-safe untuk permintaan prediksi
+import threading  # Modul untuk thread pemroses batch
+import time  # Modul untuk jendela waktu pengumpulan batch
+from concurrent.futures import Future  # Hasil prediksi yang ditunggu oleh request
+
+PREDICT_BATCH_WINDOW_MS = 5  # Lama (ms) menunggu permintaan lain sebelum satu batch diproses
+PREDICT_MAX_BATCH = 256  # Jumlah teks maksimum per batch
+
+class MicroBatcher:
+    # Menggabungkan permintaan prediksi kecil yang datang bersamaan menjadi satu transform + predict per (model, sumber label)
+    def __init__(self, registry, window_ms=PREDICT_BATCH_WINDOW_MS, max_batch=PREDICT_MAX_BATCH):
+        self.registry = registry  # ModelRegistry bersama
+        self.window = window_ms / 1000.0
+        self.max_batch = max_batch
+        self.batches_run = 0  # Jumlah panggilan model, untuk pemantauan
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, model_name, source, texts):
+        # Antrekan teks (sudah dipreprocessing); Future berisi (kelas, matriks probabilitas) untuk teks tersebut
+        future = Future()
+        self._ensure_thread()
+        self._queue.put((model_name, source, list(texts), future))
+        return future
+
+    def _ensure_thread(self):
+        # Thread pemroses dibuat saat permintaan pertama (bukan saat import/create_app)
+        if self._thread is None or not self._thread.is_alive():
+            with self._lock:
+                if self._thread is None or not self._thread.is_alive():
+                    self._thread = threading.Thread(target=self._run, name='micro-batcher', daemon=True)
+                    self._thread.start()
+
+    def _run(self):
+        while True:
+            pending = [self._queue.get()]  # Tunggu permintaan pertama
+            size = len(pending[0][2])
+            deadline = time.monotonic() + self.window
+            while size < self.max_batch:  # Kumpulkan permintaan lain sampai jendela waktu habis atau batch penuh
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                pending.append(item)
+                size += len(item[2])
+            self._score(pending)
+
+    def _score(self, pending):
+        # Satu panggilan model per (model, sumber label); hasil dipotong kembali per permintaan
+        groups = {}
+        for item in pending:
+            groups.setdefault((item[0], item[1]), []).append(item)
+        for (model_name, source), items in groups.items():
+            try:
+                classes, proba = self.registry.predict_proba_texts(model_name, source, [text for item in items for text in item[2]])
+            except Exception as e:  # Model belum ada/gagal: teruskan error ke setiap request dalam grup
+                for item in items:
+                    item[3].set_exception(e)
+                continue
+            self.batches_run += 1
+            start = 0
+            for item in items:
+                end = start + len(item[2])
+                item[3].set_result((classes, proba[start:end]))
+                start = end
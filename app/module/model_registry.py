@@ -0,0 +1,79 @@
+import os  # Modul untuk memeriksa mtime file model
+import pickle  # Modul untuk memuat model dan vectorizer
+import threading  # Modul untuk mengunci cache antar-thread
+import numpy as np  # Modul untuk operasi numerik
+from flask import current_app  # Registry aplikasi aktif
+
+MODEL_FILES = {  # Nama model -> (subfolder, nama file model, normalisasi TF-IDF seperti saat pelatihan)
+    'Naive Bayes': ('nb', 'naive_bayes_model_{source}.pkl', False),
+    'SVM': ('svm', 'svm_model_{source}.pkl', True),
+}
+LABEL_SOURCES = ('otomatis', 'pakar')  # Sumber label yang punya model terpisah
+
+def model_paths(model_folder, model_name, source):
+    # Path file model dan vectorizer yang ditulis oleh route klasifikasi
+    subfolder, filename, _ = MODEL_FILES[model_name]
+    return os.path.join(model_folder, subfolder, filename.format(source=source)), os.path.join(model_folder, f'tfidf_vectorizer_{source}.pkl')
+
+class ModelRegistry:
+    # Cache model dan vectorizer tersimpan di memori, dimuat sekali per file dan dimuat ulang otomatis bila file berubah
+    def __init__(self, model_folder):
+        self.model_folder = model_folder
+        self._entries = {}  # path -> (mtime_ns, ukuran file, objek hasil unpickle)
+        self._lock = threading.Lock()  # Satu pemuatan per file walau banyak request bersamaan
+        self.disk_loads = 0  # Jumlah unpickle dari disk, untuk pemantauan
+
+    def load(self, path):
+        # Objek dari file pickle; unpickle ulang hanya bila mtime/ukuran file berubah (misal setelah pelatihan ulang)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            self.invalidate(path)  # File dihapus (reset klasifikasi): buang juga dari cache
+            raise
+        version = (stat.st_mtime_ns, stat.st_size)
+        entry = self._entries.get(path)
+        if entry is not None and entry[0] == version:
+            return entry[1]  # Jalur cepat tanpa lock dan tanpa akses disk selain stat
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is None or entry[0] != version:  # Periksa lagi setelah mendapat lock
+                with open(path, 'rb') as f:
+                    entry = (version, pickle.load(f))
+                self._entries[path] = entry
+                self.disk_loads += 1
+        return entry[1]
+
+    def get(self, model_name, source):
+        # (model, vectorizer) untuk satu algoritme dan sumber label; FileNotFoundError jika belum dilatih
+        if model_name not in MODEL_FILES:
+            raise ValueError(f"Model '{model_name}' tidak dikenal.")
+        model_path, vectorizer_path = model_paths(self.model_folder, model_name, source)
+        for path in (model_path, vectorizer_path):  # Periksa keberadaan file
+            if not os.path.exists(path):
+                self.invalidate(path)
+                raise FileNotFoundError(f"Model {model_name} ({source}) atau vectorizer belum tersedia. Silakan lakukan klasifikasi terlebih dahulu.")
+        return self.load(model_path), self.load(vectorizer_path)
+
+    def predict_proba_texts(self, model_name, source, texts):
+        # (kelas, matriks probabilitas teks x kelas) untuk daftar teks; seluruh daftar divektorisasi dalam satu transform
+        model, vectorizer = self.get(model_name, source)
+        X = vectorizer.transform(texts, normalize=MODEL_FILES[model_name][2], use_cache=False)  # Normalisasi sama seperti saat pelatihan; teks prediksi tidak di-cache
+        return model.classes_, model.predict_proba(X)
+
+    def predict_texts(self, model_name, source, texts):
+        # Prediksi label dan skor (probabilitas kelas terpilih) untuk daftar teks dengan model di cache
+        classes, proba = self.predict_proba_texts(model_name, source, texts)
+        best = np.argmax(proba, axis=1)  # Sama dengan predict() untuk NB dan SVM
+        return classes[best], proba[np.arange(len(best)), best]
+
+    def invalidate(self, path=None):
+        # Buang satu file (atau semua) dari cache, misal setelah model ditulis ulang
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(path, None)
+
+def get_model_registry():
+    # Registry bersama milik aplikasi aktif (dibuat di create_app)
+    return current_app.extensions['model_registry']
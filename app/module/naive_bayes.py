@@ -1,10 +1,9 @@
-import math
 import numpy as np
 from collections import Counter
 import scipy.sparse as sp
 import random
 
-# Import pustaka untuk perhitungan matematis, array, penghitungan kelas, matriks sparse, dan pengacakan.
+# Import pustaka untuk array, penghitungan kelas, matriks sparse, dan pengacakan.
 
 class MultinomialNaiveBayesClassifier:
     # Deklarasi kelas untuk model Naive Bayes Multinomial.
@@ -16,6 +15,8 @@ class MultinomialNaiveBayesClassifier:
         self.feature_log_prob_ = None  # Log probabilitas fitur per kelas.
         self.classes_ = None  # Daftar kelas unik.
         self.n_features_ = None  # Jumlah fitur.
+        self.class_count_ = None  # Jumlah sampel per kelas (untuk partial_fit dan merge).
+        self.feature_count_ = None  # Jumlah kemunculan fitur per kelas.
 
     def fit(self, X, y):
         # Melatih model dengan data input X dan label y.
@@ -23,40 +24,101 @@ class MultinomialNaiveBayesClassifier:
             raise TypeError("Input X harus berupa scipy sparse matrix (misal, csr_matrix).")
             # Memastikan X adalah matriks sparse.
 
-        n_samples, n_features = X.shape
-        # Mendapatkan jumlah sampel dan fitur dari X.
-        self.classes_ = np.unique(y)
+        self.classes_ = np.unique(np.asarray(y))
         # Menyimpan kelas unik dari y.
-        n_classes = len(self.classes_)
-        # Menghitung jumlah kelas.
-        self.n_features_ = n_features
+        self.n_features_ = X.shape[1]
         # Menyimpan jumlah fitur.
+        self.class_count_ = np.zeros(len(self.classes_))
+        self.feature_count_ = np.zeros((len(self.classes_), self.n_features_))
+        # Tabel hitungan sampel dan fitur per kelas (dasar partial_fit dan merge).
+        self._update_counts(X, y)
+        self._update_log_probs()
+        # Menghitung hitungan lalu probabilitas dari tabel hitungan.
+        return self
+        # Mengembalikan objek model yang sudah dilatih.
+
+    def partial_fit(self, X, y, classes=None):
+        # Menambahkan data baru ke tabel hitungan tanpa melatih ulang dari awal.
+        if not sp.issparse(X):
+            raise TypeError("Input X harus berupa scipy sparse matrix (misal, csr_matrix).")
+            # Memastikan X adalah matriks sparse.
+        if getattr(self, 'feature_count_', None) is None:
+            if self.feature_log_prob_ is not None:
+                raise ValueError("Model lama tidak menyimpan tabel hitungan; latih ulang dengan fit() sebelum partial_fit().")
+                # Model dari pickle lama hanya punya probabilitas, bukan hitungan.
+            if classes is None:
+                raise ValueError("Parameter classes wajib diisi pada pemanggilan partial_fit pertama.")
+                # Kelas harus diketahui sejak awal agar ukuran tabel hitungan tetap.
+            self.classes_ = np.unique(np.asarray(classes))
+            self.n_features_ = X.shape[1]
+            self.class_count_ = np.zeros(len(self.classes_))
+            self.feature_count_ = np.zeros((len(self.classes_), self.n_features_))
+            # Inisialisasi tabel hitungan kosong.
+        elif X.shape[1] != self.n_features_:
+            raise ValueError(f"Jumlah fitur data input ({X.shape[1]}) tidak sesuai dengan data latih ({self.n_features_}).")
+            # Memastikan jumlah fitur sesuai.
+        self._update_counts(X, y)
+        self._update_log_probs()
+        # Tambahkan hitungan baru lalu hitung ulang probabilitas (biaya O(kelas x fitur)).
+        return self
 
-        self.class_priors_ = np.zeros(n_classes)
-        # Inisialisasi array untuk prior kelas.
-        feature_counts_per_class = np.zeros((n_classes, n_features))
-        # Inisialisasi array untuk jumlah fitur per kelas.
-
-        for i, current_class in enumerate(self.classes_):
-            # Iterasi untuk setiap kelas.
-            X_class = X[y == current_class]
-            # Mengambil data X untuk kelas tertentu.
-            self.class_priors_[i] = math.log(X_class.shape[0] / n_samples)
-            # Menghitung log probabilitas prior kelas (frekuensi kelas / total sampel).
-            feature_counts_per_class[i, :] = X_class.sum(axis=0)
-            # Menghitung jumlah kemunculan fitur untuk kelas ini.
-
-        total_counts_per_class = feature_counts_per_class.sum(axis=1)
+    @classmethod
+    def merge(cls, models):
+        # Menggabungkan tabel hitungan model yang dilatih pada shard berbeda menjadi satu model.
+        models = list(models)
+        if not models:
+            raise ValueError("Tidak ada model untuk digabungkan.")
+        n_features = models[0].n_features_
+        if any(getattr(model, 'feature_count_', None) is None for model in models):
+            raise ValueError("Semua model harus memiliki tabel hitungan (dilatih dengan fit atau partial_fit).")
+        if any(model.n_features_ != n_features for model in models):
+            raise ValueError("Semua model harus memiliki jumlah fitur yang sama.")
+            # Memastikan semua shard memakai vectorizer yang sama.
+        merged = cls(alpha=models[0].alpha)
+        merged.classes_ = np.unique(np.concatenate([model.classes_ for model in models]))
+        merged.n_features_ = n_features
+        merged.class_count_ = np.zeros(len(merged.classes_))
+        merged.feature_count_ = np.zeros((len(merged.classes_), n_features))
+        for model in models:
+            rows = np.searchsorted(merged.classes_, model.classes_)
+            merged.class_count_[rows] += model.class_count_
+            merged.feature_count_[rows] += model.feature_count_
+            # Jumlahkan hitungan sesuai posisi kelas di gabungan.
+        merged._update_log_probs()
+        return merged
+
+    def _update_counts(self, X, y):
+        # Menambahkan hitungan sampel dan fitur per kelas dari X dan y.
+        y = np.asarray(y)
+        class_indices = np.searchsorted(self.classes_, y)
+        unknown = (class_indices >= len(self.classes_)) | (self.classes_[np.minimum(class_indices, len(self.classes_) - 1)] != y)
+        if unknown.any():
+            raise ValueError(f"Label tidak dikenal: {sorted(set(y[unknown].tolist()))}. Kelas model: {list(self.classes_)}.")
+            # Memastikan semua label termasuk kelas model.
+        n_samples, n_classes = X.shape[0], len(self.classes_)
+        class_indicator = sp.csr_matrix(
+            (np.ones(n_samples), (np.arange(n_samples), class_indices)), shape=(n_samples, n_classes)
+        )
+        # Matriks indikator kelas one-hot (sampel x kelas), tanpa menyalin X per kelas.
+        self.class_count_ += np.bincount(class_indices, minlength=n_classes)
+        # Menambahkan jumlah sampel per kelas.
+        self.feature_count_ += (X.T @ class_indicator).T.toarray()
+        # Menghitung jumlah kemunculan fitur untuk semua kelas dalam satu perkalian Y.T @ X, ditulis sebagai
+        # (X.T @ Y).T karena X.T adalah tampilan CSC tanpa salinan (Y.T @ X langsung mengonversi Y dan jauh lebih boros memori).
+
+    def _update_log_probs(self):
+        # Menghitung log prior dan log probabilitas fitur dari tabel hitungan.
+        with np.errstate(divide='ignore'):
+            self.class_priors_ = np.log(self.class_count_ / self.class_count_.sum())
+            # Menghitung log probabilitas prior kelas (kelas tanpa sampel bernilai -inf).
+        total_counts_per_class = self.feature_count_.sum(axis=1)
         # Menghitung total jumlah fitur per kelas.
-        numerator = feature_counts_per_class + self.alpha
+        numerator = self.feature_count_ + self.alpha
         # Menambahkan alpha (smoothing) ke jumlah fitur.
         denominator = total_counts_per_class[:, np.newaxis] + self.alpha * self.n_features_
         # Menghitung penyebut untuk probabilitas fitur (total + smoothing).
         self.feature_log_prob_ = np.log(numerator) - np.log(denominator)
         # Menghitung log probabilitas fitur per kelas.
-        
-        return self
-        # Mengembalikan objek model yang sudah dilatih.
 
     def predict(self, X):
         # Memprediksi kelas untuk data input X.
@@ -4,6 +4,10 @@ import multiprocessing  # Modul untuk pemrosesan paralel
 import time  # Modul untuk mengukur waktu
 import os  # Modul untuk operasi sistem file
 import html  # Modul untuk menangani entitas HTML
+import hashlib  # Modul untuk sidik jari teks
+import sqlite3  # Modul untuk cache stemming persisten
+from collections import deque  # Modul untuk antrean potongan yang sedang diproses
+from itertools import islice  # Modul untuk memotong iterable
 from concurrent.futures import ProcessPoolExecutor  # Modul untuk eksekusi paralel
 from functools import lru_cache  # Modul untuk caching fungsi
 
@@ -21,7 +25,8 @@ REGEX_PATTERNS = {
     'multiple_spaces': re.compile(r'\s+'),  # Normalisasi spasi berlebih
     'username_mentions': re.compile(r'@[A-Za-z0-9_]+'),  # Hapus mention pengguna
     'rt_pattern': re.compile(r'\bRT\b', re.IGNORECASE),  # Hapus kata "RT"
-    'extra_whitespace': re.compile(r'^\s+|\s+$|\s+(?=\s)')  # Hapus spasi awal/akhir
+    'extra_whitespace': re.compile(r'^\s+|\s+$|\s+(?=\s)'),  # Hapus spasi awal/akhir
+    'word_run': re.compile(r'\w+')  # Deret karakter kata (batas yang sama dengan \b)
 }
 
 # Daftar frasa penting untuk diganti dengan token khusus
@@ -34,6 +39,85 @@ IMPORTANT_PHRASES = [
     (re.compile(r'gen\s+z', re.IGNORECASE), 'generasi_z'),  # Ganti frasa gen z
 ]
 
+# Frasa penting digabung menjadi satu alternasi; urutan hasil sama dengan penggantian berurutan
+# karena pola-polanya tidak saling tumpang tindih dan hasil penggantiannya tidak cocok lagi dengan pola lain
+IMPORTANT_PHRASES_COMBINED = re.compile('|'.join(f'({pattern.pattern})' for pattern, _ in IMPORTANT_PHRASES), re.IGNORECASE)
+
+# Pola gabungan untuk clean_text_pipeline (dikompilasi sekali saat impor)
+CLEAN_PATTERNS = {
+    'slash_pair': re.compile(r'(\b\w+)\s*/\s*(\b\w+)'),  # "A/B" -> "A atau B"
+    'numeric_comparison': re.compile(r'(>=|<=|>|<)\s*(\d+)'),  # >=, <=, >, < diikuti angka
+    'symbols': re.compile(r'[^\w\s]+'),  # Simbol berulang dan tanda baca tunggal -> satu spasi
+    'digits_non_ascii': re.compile(r'[^\x00-\x2F\x3A-\x7F]+'),  # Angka dan karakter non-ASCII
+}
+
+# Kata pengganti operator perbandingan numerik
+NUMERIC_COMPARISON_WORDS = {
+    '>=': 'lebih dari sama dengan',
+    '<=': 'kurang dari sama dengan',
+    '>': 'lebih dari',
+    '<': 'kurang dari',
+}
+
+# Tabel str.translate untuk karakter khusus setelah html.unescape
+HTML_ENTITY_TABLE = str.maketrans({
+    '\u00a0': ' ',  # Spasi non-breaking -> spasi
+    '\u2013': '-',  # En-dash -> tanda hubung
+    '\u2014': '-',  # Em-dash -> tanda hubung
+    '\u2026': '...',  # Elipsis -> tiga titik
+})
+
+# Versi logika pipeline; naikkan nilainya setiap kali aturan pembersihan/stopwords/stemming berubah
+# agar preprocessing inkremental memproses ulang seluruh data
+PREPROCESSING_PIPELINE_VERSION = 2  # v2: kata negasi tidak lagi dibuang sebagai stopword
+
+NEGATION_WORDS = frozenset({'tidak', 'tak', 'bukan', 'belum', 'jangan', 'kurang', 'tanpa', 'gak', 'nggak', 'enggak', 'ndak'})  # Kata negasi (dipertahankan untuk skor lexicon)
+
+STEM_LRU_CACHE_SIZE = 10000  # Batas kata baru (di luar cache persisten) yang disimpan di memori per proses
+
+def pipeline_fingerprint(slang_words_path):
+    # Sidik jari versi pipeline dan isi kamus slang
+    digest = hashlib.sha1(f"pipeline-v{PREPROCESSING_PIPELINE_VERSION}".encode('utf-8'))  # Mulai dari versi pipeline
+    if slang_words_path and os.path.exists(slang_words_path):  # Sertakan isi kamus slang jika ada
+        with open(slang_words_path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()  # Kembalikan sidik jari heksadesimal
+
+def text_fingerprint(text, pipeline_fp):
+    # Sidik jari satu teks untuk versi pipeline tertentu (disimpan di Preprocessing.source_hash)
+    return hashlib.sha1(f"{pipeline_fp}\x00{text or ''}".encode('utf-8')).hexdigest()
+
+def load_stem_cache(stem_cache_path):
+    # Memuat cache stemming persisten (SQLite, tabel stems) ke dictionary, dibuka read-only
+    if not stem_cache_path or not os.path.exists(stem_cache_path):  # Cache belum pernah dibuat
+        return {}
+    try:
+        conn = sqlite3.connect(f"file:{stem_cache_path}?mode=ro", uri=True)  # Buka read-only agar aman dibaca banyak worker
+        try:
+            return dict(conn.execute("SELECT word, stem FROM stems"))  # Muat seluruh pasangan kata -> kata dasar
+        finally:
+            conn.close()
+    except sqlite3.Error as e:  # Tangani file rusak/terkunci
+        print(f"Warning: Error loading stem cache from {stem_cache_path}: {e}")  # Tampilkan peringatan
+        return {}
+
+def save_stem_cache(stem_cache_path, new_stems):
+    # Menggabungkan kata yang baru distem ke cache stemming persisten
+    if not stem_cache_path or not new_stems:  # Tidak ada yang perlu disimpan
+        return 0
+    try:
+        conn = sqlite3.connect(stem_cache_path, timeout=30)  # Buat file jika belum ada
+        try:
+            with conn:  # Transaksi tunggal
+                conn.execute("CREATE TABLE IF NOT EXISTS stems (word TEXT PRIMARY KEY, stem TEXT NOT NULL)")
+                conn.executemany("INSERT OR IGNORE INTO stems (word, stem) VALUES (?, ?)", new_stems.items())
+        finally:
+            conn.close()
+    except sqlite3.Error as e:  # Cache hanya optimasi; kegagalan tidak menghentikan preprocessing
+        print(f"Warning: Error saving stem cache to {stem_cache_path}: {e}")  # Tampilkan peringatan
+        return 0
+    return len(new_stems)  # Kembalikan jumlah kata baru
+
 def load_json_dict(file_path):
     # Memuat file JSON ke dictionary
     if not file_path or not os.path.exists(file_path):  # Periksa keberadaan file
@@ -49,27 +133,28 @@ def load_json_dict(file_path):
         print(f"Warning: Error loading JSON from {file_path}: {e}")  # Tampilkan peringatan
         return {}  # Kembalikan dictionary kosong
 
+# Pola Unicode emoji, dikompilasi sekali saat impor
+EMOJI_PATTERN = re.compile(
+    "["  # Pola Unicode untuk emoji
+    "\U0001F600-\U0001F64F"  # Emotikon
+    "\U0001F300-\U0001F5FF"  # Simbol & piktogram
+    "\U0001F680-\U0001F6FF"  # Transportasi & peta
+    "\U0001F1E0-\U0001F1FF"  # Bendera
+    "\U0001F700-\U0001F77F"  # Alkemia
+    "\U0001F780-\U0001F7FF"  # Bentuk geometris
+    "\U0001F800-\U0001F8FF"  # Panah tambahan
+    "\U0001F900-\U0001F9FF"  # Simbol tambahan
+    "\U0001FA00-\U0001FA6F"  # Simbol catur
+    "\U0001FA70-\U0001FAFF"  # Simbol diperpanjang
+    "\U00002702-\U000027B0"  # Dingbat
+    "\U000024C2-\U0001F251"  # Simbol lainnya
+    "]+", flags=re.UNICODE
+)
 def remove_emoji(text):
     # Menghapus emoji dari teks
     if not isinstance(text, str) or not text:  # Periksa apakah input string valid
         return text  # Kembalikan teks asli jika tidak valid
-    emoji_pattern = re.compile(
-        "["  # Pola Unicode untuk emoji
-        "\U0001F600-\U0001F64F"  # Emotikon
-        "\U0001F300-\U0001F5FF"  # Simbol & piktogram
-        "\U0001F680-\U0001F6FF"  # Transportasi & peta
-        "\U0001F1E0-\U0001F1FF"  # Bendera
-        "\U0001F700-\U0001F77F"  # Alkemia
-        "\U0001F780-\U0001F7FF"  # Bentuk geometris
-        "\U0001F800-\U0001F8FF"  # Panah tambahan
-        "\U0001F900-\U0001F9FF"  # Simbol tambahan
-        "\U0001FA00-\U0001FA6F"  # Simbol catur
-        "\U0001FA70-\U0001FAFF"  # Simbol diperpanjang
-        "\U00002702-\U000027B0"  # Dingbat
-        "\U000024C2-\U0001F251"  # Simbol lainnya
-        "]+", flags=re.UNICODE
-    )
-    return emoji_pattern.sub('', text)  # Ganti emoji dengan string kosong
+    return EMOJI_PATTERN.sub('', text)  # Ganti emoji dengan string kosong
 
 def clean_html_entities(text):
     # Membersihkan entitas HTML dan karakter khusus
@@ -142,25 +227,146 @@ def normalize_whitespace(text):
     return text.strip()  # Hapus spasi awal/akhir dan kembalikan teks
 
 def clean_text_pipeline(text):
-    # Pipeline pembersihan teks
+    # Pipeline pembersihan teks (versi gabungan; hasil identik dengan urutan CLEAN_TEXT_STAGES)
     if not isinstance(text, str) or not text.strip():  # Periksa apakah input string valid
         return ""  # Kembalikan string kosong jika tidak valid
-    text = clean_html_entities(text)  # Bersihkan entitas HTML
-    text = remove_urls_and_mentions(text)  # Hapus URL, email, mention, dan RT
-    text = remove_emoji(text)  # Hapus emoji
-    text = normalize_text_patterns(text)  # Normalisasi frasa dan hashtag
-    text = normalize_numeric_comparisons(text)  # Normalisasi perbandingan numerik
+    text = html.unescape(text).translate(HTML_ENTITY_TABLE)  # Bersihkan entitas HTML dan karakter khusus
+    if '/' in text:  # URL selalu mengandung "/"
+        text = REGEX_PATTERNS['links'].sub('', text)  # Hapus URL
+    if '@' in text:  # Email dan mention selalu mengandung "@"
+        text = REGEX_PATTERNS['email'].sub('', text)  # Hapus alamat email
+        text = REGEX_PATTERNS['username_mentions'].sub('', text)  # Hapus mention pengguna
+    text = REGEX_PATTERNS['rt_pattern'].sub('', text)  # Hapus kata "RT"
+    text = EMOJI_PATTERN.sub('', text)  # Hapus emoji
+    text = IMPORTANT_PHRASES_COMBINED.sub(lambda m: IMPORTANT_PHRASES[m.lastindex - 1][1], text)  # Ganti frasa penting dengan token
+    if '#' in text:  # Hashtag selalu diawali "#"
+        text = REGEX_PATTERNS['hashtags'].sub('', text)  # Hapus hashtag lainnya
+    if '/' in text:  # Pola "A/B"
+        text = CLEAN_PATTERNS['slash_pair'].sub(r'\1 atau \2', text)  # Ganti "A/B" dengan "A atau B"
+    if '<' in text or '>' in text:  # Perbandingan numerik
+        text = CLEAN_PATTERNS['numeric_comparison'].sub(lambda m: f"{NUMERIC_COMPARISON_WORDS[m.group(1)]} {m.group(2)}", text)  # Ganti operator dengan teks
     text = text.lower()  # Konversi ke huruf kecil
-    text = clean_symbols_and_punctuation(text)  # Bersihkan simbol dan tanda baca
-    text = handle_special_numbers(text)  # Hapus angka
-    text = REGEX_PATTERNS['non_ascii'].sub('', text)  # Hapus karakter non-ASCII
-    text = normalize_whitespace(text)  # Normalisasi spasi
+    text = REGEX_PATTERNS['repeated_letters'].sub(r'\1\1', text)  # Batasi huruf berulang
+    text = CLEAN_PATTERNS['symbols'].sub(' ', text)  # Ganti simbol dan tanda baca dengan spasi
+    text = CLEAN_PATTERNS['digits_non_ascii'].sub('', text)  # Hapus angka dan karakter non-ASCII
+    text = REGEX_PATTERNS['multiple_spaces'].sub(' ', text)  # Ganti spasi berlebih dengan satu spasi
+    text = REGEX_PATTERNS['repeated_words'].sub(r'\1', text)  # Hapus kata berulang
     return text.strip()  # Kembalikan teks yang telah dibersihkan
 
+# Tahapan pembersihan asli satu per satu; dipakai sebagai acuan hasil dan untuk mengukur waktu per tahap
+CLEAN_TEXT_STAGES = [
+    ('html_entities', clean_html_entities),
+    ('urls_mentions', remove_urls_and_mentions),
+    ('emoji', remove_emoji),
+    ('phrases_hashtags', normalize_text_patterns),
+    ('numeric_comparisons', normalize_numeric_comparisons),
+    ('lowercase', str.lower),
+    ('symbols_punctuation', clean_symbols_and_punctuation),
+    ('numbers', handle_special_numbers),
+    ('non_ascii', lambda text: REGEX_PATTERNS['non_ascii'].sub('', text)),
+    ('whitespace', normalize_whitespace),
+]
+
+def clean_text_by_stages(text):
+    # Pipeline pembersihan tahap demi tahap (acuan untuk clean_text_pipeline)
+    if not isinstance(text, str) or not text.strip():  # Periksa apakah input string valid
+        return ""  # Kembalikan string kosong jika tidak valid
+    for _, stage in CLEAN_TEXT_STAGES:  # Jalankan setiap tahap berurutan
+        text = stage(text)
+    return text.strip()  # Kembalikan teks yang telah dibersihkan
+
+class SlangReplacer:
+    # Mesin penggantian kata slang yang dikompilasi sekali per worker.
+    # Hasilnya identik dengan penggantian berurutan (satu re.sub per entri kamus, urut dari frasa terpanjang),
+    # termasuk efek berantai ketika kata baku hasil penggantian cocok lagi dengan entri berikutnya.
+    # Jalur cepat: satu lintasan token dengan lookup hash (rantai penggantian sudah dihitung di awal).
+    # Jika teks mungkin memicu entri frasa/bersimbol, dipakai jalur berurutan dengan pola yang sudah dikompilasi.
+
+    def __init__(self, kamus_tidak_baku):
+        self.kamus = kamus_tidak_baku or {}  # Simpan kamus asli
+        self.steps = sorted(self.kamus.items(), key=lambda item: len(item[0]), reverse=True)  # Urutan sama dengan versi berurutan
+        self._patterns = [re.compile(r'\b' + re.escape(slang) + r'\b', re.IGNORECASE) for slang, _ in self.steps]  # Pola per entri
+        self._lowered = [slang.lower() if slang.isascii() else None for slang, _ in self.steps]  # Kunci untuk pra-filter substring
+        self._fast = all(slang.isascii() and baku.isascii() and '\\' not in baku for slang, baku in self.steps)  # Jalur cepat hanya untuk kamus ASCII tanpa escape
+        self._word_index = {}  # Kata (huruf kecil) -> indeks entri satu kata
+        self._phrases = []  # Entri frasa/bersimbol: (token penyusun, simbol penyusun)
+        for idx, (slang, _) in enumerate(self.steps):  # Klasifikasikan setiap entri
+            lowered = slang.lower()
+            if REGEX_PATTERNS['word_run'].fullmatch(lowered):  # Entri satu kata
+                self._word_index.setdefault(lowered, []).append(idx)
+            else:  # Entri frasa atau bersimbol
+                runs = frozenset(REGEX_PATTERNS['word_run'].findall(lowered))
+                symbols = frozenset(REGEX_PATTERNS['word_run'].sub('', lowered).replace(' ', ''))
+                self._phrases.append((runs, symbols))
+        resolved = {}  # Cache hasil rantai per indeks entri
+        self._token_map = {word: self._resolve(indices[0], resolved) for word, indices in self._word_index.items()}  # Kata slang -> hasil akhir
+        self._reach = {word: self._reachable(word) for word in self._word_index}  # Kata slang -> token/simbol yang bisa dihasilkan
+
+    def __len__(self):
+        # Jumlah entri kamus
+        return len(self.steps)
+
+    def _later_index(self, word, idx):
+        # Indeks entri satu kata untuk kata ini yang diproses setelah entri idx
+        return next((j for j in self._word_index.get(word, ()) if j > idx), None)
+
+    def _resolve(self, idx, resolved):
+        # Kata baku entri idx setelah diganti lagi oleh entri-entri sesudahnya
+        if idx not in resolved:
+            def replace_run(match):
+                later = self._later_index(match.group().lower(), idx)
+                return match.group() if later is None else self._resolve(later, resolved)
+            resolved[idx] = REGEX_PATTERNS['word_run'].sub(replace_run, self.steps[idx][1])
+        return resolved[idx]
+
+    def _reachable(self, word):
+        # Token dan simbol yang bisa muncul dari rantai penggantian sebuah kata
+        runs, symbols, stack = {word}, set(), [word]
+        while stack:
+            for idx in self._word_index.get(stack.pop(), ()):
+                baku = self.steps[idx][1].lower()
+                symbols.update(baku)
+                for run in REGEX_PATTERNS['word_run'].findall(baku):
+                    if run not in runs:
+                        runs.add(run)
+                        stack.append(run)
+        return runs, symbols
+
+    def _may_match_phrase(self, text):
+        # True jika suatu entri frasa mungkin cocok: semua token dan simbolnya bisa muncul di teks
+        runs, symbols = set(), set(text.lower())
+        for run in REGEX_PATTERNS['word_run'].findall(text.lower()):
+            reach_runs, reach_symbols = self._reach.get(run, ((run,), ()))
+            runs.update(reach_runs)
+            symbols.update(reach_symbols)
+        return any(phrase_runs <= runs and phrase_symbols <= symbols for phrase_runs, phrase_symbols in self._phrases)
+
+    def _replace_sequential(self, text):
+        # Penggantian berurutan satu regex per entri (perilaku referensi), entri yang tidak muncul dilewati
+        lowered = text.lower() if text.isascii() else None
+        for idx, (_, baku) in enumerate(self.steps):
+            if lowered is not None and self._lowered[idx] is not None and self._lowered[idx] not in lowered:
+                continue  # Untuk teks ASCII, pola tidak mungkin cocok tanpa substring ini
+            replaced = self._patterns[idx].sub(baku, text)
+            if replaced != text:
+                text = replaced
+                lowered = text.lower() if text.isascii() else None
+        return text
+
+    def replace(self, text):
+        # Mengganti kata slang dengan kata baku
+        if not isinstance(text, str) or not text or not self.steps:  # Periksa input valid
+            return text
+        if not self._fast or not text.isascii() or self._may_match_phrase(text):
+            return self._replace_sequential(text)
+        return REGEX_PATTERNS['word_run'].sub(lambda m: self._token_map.get(m.group().lower(), m.group()), text)  # Satu lintasan token
+
 def replace_taboo_words(text, kamus_tidak_baku):
     # Mengganti kata slang dengan kata baku
     if not isinstance(text, str) or not text or not kamus_tidak_baku:  # Periksa input valid
         return text  # Kembalikan teks asli jika tidak valid
+    if isinstance(kamus_tidak_baku, SlangReplacer):  # Gunakan mesin terkompilasi jika tersedia
+        return kamus_tidak_baku.replace(text)
     sorted_slang_items = sorted(kamus_tidak_baku.items(), key=lambda item: len(item[0]), reverse=True)  # Urutkan berdasarkan panjang frasa
     modified_text = text
     for slang_phrase, baku_word in sorted_slang_items:  # Iterasi kamus slang
@@ -190,9 +396,10 @@ def tokenize(text):
     tokens = [token.strip() for token in text.split() if token.strip()]  # Pisah teks berdasarkan spasi
     return [token for token in tokens if '_' in token or (len(token) >= 2 and not token.isdigit())]  # Filter token minimal 2 huruf
 
-def init_worker(slang_words_path):
+def init_worker(slang_words_path, stem_cache_path=None):
     # Inisialisasi worker untuk pemrosesan paralel
-    global stopwords_worker, slang_words_worker, cached_stem  # Deklarasi variabel global
+    global stopwords_worker, slang_words_worker, slang_replacer_worker, new_stems_worker, cached_stem  # Deklarasi variabel global
+    new_stems_worker = {}  # Kata yang distem di worker ini dan belum ada di cache persisten
     try:
         from Sastrawi.StopWordRemover.StopWordRemoverFactory import StopWordRemoverFactory  # Impor Sastrawi stopwords
         from Sastrawi.Stemmer.StemmerFactory import StemmerFactory  # Impor Sastrawi stemmer
@@ -206,24 +413,34 @@ def init_worker(slang_words_path):
             'prof', 'anjay', 'cuy', 'sa', 'an', "l", "n", "toh", "wkwkwkkw", "si", "s", "bos"
         ]  # Daftar stopwords kustom
         stopwords_worker.update(custom_stopwords)  # Tambah stopwords kustom
+        stopwords_worker -= NEGATION_WORDS  # Pertahankan kata negasi agar pelabelan lexicon bisa membalik polaritas
         stemmer_factory = StemmerFactory()  # Buat factory stemmer
         stemmer_worker = stemmer_factory.create_stemmer()  # Buat stemmer
         slang_words_worker = load_json_dict(slang_words_path)  # Muat kamus slang
         if slang_words_worker:  # Periksa apakah kamus slang berhasil dimuat
             print(f"Worker PID {os.getpid()}: Successfully loaded {len(slang_words_worker)} slang words.")  # Log jumlah slang
-        @lru_cache(maxsize=10000)  # Cache hingga 10000 kata
+        slang_replacer_worker = SlangReplacer(slang_words_worker)  # Kompilasi mesin penggantian slang sekali per worker
+        stem_cache = load_stem_cache(stem_cache_path)  # Muat cache stemming persisten (read-only, ukurannya tetap)
+        @lru_cache(maxsize=STEM_LRU_CACHE_SIZE)  # Kata baru dibatasi agar proses web yang berjalan lama tidak terus membesar
+        def stem_new_word(word):  # Stem kata yang belum ada di cache persisten
+            stem = stemmer_worker.stem(word)
+            if stem_cache_path:  # Catat hanya bila ada file cache untuk menampungnya (dikosongkan per potongan)
+                new_stems_worker[word] = stem
+            return stem
         def stem_word(word):  # Fungsi stemming dengan caching
             if not word or not isinstance(word, str):  # Periksa input valid
                 return word  # Kembalikan kata asli jika tidak valid
-            return stemmer_worker.stem(word)  # Stem kata
+            stem = stem_cache.get(word)  # Cari di cache persisten
+            return stem if stem is not None else stem_new_word(word)  # Kembalikan kata dasar
+        stem_word.cache_info = stem_new_word.cache_info  # Statistik cache kata baru, untuk pemantauan
         globals()['cached_stem'] = stem_word  # Simpan fungsi stemming ke global
     except ImportError as e:  # Tangani error impor Sastrawi
         print(f"Error: Failed to import Sastrawi: {e}. Preprocessing will be limited.")  # Tampilkan peringatan
-        stopwords_worker, slang_words_worker = set(), {}  # Inisialisasi kosong
+        stopwords_worker, slang_words_worker, slang_replacer_worker = set(), {}, SlangReplacer({})  # Inisialisasi kosong
         globals()['cached_stem'] = lambda word: word  # Fallback stemmer
     except Exception as e:  # Tangani error lainnya
         print(f"Error during worker initialization: {e}")  # Tampilkan peringatan
-        stopwords_worker, slang_words_worker = set(), {}  # Inisialisasi kosong
+        stopwords_worker, slang_words_worker, slang_replacer_worker = set(), {}, SlangReplacer({})  # Inisialisasi kosong
         globals()['cached_stem'] = lambda word: word  # Fallback stemmer
 
 def preprocess_single_text_worker(text_info):
@@ -235,7 +452,7 @@ def preprocess_single_text_worker(text_info):
         cleaned = clean_text_pipeline(text)  # Bersihkan teks
         if not cleaned.strip():  # Periksa apakah teks bersih kosong
             return None  # Kembalikan None jika kosong
-        baku = replace_taboo_words(cleaned, slang_words_worker)  # Ganti kata slang dengan baku
+        baku = replace_taboo_words(cleaned, slang_replacer_worker)  # Ganti kata slang dengan baku
         tokens = tokenize(baku)  # Tokenisasi teks
         if not tokens:  # Periksa apakah token kosong
             return None  # Kembalikan None jika kosong
@@ -256,27 +473,74 @@ def preprocess_single_text_worker(text_info):
         print(f"Error processing text in worker: {e}")  # Tampilkan peringatan
         return None  # Kembalikan None jika gagal
 
-def preprocess_texts_batch(texts_data, slang_words_path, max_workers=None):
-    # Memproses teks secara paralel
-    if not texts_data:  # Periksa apakah data teks kosong
-        return []  # Kembalikan list kosong jika kosong
+def preprocess_text_chunk_worker(chunk):
+    # Memproses satu potongan teks; kembalikan hasil dan kata baru hasil stemming untuk cache persisten
+    results = [res for text_info in chunk if (res := preprocess_single_text_worker(text_info)) is not None]  # Proses tiap teks
+    new_stems = dict(new_stems_worker)  # Salin kata baru sejak potongan sebelumnya
+    new_stems_worker.clear()  # Kosongkan agar tidak dikirim ulang
+    return results, new_stems
+
+def auto_chunk_size(total_texts, max_workers):
+    # Ukuran potongan: cukup besar untuk menekan overhead IPC, cukup kecil agar beban worker merata
+    if not total_texts:  # Jumlah tidak diketahui (iterator)
+        return 256
+    return max(16, min(1000, -(-total_texts // (max_workers * 8))))  # Sekitar 8 potongan per worker
+
+def iter_chunks(items, chunk_size):
+    # Memotong iterable menjadi list berukuran chunk_size tanpa memuat semuanya
+    iterator = iter(items)
+    while chunk := list(islice(iterator, chunk_size)):
+        yield chunk
+
+def iter_preprocess_texts(texts_data, slang_words_path, max_workers=None, stem_cache_path=None, chunk_size=None):
+    # Memproses teks secara paralel dan menghasilkan (yield) hasil per dokumen begitu potongannya selesai
     if max_workers is None:  # Tentukan jumlah worker jika tidak ditentukan
         max_workers = min(4, os.cpu_count() or 1)  # Gunakan hingga 4 worker
-    print(f"Starting batch preprocessing with {max_workers} workers for {len(texts_data)} texts...")  # Log mulai proses
+    total_texts = len(texts_data) if hasattr(texts_data, '__len__') else None  # Jumlah teks jika diketahui
+    if chunk_size is None:  # Tentukan ukuran potongan otomatis
+        chunk_size = auto_chunk_size(total_texts, max_workers)
+    print(f"Starting batch preprocessing with {max_workers} workers for {total_texts if total_texts is not None else 'streamed'} texts (chunk size {chunk_size})...")  # Log mulai proses
     t0 = time.time()  # Catat waktu mulai
-    results = []
+    chunks = iter_chunks(texts_data, chunk_size)  # Potongan teks per tugas
+    in_flight, futures = deque(), deque()  # Potongan yang sedang diproses (dibatasi agar memori tetap kecil)
+    new_stems, docs_count, results_count = {}, 0, 0  # Kata baru untuk cache stemming dan penghitung
     try:
-        with ProcessPoolExecutor(max_workers=max_workers, initializer=init_worker, initargs=(slang_words_path,)) as executor:  # Buat executor paralel
-            results = list(filter(None, executor.map(preprocess_single_text_worker, texts_data)))  # Proses teks paralel
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=init_worker, initargs=(slang_words_path, stem_cache_path)) as executor:  # Buat executor paralel
+            while True:
+                while len(futures) < max_workers * 2 and (chunk := next(chunks, None)) is not None:  # Isi antrean potongan
+                    in_flight.append(chunk)
+                    futures.append(executor.submit(preprocess_text_chunk_worker, chunk))
+                if not futures:  # Semua potongan selesai
+                    break
+                chunk_results, chunk_stems = futures[0].result()  # Tunggu potongan tertua agar urutan hasil terjaga
+                futures.popleft()
+                docs_count += len(in_flight.popleft())
+                results_count += len(chunk_results)
+                new_stems.update(chunk_stems)
+                yield from chunk_results  # Serahkan hasil ke pemanggil untuk disimpan bertahap
     except Exception as e:  # Tangani error pemrosesan paralel
         print(f"Error in batch processing: {e}. Falling back to single process mode.")  # Tampilkan peringatan
-        init_worker(slang_words_path)  # Inisialisasi worker untuk mode tunggal
-        results = [res for text_data in texts_data if (res := preprocess_single_text_worker(text_data)) is not None]  # Proses tunggal
-    t1 = time.time()  # Catat waktu selesai
-    success_rate = (len(results) / len(texts_data) * 100) if texts_data else 0  # Hitung tingkat keberhasilan
-    print(f"Batch processing completed in {t1-t0:.2f} seconds.")  # Log waktu proses
-    print(f"- Successfully processed: {len(results)}/{len(texts_data)} texts ({success_rate:.2f}%)")  # Log hasil proses
-    return results  # Kembalikan hasil preprocessing
+        init_worker(slang_words_path, stem_cache_path)  # Inisialisasi worker untuk mode tunggal
+        remaining = list(in_flight)  # Potongan yang belum selesai diproses
+        in_flight.clear()
+        for chunk in remaining + list(chunks):  # Proses tunggal sisa potongan
+            chunk_results, chunk_stems = preprocess_text_chunk_worker(chunk)
+            docs_count += len(chunk)
+            results_count += len(chunk_results)
+            new_stems.update(chunk_stems)
+            yield from chunk_results
+    saved_stems = save_stem_cache(stem_cache_path, new_stems)  # Gabungkan kata baru ke cache stemming persisten
+    elapsed = time.time() - t0  # Waktu total
+    success_rate = (results_count / docs_count * 100) if docs_count else 0  # Hitung tingkat keberhasilan
+    print(f"Batch processing completed in {elapsed:.2f} seconds ({docs_count / elapsed if elapsed else 0:.1f} docs/sec).")  # Log waktu dan throughput
+    print(f"- Successfully processed: {results_count}/{docs_count} texts ({success_rate:.2f}%)")  # Log hasil proses
+    print(f"- New words added to stem cache: {saved_stems}")  # Log pertumbuhan cache stemming
+
+def preprocess_texts_batch(texts_data, slang_words_path, max_workers=None, stem_cache_path=None, chunk_size=None):
+    # Memproses teks secara paralel dan mengumpulkan semua hasil dalam list
+    if not texts_data:  # Periksa apakah data teks kosong
+        return []  # Kembalikan list kosong jika kosong
+    return list(iter_preprocess_texts(texts_data, slang_words_path, max_workers, stem_cache_path, chunk_size))  # Kembalikan hasil preprocessing
 
 def preprocess_single_text(text, slang_words_path=None, return_all_steps=False):
     # Memproses satu teks tanpa paralel
@@ -299,12 +563,9 @@ def extract_important_phrases(text):
             detected_phrases.append(replacement)  # Tambah frasa yang cocok
     return list(set(detected_phrases))  # Kembalikan daftar frasa unik
 
-def preprocess_workflow(dataset_entries, slangwords_path, max_workers=None):
-    # Workflow utama untuk memproses dataset
-    if not dataset_entries:  # Periksa apakah dataset kosong
-        print("Warning: No dataset entries provided.")  # Tampilkan peringatan
-        return []  # Kembalikan list kosong
-    texts_data = [
+def dataset_entries_to_texts(dataset_entries):
+    # Mengubah entri dataset (objek/baris) menjadi dict input worker
+    return [
         {
             'full_text': getattr(entry, 'full_text', str(entry)),  # Ambil teks dari entri
             'username': getattr(entry, 'username', ''),  # Ambil username
@@ -312,7 +573,21 @@ def preprocess_workflow(dataset_entries, slangwords_path, max_workers=None):
         }
         for entry in dataset_entries  # Iterasi entri dataset
     ]
+
+def iter_preprocess_workflow(dataset_entries, slangwords_path, max_workers=None, stem_cache_path=None):
+    # Workflow streaming: hasil preprocessing dihasilkan bertahap agar bisa langsung disimpan
+    if not dataset_entries:  # Periksa apakah dataset kosong
+        print("Warning: No dataset entries provided.")  # Tampilkan peringatan
+        return iter(())  # Kembalikan iterator kosong
+    return iter_preprocess_texts(dataset_entries_to_texts(dataset_entries), slangwords_path, max_workers, stem_cache_path)
+
+def preprocess_workflow(dataset_entries, slangwords_path, max_workers=None, stem_cache_path=None):
+    # Workflow utama untuk memproses dataset
+    if not dataset_entries:  # Periksa apakah dataset kosong
+        print("Warning: No dataset entries provided.")  # Tampilkan peringatan
+        return []  # Kembalikan list kosong
+    texts_data = dataset_entries_to_texts(dataset_entries)  # Siapkan input worker
     if not texts_data:  # Periksa apakah data teks kosong
         print("Error: No valid texts to process after parsing entries.")  # Tampilkan peringatan
         return []  # Kembalikan list kosong
-    return preprocess_texts_batch(texts_data, slangwords_path, max_workers)  # Proses batch dan kembalikan hasil
\ No newline at end of file
+    return preprocess_texts_batch(texts_data, slangwords_path, max_workers, stem_cache_path)  # Proses batch dan kembalikan hasil
\ No newline at end of file
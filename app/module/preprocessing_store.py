@@ -0,0 +1,49 @@
+from app.models import db, Preprocessing  # Impor database dan model Preprocessing
+
+UPSERT_CHUNK_SIZE = 1000  # Jumlah baris per perintah INSERT/UPDATE massal
+PRESERVED_COLUMNS = ('id', 'label_otomatis')  # Kolom yang tidak ditimpa saat hasil preprocessing diperbarui
+STALE_ON_UPDATE = {'lexicon_score': None, 'lexicon_polarity': None, 'lexicon_terms': None}  # Skor lexicon tersimpan dihitung ulang saat pelabelan berikutnya
+
+def load_existing_preprocessing():
+    # Memuat kunci Preprocessing yang sudah ada dalam satu kueri: full_text -> (id, source_hash, dataset_id)
+    rows = db.session.query(Preprocessing.id, Preprocessing.full_text, Preprocessing.source_hash, Preprocessing.dataset_id)  # Hanya kolom kunci
+    return {row.full_text: row for row in rows}  # Kembalikan peta full_text -> baris
+
+def _flush_chunk(inserts, updates):
+    # Menulis satu potongan baris dengan perintah massal (executemany), lalu mengosongkan buffer
+    if inserts:  # Baris baru
+        db.session.bulk_insert_mappings(Preprocessing, inserts)
+    if updates:  # Baris lama yang hasilnya berubah
+        db.session.bulk_update_mappings(Preprocessing, updates)
+    inserted, updated = len(inserts), len(updates)  # Hitung sebelum buffer dikosongkan
+    inserts.clear()
+    updates.clear()
+    return inserted, updated
+
+def upsert_preprocessing_rows(rows, existing_rows, chunk_size=UPSERT_CHUNK_SIZE):
+    # Menyimpan hasil preprocessing (iterable dict) secara massal: UPDATE jika full_text sudah ada, INSERT jika belum
+    inserts, updates = [], []  # Buffer potongan
+    total_inserted = total_updated = 0  # Penghitung hasil
+    for row in rows:  # Iterasi hasil preprocessing
+        existing = existing_rows.get(row.get('full_text'))  # Cari baris lama dari peta yang sudah dimuat
+        if existing is not None:  # Baris sudah ada: perbarui tanpa menyentuh label
+            mapping = {k: v for k, v in row.items() if k not in PRESERVED_COLUMNS}
+            mapping['id'] = existing.id
+            mapping.update(STALE_ON_UPDATE)
+            updates.append(mapping)
+        else:  # Baris baru
+            mapping = {'label_otomatis': None}
+            mapping.update(row)
+            inserts.append(mapping)
+        if len(inserts) + len(updates) >= chunk_size:  # Tulis per potongan agar memori tetap kecil
+            inserted, updated = _flush_chunk(inserts, updates)
+            total_inserted += inserted
+            total_updated += updated
+    inserted, updated = _flush_chunk(inserts, updates)  # Tulis sisa potongan terakhir
+    return total_inserted + inserted, total_updated + updated  # Kembalikan jumlah baris baru dan diperbarui
+
+def relink_dataset_ids(relinks, chunk_size=UPSERT_CHUNK_SIZE):
+    # Memperbarui dataset_id secara massal untuk pasangan {'id', 'dataset_id'}
+    for start in range(0, len(relinks), chunk_size):  # Tulis per potongan
+        db.session.bulk_update_mappings(Preprocessing, relinks[start:start + chunk_size])
+    return len(relinks)  # Kembalikan jumlah baris yang ditautkan ulang
@@ -1,7 +1,11 @@
 import numpy as np
+import os
 import random
+import tempfile
+import scipy.sparse as sp
 from collections import Counter
-# Impor pustaka untuk operasi array, pengacakan, dan penghitungan kelas.
+from concurrent.futures import ProcessPoolExecutor
+# Impor pustaka untuk operasi array, matriks sparse, pengacakan, penghitungan kelas, dan pelatihan paralel.
 
 # Parameter default untuk label otomatis
 LABEL_OTOMATIS_PARAMS = {
@@ -9,7 +13,12 @@ LABEL_OTOMATIS_PARAMS = {
     'lambda_param': 0.01,    # Parameter regularisasi untuk mencegah overfitting.
     'n_iters': 2000,         # Jumlah iterasi pelatihan.
     'batch_size': 16,        # Ukuran batch untuk pembaruan gradien.
-    'lr_decay': 0.01         # Faktor penurunan laju belajar.
+    'lr_decay': 0.01,        # Faktor penurunan laju belajar.
+    'early_stopping': True,  # Hentikan pelatihan kelas saat loss tidak lagi turun.
+    'tol': 1e-4,             # Perubahan relatif loss minimum yang dihitung sebagai perbaikan.
+    'n_iter_no_change': 10,  # Jumlah epoch tanpa perbaikan sebelum berhenti.
+    'validation_fraction': 0.0,  # Porsi data latih untuk validasi (0 = pantau loss data latih).
+    'solver': 'sgd'          # Mesin optimasi: 'sgd' (mini-batch) atau 'dual_cd' (dual coordinate descent).
 }
 
 # Parameter default untuk label pakar (lebih stabil)
@@ -18,15 +27,251 @@ LABEL_PAKAR_PARAMS = {
     'lambda_param': 0.01,    # Nilai regularisasi yang optimal.
     'n_iters': 2000,         # Iterasi lebih banyak untuk pembelajaran menyeluruh.
     'batch_size': 16,        # Batch kecil untuk pembaruan gradien halus.
-    'lr_decay': 0.01         # Faktor penurunan laju belajar yang optimal.
+    'lr_decay': 0.01,        # Faktor penurunan laju belajar yang optimal.
+    'early_stopping': True,  # Hentikan pelatihan kelas saat loss tidak lagi turun.
+    'tol': 1e-4,             # Perubahan relatif loss minimum yang dihitung sebagai perbaikan.
+    'n_iter_no_change': 10,  # Jumlah epoch tanpa perbaikan sebelum berhenti.
+    'validation_fraction': 0.0,  # Porsi data latih untuk validasi (0 = pantau loss data latih).
+    'solver': 'sgd'          # Mesin optimasi: 'sgd' (mini-batch) atau 'dual_cd' (dual coordinate descent).
 }
 
+LOSS_LOG_EVERY = 200
+# Interval epoch untuk mencetak loss pelatihan.
+
+def ovr_hinge_losses(X, Y, sample_weights, W, b, lambda_param):
+    # Menghitung hinge loss seluruh data untuk semua kelas sekaligus (satu baris W per kelas).
+    margins = Y * (X.dot(W.T).T + b[:, np.newaxis])
+    # Margin per kelas per sampel (kelas x sampel).
+    data_loss = np.mean(np.maximum(0, 1 - margins) * sample_weights, axis=1)
+    # Rata-rata hinge loss tertimbang per kelas.
+    return data_loss + 0.5 * lambda_param * np.einsum('ij,ij->i', W, W)
+    # Total loss = loss data + regularisasi.
+
+class ConvergenceMonitor:
+    # Memantau loss per kelas setiap epoch; kelas dianggap konvergen jika perubahan relatif loss
+    # terbaik kurang dari tol selama n_iter_no_change epoch berturut-turut.
+
+    def __init__(self, n_classes, tol=1e-4, n_iter_no_change=10, enabled=True):
+        self.tol = tol
+        self.n_iter_no_change = n_iter_no_change
+        self.enabled = enabled
+        self.best_loss = np.full(n_classes, np.inf)
+        self.no_improvement = np.zeros(n_classes, dtype=int)
+        self.loss_curve = [[] for _ in range(n_classes)]
+        # Riwayat loss per kelas (satu nilai per epoch).
+
+    def update(self, class_rows, losses):
+        # Catat loss kelas aktif dan kembalikan mask kelas yang sudah konvergen.
+        for k, loss in zip(class_rows, losses):
+            self.loss_curve[k].append(float(loss))
+        best = self.best_loss[class_rows]
+        improved = losses < best - self.tol * np.abs(np.where(np.isfinite(best), best, 0.0))
+        # Perbaikan jika loss turun lebih dari tol relatif terhadap loss terbaik.
+        self.no_improvement[class_rows] = np.where(improved, 0, self.no_improvement[class_rows] + 1)
+        self.best_loss[class_rows] = np.minimum(best, losses)
+        if not self.enabled:
+            return np.zeros(len(class_rows), dtype=bool)
+        return self.no_improvement[class_rows] >= self.n_iter_no_change
+
+def _epoch_layout(X, permutations, batch_size, class_rows):
+    # Menyusun urutan baris satu epoch (batch demi batch, kelas demi kelas) sebagai indeks ke CSR X,
+    # tanpa menyalin matriks: hanya id kolom, nilai, dan segmen baris yang diambil lewat indeks.
+    n_active, n_samples = permutations.shape
+    n_batches = -(-n_samples // batch_size)
+    padding = n_batches * batch_size - n_samples
+    padded = np.pad(permutations, ((0, 0), (0, padding)), constant_values=-1)
+    order = padded.reshape(n_active, n_batches, batch_size).transpose(1, 0, 2).ravel()
+    # Urutan: batch ke-t berisi potongan permutasi setiap kelas aktif secara berdampingan.
+    class_ids = np.broadcast_to(class_rows[np.newaxis, :, np.newaxis], (n_batches, n_active, batch_size)).ravel()
+    # Baris W milik setiap kelas aktif.
+    keep = order >= 0
+    rows, classes = order[keep], class_ids[keep]
+    # Buang padding batch terakhir.
+    row_ptr = np.append(np.arange(n_batches) * n_active * batch_size, n_active * n_samples)
+    # Batas baris setiap batch.
+    starts = X.indptr[rows]
+    lengths = X.indptr[rows + 1] - starts
+    nz_ptr = np.zeros(len(rows) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=nz_ptr[1:])
+    # Batas elemen non-nol setiap baris dalam urutan epoch.
+    positions = np.arange(nz_ptr[-1]) + np.repeat(starts - nz_ptr[:-1], lengths)
+    segments = np.repeat(np.arange(len(rows)), lengths)
+    # Posisi elemen di X.data/X.indices dan baris (dalam urutan epoch) pemiliknya.
+    flat_cols = classes[segments] * X.shape[1] + X.indices[positions]
+    # Indeks ke W yang diratakan (kelas * n_fitur + kolom).
+    return rows, classes, row_ptr, nz_ptr, segments, flat_cols, X.data[positions]
+
+def train_ovr_sgd(X, Y, sample_weights, W, b, rngs, learning_rate, lr_decay, lambda_param,
+                  n_iters, batch_size, class_labels=None, monitor=None, validation=None):
+    # Mesin SGD mini-batch untuk beberapa klasifikasi biner one-vs-rest sekaligus.
+    # X: CSR (sampel x fitur); Y, sample_weights: (kelas x sampel) berisi +1/-1 dan bobot sampel;
+    # W, b: bobot (kelas x fitur) dan bias awal (diperbarui langsung); rngs: RandomState per kelas
+    # untuk permutasi tiap epoch. Gradien setiap batch sama dengan _hinge_loss per kelas.
+    # monitor: ConvergenceMonitor (kelas yang konvergen berhenti dilatih); validation: (X, Y, bobot)
+    # untuk memantau loss data validasi alih-alih data latih. Mengembalikan jumlah epoch per kelas.
+    n_classes, n_samples = Y.shape
+    W_flat = W.reshape(-1)
+    # Tampilan datar W (berbagi memori) untuk pembaruan lewat indeks.
+    class_labels = class_labels if class_labels is not None else list(range(n_classes))
+    monitor = monitor or ConvergenceMonitor(n_classes, enabled=False)
+    X_monitor, Y_monitor, weights_monitor = validation if validation is not None else (X, Y, sample_weights)
+    active = np.arange(n_classes)
+    # Kelas yang masih dilatih.
+    epochs_run = np.full(n_classes, n_iters)
+    for epoch in range(n_iters):
+        current_lr = learning_rate / (1 + lr_decay * epoch)
+        # Laju belajar menurun seiring epoch.
+        losses = ovr_hinge_losses(X_monitor, Y_monitor[active], weights_monitor[active], W[active], b[active], lambda_param)
+        converged = monitor.update(active, losses)
+        # Hitung loss seluruh data untuk kelas aktif.
+        if epoch == 0 or (epoch + 1) % LOSS_LOG_EVERY == 0 or epoch == n_iters - 1 or converged.any():
+            for k, loss, done in zip(active, losses, converged):
+                status = " - converged" if done else ""
+                print(f"[SVM][{class_labels[k]}] Epoch {epoch+1}/{n_iters} - Loss: {loss:.4f}, LR: {current_lr:.6f}{status}")
+            # Log loss pada epoch tertentu.
+        if converged.any():
+            epochs_run[active[converged]] = epoch
+            active = active[~converged]
+            # Hentikan kelas yang sudah konvergen.
+            if not len(active):
+                break
+
+        permutations = np.stack([rngs[k].permutation(n_samples) for k in active])
+        # Acak indeks sampel untuk setiap kelas aktif (tanpa menyalin X).
+        rows, classes, row_ptr, nz_ptr, segments, flat_cols, values = _epoch_layout(X, permutations, batch_size, active)
+        signed_weights = Y[classes, rows] * sample_weights[classes, rows]
+        targets = Y[classes, rows]
+        # Label dan bobot sampel dalam urutan epoch.
+        decay = np.ones(n_classes)
+        decay[active] = 1 - current_lr * lambda_param
+        decay = np.repeat(decay, W.shape[1])
+        # Faktor regularisasi (w -= lr * lambda * w) hanya untuk kelas aktif.
+
+        for r0, r1 in zip(row_ptr[:-1], row_ptr[1:]):
+            # Iterasi per batch (semua kelas aktif sekaligus).
+            z0, z1 = nz_ptr[r0], nz_ptr[r1]
+            local_rows = segments[z0:z1] - r0
+            cols, vals = flat_cols[z0:z1], values[z0:z1]
+            batch_classes = classes[r0:r1]
+            scores = np.bincount(local_rows, weights=vals * W_flat[cols], minlength=r1 - r0) + b[batch_classes]
+            # Skor (w*x + b) setiap baris batch terhadap bobot kelasnya.
+            violated = targets[r0:r1] * scores < 1
+            # Sampel yang melanggar margin (< 1).
+            n_violated = np.bincount(batch_classes[violated], minlength=n_classes)
+            scale = np.divide(1.0, n_violated, out=np.zeros(n_classes), where=n_violated > 0)
+            # Gradien data dirata-rata atas sampel yang melanggar, per kelas.
+            coef = np.where(violated, signed_weights[r0:r1], 0.0) * scale[batch_classes]
+            W_flat *= decay
+            np.add.at(W_flat, cols, current_lr * vals * coef[local_rows])
+            b += current_lr * np.bincount(batch_classes, weights=coef, minlength=n_classes)
+            # Perbarui bobot dan bias.
+    return epochs_run
+
+DUAL_CD_TOL = 0.1
+# Batas selisih gradien terproyeksi (maks - min) untuk menyatakan dual coordinate descent konvergen.
+
+def train_binary_dual_cd(X, y, sample_weights, lambda_param, rng, max_passes, tol=DUAL_CD_TOL):
+    # Dual coordinate descent untuk SVM linear L2 + hinge loss (Hsieh dkk., 2008) dengan shrinking.
+    # Masalah yang sama dengan SGD: rata-rata hinge tertimbang + lambda/2 ||w||^2, ditulis ulang sebagai
+    # 1/2 ||w||^2 + C * sum(bobot * hinge) dengan C = 1 / (lambda * n); bias menjadi fitur konstan 1.
+    # Batas atas dual setiap sampel = C * bobot sampelnya (class_weight='balanced' ikut berlaku).
+    n_samples, n_features = X.shape
+    upper = sample_weights / (lambda_param * n_samples)
+    # Batas atas alpha per sampel.
+    indptr, indices, data = X.indptr, X.indices, X.data
+    q_diag = np.asarray(X.multiply(X).sum(axis=1)).ravel() + 1.0
+    # Diagonal Q (||x_i||^2 + 1 untuk fitur bias).
+    alpha = np.zeros(n_samples)
+    w = np.zeros(n_features)
+    b = 0.0
+    active = np.arange(n_samples)
+    # Himpunan aktif (shrinking membuang sampel yang terikat di batas).
+    pg_max_old, pg_min_old = np.inf, -np.inf
+    losses = []
+    for n_pass in range(1, max_passes + 1):
+        pg_max_new, pg_min_new = -np.inf, np.inf
+        keep = np.ones(len(active), dtype=bool)
+        for pos in rng.permutation(len(active)):
+            # Iterasi sampel aktif dalam urutan acak.
+            i = active[pos]
+            start, end = indptr[i], indptr[i + 1]
+            cols, vals = indices[start:end], data[start:end]
+            gradient = y[i] * (vals @ w[cols] + b) - 1
+            # Gradien dual untuk alpha_i.
+            projected = gradient
+            if alpha[i] == 0:
+                if gradient > pg_max_old:
+                    keep[pos] = False
+                    continue
+                projected = min(gradient, 0.0)
+            elif alpha[i] == upper[i]:
+                if gradient < pg_min_old:
+                    keep[pos] = False
+                    continue
+                projected = max(gradient, 0.0)
+            # Gradien terproyeksi; sampel yang pasti tetap di batas di-shrink.
+            pg_max_new = max(pg_max_new, projected)
+            pg_min_new = min(pg_min_new, projected)
+            if abs(projected) > 1e-12:
+                alpha_old = alpha[i]
+                alpha[i] = min(max(alpha_old - gradient / q_diag[i], 0.0), upper[i])
+                delta = (alpha[i] - alpha_old) * y[i]
+                w[cols] += delta * vals
+                b += delta
+                # Perbarui alpha_i lalu w dan bias secara inkremental.
+        active = active[keep]
+        margins = y * (X @ w + b)
+        losses.append(float(np.mean(np.maximum(0, 1 - margins) * sample_weights) + 0.5 * lambda_param * w @ w))
+        # Catat loss primal (rumus yang sama dengan SGD) setiap lintasan.
+        if pg_max_new - pg_min_new <= tol:
+            if len(active) == n_samples:
+                break
+            active = np.arange(n_samples)
+            pg_max_old, pg_min_old = np.inf, -np.inf
+            continue
+            # Konvergen pada himpunan aktif: periksa ulang dengan semua sampel.
+        pg_max_old = pg_max_new if pg_max_new > 0 else np.inf
+        pg_min_old = pg_min_new if pg_min_new < 0 else -np.inf
+    return w, b, alpha, losses
+
+CSR_PARTS = ('data', 'indices', 'indptr')
+# Komponen CSR yang dibagikan ke proses worker lewat memory map.
+
+def share_csr(X, folder):
+    # Menyimpan komponen CSR ke file .npy agar worker bisa membukanya sebagai memory map (tanpa pickle X per tugas).
+    paths = {}
+    for part in CSR_PARTS:
+        paths[part] = os.path.join(folder, f'{part}.npy')
+        np.save(paths[part], getattr(X, part))
+    return paths, X.shape
+
+def load_shared_csr(shared):
+    # Membuka CSR bersama dari memory map (hanya dibaca, tidak disalin ke memori worker).
+    paths, shape = shared
+    parts = [np.load(paths[part], mmap_mode='r') for part in CSR_PARTS]
+    return sp.csr_matrix(tuple(parts), shape=shape, copy=False)
+
+def train_class_worker(shared_X, y_binary, sample_weights, w, b, rng, params, class_label, validation=None):
+    # Melatih satu klasifikasi biner one-vs-rest di proses worker dengan mesin SGD yang sama.
+    X = load_shared_csr(shared_X)
+    W, bias = w[np.newaxis, :].copy(), np.array([b])
+    monitor = ConvergenceMonitor(1, params['tol'], params['n_iter_no_change'], enabled=params['early_stopping'])
+    if validation is not None:
+        X_val, y_val, weights_val = validation
+        validation = (X_val, y_val[np.newaxis, :], weights_val[np.newaxis, :])
+    epochs_run = train_ovr_sgd(X, y_binary[np.newaxis, :], sample_weights[np.newaxis, :], W, bias, [rng],
+                               params['learning_rate'], params['lr_decay'], params['lambda_param'],
+                               params['n_iters'], params['batch_size'], class_labels=[class_label],
+                               monitor=monitor, validation=validation)
+    return W[0], float(bias[0]), int(epochs_run[0]), monitor.loss_curve[0]
+
 class SupportVectorMachine:
     # Kelas untuk model Support Vector Machine (SVM).
     
     def __init__(self, label_source='otomatis', learning_rate=None, lambda_param=None, 
                  n_iters=None, batch_size=None, lr_decay=None, random_state=42, 
-                 class_weight='balanced', use_oversampling=False):
+                 class_weight='balanced', use_oversampling=False, early_stopping=None, tol=None,
+                 n_iter_no_change=None, validation_fraction=None, n_jobs=1, solver=None):
         # Inisialisasi model SVM dengan parameter opsional.
         default_params = LABEL_PAKAR_PARAMS if label_source.lower() == 'pakar' else LABEL_OTOMATIS_PARAMS
         # Pilih parameter default berdasarkan sumber label.
@@ -41,6 +286,21 @@ class SupportVectorMachine:
         # Set ukuran batch.
         self.lr_decay = lr_decay if lr_decay is not None else default_params['lr_decay']
         # Set faktor penurunan laju belajar.
+        self.early_stopping = early_stopping if early_stopping is not None else default_params['early_stopping']
+        # Set status penghentian dini.
+        self.tol = tol if tol is not None else default_params['tol']
+        # Set toleransi perubahan relatif loss.
+        self.n_iter_no_change = n_iter_no_change if n_iter_no_change is not None else default_params['n_iter_no_change']
+        # Set jumlah epoch tanpa perbaikan sebelum berhenti.
+        self.validation_fraction = validation_fraction if validation_fraction is not None else default_params['validation_fraction']
+        # Set porsi data validasi untuk pemantauan loss.
+        self.n_jobs = n_jobs
+        # Jumlah proses untuk melatih kelas secara paralel (None = semua CPU, 1 = serial).
+        self.solver = solver if solver is not None else default_params['solver']
+        # Set mesin optimasi ('sgd' atau 'dual_cd').
+        if self.solver not in ('sgd', 'dual_cd'):
+            raise ValueError(f"Unknown solver '{self.solver}'. Use 'sgd' or 'dual_cd'.")
+            # Validasi nama solver.
         
         self.random_state = random_state
         # Set seed untuk pengacakan.
@@ -55,23 +315,63 @@ class SupportVectorMachine:
         # Daftar kelas (diisi saat pelatihan).
         self.class_weights_ = None
         # Bobot kelas (diisi saat pelatihan).
-        self.w = {}
-        # Bobot untuk setiap kelas.
-        self.b = {}
-        # Bias untuk setiap kelas.
+        self.W_ = None
+        # Matriks bobot kontigu (fitur x kelas), kolom mengikuti urutan classes_.
+        self.b_ = None
+        # Vektor bias (satu per kelas).
+        self.n_iter_ = {}
+        # Jumlah epoch yang dijalankan per kelas (diisi saat pelatihan).
+        self.loss_curve_ = {}
+        # Riwayat loss per epoch untuk setiap kelas.
         
         np.random.seed(self.random_state)
         random.seed(self.random_state)
         # Atur seed untuk konsistensi pengacakan.
 
-    def _init_weights_bias(self, n_features, class_label):
-        # Inisialisasi bobot dan bias untuk kelas tertentu.
+    def __setstate__(self, state):
+        # Memuat pickle model; model lama menyimpan bobot sebagai dict per kelas (w, b)
+        # dan diubah ke layout bertumpuk W_ (fitur x kelas) dan b_.
+        if 'W_' not in state:
+            w, b = state.pop('w', {}), state.pop('b', {})
+            classes = state.get('classes_')
+            if w and classes is not None:
+                state['W_'] = np.ascontiguousarray(np.column_stack([w[c] for c in classes]))
+                state['b_'] = np.array([b[c] for c in classes], dtype=float)
+            else:
+                state['W_'], state['b_'] = None, None
+            # Model lama yang belum dilatih tetap tanpa bobot.
+        default_params = LABEL_PAKAR_PARAMS if str(state.get('label_source', 'otomatis')).lower() == 'pakar' else LABEL_OTOMATIS_PARAMS
+        for name in ('early_stopping', 'tol', 'n_iter_no_change', 'validation_fraction', 'solver'):
+            state.setdefault(name, default_params[name])
+        state.setdefault('n_jobs', 1)
+        state.setdefault('n_iter_', {})
+        state.setdefault('loss_curve_', {})
+        # Lengkapi atribut yang ditambahkan setelah model lama disimpan (nilai default konstruktor).
+        self.__dict__.update(state)
+
+    @property
+    def w(self):
+        # Bobot per kelas (tampilan kolom W_), untuk kompatibilitas dengan layout dict lama.
+        if self.W_ is None:
+            return {}
+        return {class_label: self.W_[:, k] for k, class_label in enumerate(self.classes_)}
+
+    @property
+    def b(self):
+        # Bias per kelas, untuk kompatibilitas dengan layout dict lama.
+        if self.b_ is None:
+            return {}
+        return {class_label: float(self.b_[k]) for k, class_label in enumerate(self.classes_)}
+
+    def _init_weights(self, n_features, rng=np.random):
+        # Inisialisasi bobot satu kelas dengan distribusi normal (bias diinisialisasi nol).
         scale = 1 / np.sqrt(n_features)
         # Skala inisialisasi berdasarkan jumlah fitur.
-        self.w[class_label] = np.random.normal(0, scale, n_features)
-        # Inisialisasi bobot dengan distribusi normal.
-        self.b[class_label] = 0.0
-        # Inisialisasi bias dengan nol.
+        return rng.normal(0, scale, n_features)
+
+    def _class_rng(self, k):
+        # RandomState lokal per kelas (seed model + indeks kelas); tidak menyentuh RNG global NumPy.
+        return np.random.RandomState(None if self.random_state is None else self.random_state + k)
 
     def _hinge_loss(self, w, b, X, y, sample_weights):
         # Menghitung hinge loss dan gradien untuk optimasi.
@@ -159,10 +459,16 @@ class SupportVectorMachine:
         # Urutkan kelas dengan prioritas (positif, negatif, netral).
         
         print(f"[SVM] Starting training with {n_samples} samples, {n_features} features.")
-        print(f"[SVM] Params: lr={self.lr}, lambda={self.lambda_param}, iters={self.n_iters}, batch={self.batch_size}")
+        print(f"[SVM] Params: solver={self.solver}, lr={self.lr}, lambda={self.lambda_param}, iters={self.n_iters}, batch={self.batch_size}")
         print(f"[SVM] Found classes: {self.classes_}")
         # Log informasi pelatihan.
 
+        X_val = y_val = None
+        if self.solver == 'sgd' and self.early_stopping and self.validation_fraction:
+            X, y_input, X_val, y_val = self._split_validation(X, y_input)
+            n_samples = X.shape[0]
+            # Sisihkan data validasi sebelum oversampling agar tidak ada duplikat di kedua sisi.
+
         if self.use_oversampling:
             print("[SVM] Applying oversampling...")
             X, y_input = self.oversample_minority_classes(X, y_input)
@@ -184,97 +490,163 @@ class SupportVectorMachine:
             self.class_weights_ = {cls: 1.0 for cls in self.classes_}
             # Gunakan bobot seragam jika tidak 'balanced'.
 
-        for class_label in self.classes_:
-            print(f"\n[SVM] Training classifier for class: '{class_label}'")
-            # Log pelatihan untuk setiap kelas.
-            self._init_weights_bias(n_features, class_label)
-            # Inisialisasi bobot dan bias untuk kelas.
-            
+        X = sp.csr_matrix(X, dtype=np.float64)
+        # Pastikan format CSR agar baris bisa diambil lewat indptr.
+        n_classes = len(self.classes_)
+        Y = np.empty((n_classes, n_samples))
+        sample_weights = np.empty((n_classes, n_samples))
+        validation = None
+        if X_val is not None:
+            validation = (sp.csr_matrix(X_val, dtype=np.float64), np.empty((n_classes, len(y_val))), np.empty((n_classes, len(y_val))))
+            # Data validasi untuk pemantauan loss: (X, label biner, bobot sampel).
+        W = np.empty((n_classes, n_features))
+        b = np.zeros(n_classes)
+        rngs = []
+        legacy_stream = None
+        if self.solver == 'sgd' and not self.early_stopping:
+            legacy_stream = np.random.RandomState()
+            legacy_stream.set_state(np.random.get_state())
+            # Tanpa penghentian dini, setiap kelas melanjutkan aliran acak pelatihan per kelas yang lama
+            # (inisialisasi bobot lalu satu permutasi per epoch) agar model identik dengan versi sebelumnya.
+            # Aliran dimajukan pada salinan, bukan RNG global.
+        for k, class_label in enumerate(self.classes_):
             y_binary = np.where(y_input == class_label, 1, -1)
             #one versus rest
             # Ubah label menjadi biner (1 untuk kelas ini, -1 untuk lainnya).
-            
-            sample_weights = np.ones(n_samples)
-            # Inisialisasi bobot sampel.
+            Y[k] = y_binary
+
             pos_weight = self.class_weights_[class_label]
             # Bobot untuk kelas positif.
             neg_weights_sum = sum(w for c, w in self.class_weights_.items() if c != class_label)
             neg_count = len(self.classes_) - 1
             neg_weight = neg_weights_sum / max(1, neg_count)
             # Hitung bobot untuk kelas negatif.
-            
-            sample_weights[y_binary == 1] = pos_weight
-            sample_weights[y_binary == -1] = neg_weight
+            sample_weights[k] = np.where(y_binary == 1, pos_weight, neg_weight)
             # Terapkan bobot sampel.
-            print(f"[SVM] Using pos_weight={pos_weight:.2f}, neg_weight={neg_weight:.2f}")
+            if validation is not None:
+                validation[1][k] = np.where(y_val == class_label, 1, -1)
+                validation[2][k] = np.where(y_val == class_label, pos_weight, neg_weight)
+                # Label dan bobot data validasi.
+            print(f"[SVM] Class '{class_label}': pos_weight={pos_weight:.2f}, neg_weight={neg_weight:.2f}")
             # Log bobot kelas.
 
-            for epoch in range(self.n_iters):
-                # Iterasi pelatihan.
-                current_lr = self._get_learning_rate(epoch)
-                # Dapatkan laju belajar untuk epoch ini.
-                
-                if epoch == 0 or (epoch + 1) % 200 == 0 or epoch == self.n_iters - 1:
-                    total_loss, _, _ = self._hinge_loss(
-                        self.w[class_label], self.b[class_label],
-                        X, y_binary, sample_weights
-                    )
-                    print(f"[SVM][{class_label}] Epoch {epoch+1}/{self.n_iters} - Loss: {total_loss:.4f}, LR: {current_lr:.6f}")
-                    # Log loss pada epoch tertentu.
-
-                indices = np.random.permutation(n_samples)
-                # Acak indeks sampel.
-                X_shuffled = X[indices]
-                y_binary_shuffled = y_binary[indices]
-                weights_shuffled = sample_weights[indices]
-                # Acak data untuk pelatihan.
-                
-                for i in range(0, n_samples, self.batch_size):
-                    # Iterasi per batch.
-                    batch_end = i + self.batch_size
-                    X_batch = X_shuffled[i:batch_end]
-                    y_batch = y_binary_shuffled[i:batch_end]
-                    weights_batch = weights_shuffled[i:batch_end]
-                    # Ambil batch data.
-
-                    _, grad_w, grad_b = self._hinge_loss(
-                        self.w[class_label], self.b[class_label],
-                        X_batch, y_batch, weights_batch
-                    )
-                    # Hitung gradien untuk batch.
-                    
-                    self.w[class_label] -= current_lr * grad_w
-                    self.b[class_label] -= current_lr * grad_b
-                    # Perbarui bobot dan bias.
+            if self.solver == 'dual_cd':
+                continue
+                # Dual coordinate descent mulai dari nol dan memakai RandomState sendiri per kelas.
+            if legacy_stream is None:
+                rng = self._class_rng(k)
+                # Dengan penghentian dini jumlah epoch tidak tetap, jadi setiap kelas memakai seed sendiri.
+            else:
+                rng = np.random.RandomState()
+                rng.set_state(legacy_stream.get_state())
+                self._init_weights(n_features, legacy_stream)
+                for _ in range(self.n_iters):
+                    legacy_stream.permutation(n_samples)
+                # Lewati aliran yang dipakai kelas ini (n_iters epoch penuh) untuk kelas berikutnya.
+            W[k] = self._init_weights(n_features, rng)
+            rngs.append(rng)
+
+        results = None
+        if self.solver == 'dual_cd':
+            results = self._fit_dual_cd(X, Y, sample_weights)
+        else:
+            print(f"\n[SVM] Training {n_classes} one-vs-rest classifiers together.")
+            n_jobs = min(self.n_jobs or os.cpu_count() or 1, n_classes)
+            # Jumlah proses, paling banyak satu per kelas.
+            if n_jobs > 1:
+                results = self._fit_parallel(X, Y, sample_weights, W, b, rngs, validation, n_jobs)
+        if results is None:
+            monitor = ConvergenceMonitor(n_classes, self.tol, self.n_iter_no_change, enabled=self.early_stopping)
+            # Pemantau konvergensi (loss dicatat walau penghentian dini dinonaktifkan).
+            epochs_run = train_ovr_sgd(X, Y, sample_weights, W, b, rngs, self.lr, self.lr_decay, self.lambda_param,
+                                       self.n_iters, self.batch_size, class_labels=self.classes_,
+                                       monitor=monitor, validation=validation)
+            # Latih semua kelas sekaligus dengan matriks bobot (kelas x fitur).
+            results = [(W[k], float(b[k]), int(epochs_run[k]), monitor.loss_curve[k]) for k in range(n_classes)]
+        self.W_ = np.ascontiguousarray(np.column_stack([w_class for w_class, _, _, _ in results]))
+        self.b_ = np.array([b_class for _, b_class, _, _ in results])
+        # Susun bobot menjadi satu matriks (fitur x kelas) dan vektor bias untuk inferensi X @ W + b.
+        for class_label, (_, _, epochs, loss_curve) in zip(self.classes_, results):
+            self.n_iter_[class_label] = epochs
+            self.loss_curve_[class_label] = loss_curve
+        # Simpan bobot, bias, jumlah epoch, dan riwayat loss per kelas.
+        print(f"[SVM] Epochs run per class: {self.n_iter_}")
 
         print("\n[SVM] Training complete.")
         # Log selesai pelatihan.
         return self
         # Kembalikan model yang sudah dilatih.
 
-    def _predict_class(self, X, class_label):
-        # Prediksi skor untuk kelas tertentu.
-        if class_label not in self.w:
-            raise ValueError(f"Model not trained for class '{class_label}'.")
-            # Pastikan model dilatih untuk kelas ini.
-        
-        return X.dot(self.w[class_label]) + self.b[class_label]
-        # Hitung skor (w*X + b).
+    def _fit_dual_cd(self, X, Y, sample_weights):
+        # Melatih setiap kelas dengan dual coordinate descent (maksimal n_iters lintasan data).
+        results = []
+        for k, class_label in enumerate(self.classes_):
+            rng = self._class_rng(k)
+            # Seed per kelas agar urutan koordinat deterministik.
+            w, b, _, losses = train_binary_dual_cd(X, Y[k], sample_weights[k], self.lambda_param, rng, self.n_iters)
+            print(f"[SVM][{class_label}] dual_cd converged after {len(losses)} passes - Loss: {losses[-1]:.4f}")
+            results.append((w, float(b), len(losses), losses))
+        return results
 
-    def predict(self, X):
-        # Prediksi kelas untuk data input.
-        if not self.w or not self.classes_.size:
-            raise RuntimeError("Model has not been trained yet. Call fit() first.")
-            # Pastikan model sudah dilatih.
+    def _fit_parallel(self, X, Y, sample_weights, W, b, rngs, validation, n_jobs):
+        # Melatih setiap kelas di proses terpisah; X dibagikan lewat memory map dan setiap kelas membawa
+        # RandomState-nya sendiri sehingga hasilnya sama persis dengan pelatihan serial.
+        params = {
+            'learning_rate': self.lr, 'lambda_param': self.lambda_param, 'lr_decay': self.lr_decay,
+            'n_iters': self.n_iters, 'batch_size': self.batch_size, 'early_stopping': self.early_stopping,
+            'tol': self.tol, 'n_iter_no_change': self.n_iter_no_change
+        }
+        print(f"[SVM] Training {len(self.classes_)} classes in {n_jobs} processes.")
+        try:
+            with tempfile.TemporaryDirectory(prefix='svm_shared_') as folder:
+                shared_X = share_csr(X, folder)
+                # Simpan X sekali untuk semua worker.
+                with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+                    futures = [
+                        executor.submit(
+                            train_class_worker, shared_X, Y[k], sample_weights[k], W[k], b[k], rngs[k], params,
+                            str(class_label),
+                            None if validation is None else (validation[0], validation[1][k], validation[2][k])
+                        )
+                        for k, class_label in enumerate(self.classes_)
+                    ]
+                    return [future.result() for future in futures]
+                    # Gabungkan hasil sesuai urutan kelas.
+        except Exception as e:
+            print(f"[SVM] Error in parallel training: {e}. Falling back to serial.")
+            return None
+            # Kembali ke pelatihan serial jika pemrosesan paralel gagal.
 
+    def _split_validation(self, X, y):
+        # Memisahkan sebagian data latih (acak, dengan seed model) untuk memantau loss validasi.
         n_samples = X.shape[0]
-        scores = np.zeros((n_samples, len(self.classes_)))
-        # Inisialisasi matriks skor untuk semua kelas.
+        n_val = int(round(n_samples * self.validation_fraction))
+        order = np.random.RandomState(self.random_state).permutation(n_samples)
+        val_idx, train_idx = np.sort(order[:n_val]), np.sort(order[n_val:])
+        if n_val == 0 or len(np.unique(y[train_idx])) < len(self.classes_):
+            print("[SVM] Validation split skipped: not enough samples per class.")
+            return X, y, None, None
+            # Lewati validasi jika data latih kehilangan kelas.
+        return X[train_idx], y[train_idx], X[val_idx], y[val_idx]
 
-        for i, class_label in enumerate(self.classes_):
-            scores[:, i] = self._predict_class(X, class_label)
-            # Hitung skor untuk setiap kelas.
-        
+    def training_summary(self):
+        # Ringkasan konvergensi untuk laporan (epoch yang dicapai dan kurva loss per kelas).
+        return {
+            'epochs_run': {str(c): n for c, n in self.n_iter_.items()},
+            'loss_curve': {str(c): curve for c, curve in self.loss_curve_.items()}
+        }
+
+    def decision_function(self, X):
+        # Skor semua kelas sekaligus: satu perkalian X @ W + b (sampel x kelas).
+        if self.W_ is None or not self.classes_.size:
+            raise RuntimeError("Model has not been trained yet. Call fit() first.")
+            # Pastikan model sudah dilatih.
+        return np.asarray(X @ self.W_) + self.b_
+
+    def predict(self, X):
+        # Prediksi kelas untuk data input.
+        scores = self.decision_function(X)
+        # Hitung skor untuk semua kelas.
         highest_score_indices = np.argmax(scores, axis=1)
         # Pilih kelas dengan skor tertinggi.
         return self.classes_[highest_score_indices]
@@ -282,22 +654,12 @@ class SupportVectorMachine:
 
     def predict_proba(self, X):
         # Prediksi probabilitas kelas.
-        if not self.w or not self.classes_.size:
-            raise RuntimeError("Model has not been trained yet. Call fit() first.")
-            # Pastikan model sudah dilatih.
-        
-        n_samples = X.shape[0]
-        scores = np.zeros((n_samples, len(self.classes_)))
-        # Inisialisasi matriks skor.
-
-        for i, class_label in enumerate(self.classes_):
-            scores[:, i] = self._predict_class(X, class_label)
-            # Hitung skor untuk setiap kelas.
-        
+        scores = self.decision_function(X)
+        # Hitung skor untuk semua kelas.
         exp_scores = np.exp(scores - np.max(scores, axis=1, keepdims=True))
         # Ubah skor ke probabilitas dengan softmax.
         return exp_scores / np.sum(exp_scores, axis=1, keepdims=True)
-        # Kembalikanそうな。ikan probabilitas.
+        # Kembalikan probabilitas.
 
     def get_params(self, deep=True):
         # Mengembalikan parameter model.
@@ -310,7 +672,13 @@ class SupportVectorMachine:
             'lr_decay': self.lr_decay,
             'random_state': self.random_state,
             'class_weight': self.class_weight,
-            'use_oversampling': self.use_oversampling
+            'use_oversampling': self.use_oversampling,
+            'early_stopping': self.early_stopping,
+            'tol': self.tol,
+            'n_iter_no_change': self.n_iter_no_change,
+            'validation_fraction': self.validation_fraction,
+            'n_jobs': self.n_jobs,
+            'solver': self.solver
         }
     
     def oversample_minority_classes(self, X, y):
@@ -1,89 +1,283 @@
 import numpy as np  # Modul untuk operasi numerik
 import scipy.sparse as sp  # Modul untuk matriks sparse
-from collections import Counter  # Modul untuk menghitung frekuensi
+from array import array  # Modul untuk buffer integer ringkas
 import re  # Modul untuk regex
+import zlib  # Modul untuk hash stabil (crc32) pada mode hashing
+import os  # Modul untuk jumlah CPU
+from concurrent.futures import ProcessPoolExecutor  # Modul untuk fit paralel
+from collections import OrderedDict  # Modul untuk cache LRU korpus
+import hashlib  # Modul untuk sidik jari korpus
+
+HASH_FIT_CHUNK_DOCS = 10000  # Jumlah dokumen per akumulasi DF pada mode hashing (membatasi memori)
+PARALLEL_FIT_MIN_DOCS = 20000  # Di bawah jumlah ini tokenisasi paralel kalah oleh biaya membuat proses
+CORPUS_CACHE_SIZE = 4  # Jumlah korpus tertokenisasi yang disimpan di cache proses
+CORPUS_CACHE_MIN_DOCS = 1000  # Korpus kecil (mis. prediksi satu teks) tidak disimpan di cache
+
+_corpus_cache = OrderedDict()  # (ngram_range, sidik jari dokumen) -> TokenizedCorpus, urutan LRU
+
+class TokenizedCorpus:
+    # Representasi n-gram korpus sebagai id integer: setiap n-gram unik disimpan sekali di term_ids,
+    # setiap dokumen menjadi potongan array int32 di ids (panjangnya di doc_lengths).
+    # Dipakai bersama oleh fit, transform, dan transform ulang dengan normalisasi berbeda.
+
+    def __init__(self, term_ids, ids, doc_lengths):
+        self.term_ids = term_ids  # Kamus n-gram -> id (urutan sisip = urutan id)
+        self.terms = list(term_ids)  # Id -> n-gram
+        self.ids = ids  # Id n-gram semua dokumen, berurutan (int32)
+        self.doc_lengths = doc_lengths  # Jumlah n-gram per dokumen (int64)
+
+    def __len__(self):
+        # Jumlah dokumen
+        return len(self.doc_lengths)
+
+    @property
+    def rows(self):
+        # Indeks dokumen untuk setiap elemen ids
+        return np.repeat(np.arange(len(self.doc_lengths), dtype=np.int64), self.doc_lengths)
+
+    @classmethod
+    def from_documents(cls, raw_documents, ngram_range):
+        # Tokenisasi serial: satu kali split dan pembuatan n-gram per dokumen
+        generator = CustomTfidf(ngram_range=ngram_range)  # Hanya untuk _generate_ngrams
+        term_ids = {}  # n-gram -> id
+        intern = term_ids.setdefault  # Id baru = jumlah term saat ini
+        ids = array('i')  # Id n-gram berurutan
+        doc_lengths = np.zeros(len(raw_documents), dtype=np.int64)  # Jumlah n-gram per dokumen
+        for doc_idx, doc in enumerate(raw_documents):  # Iterasi dokumen
+            tokens = doc.split() if isinstance(doc, str) else doc  # Tokenisasi dokumen
+            ngrams = generator._generate_ngrams(tokens)  # Buat n-gram
+            ids.extend([intern(term, len(term_ids)) for term in ngrams])  # Intern n-gram ke id
+            doc_lengths[doc_idx] = len(ngrams)
+        return cls(term_ids, np.frombuffer(ids, dtype=np.int32), doc_lengths)
+
+    @classmethod
+    def merge(cls, shards):
+        # Menggabungkan korpus shard: id lokal dipetakan ke id global per term unik, bukan per n-gram
+        term_ids = {}  # n-gram -> id global
+        intern = term_ids.setdefault
+        ids, doc_lengths = [], []  # Potongan hasil per shard
+        for shard in shards:  # Urutan shard = urutan dokumen
+            remap = np.array([intern(term, len(term_ids)) for term in shard.terms], dtype=np.int32)  # Id lokal -> global
+            ids.append(remap[shard.ids] if len(shard.ids) else shard.ids)
+            doc_lengths.append(shard.doc_lengths)
+        return cls(term_ids, np.concatenate(ids), np.concatenate(doc_lengths))
+
+def tokenize_shard(documents, ngram_range):
+    # Tokenisasi satu shard dokumen (dijalankan di proses worker)
+    return TokenizedCorpus.from_documents(documents, ngram_range)
+
+def corpus_fingerprint(raw_documents, ngram_range):
+    # Sidik jari isi korpus untuk kunci cache (jauh lebih murah daripada membuat ulang n-gram)
+    digest = hashlib.sha1(repr(tuple(ngram_range)).encode('utf-8'))
+    for doc in raw_documents:  # Teks dan list token dibedakan agar tokenisasinya tidak tertukar
+        digest.update(doc.encode('utf-8') + b'\x00' if isinstance(doc, str) else '\x01'.join(doc).encode('utf-8') + b'\x02')
+    return digest.hexdigest()
+
+def tokenize_corpus(raw_documents, ngram_range, n_jobs=1, use_cache=True):
+    # Tokenisasi korpus dengan cache LRU per proses; korpus besar dibagi ke beberapa proses
+    use_cache = use_cache and len(raw_documents) >= CORPUS_CACHE_MIN_DOCS  # Hanya korpus besar yang layak di-cache
+    if use_cache:
+        key = corpus_fingerprint(raw_documents, ngram_range)
+        if key in _corpus_cache:  # Cache hit: pakai ulang hasil tokenisasi
+            _corpus_cache.move_to_end(key)
+            return _corpus_cache[key]
+    n_jobs = n_jobs or os.cpu_count() or 1  # None = semua CPU
+    corpus = None
+    if n_jobs > 1 and len(raw_documents) >= PARALLEL_FIT_MIN_DOCS:  # Tokenisasi paralel per shard
+        shard_size = -(-len(raw_documents) // n_jobs)  # Ukuran shard (pembulatan ke atas)
+        shards = [raw_documents[i:i + shard_size] for i in range(0, len(raw_documents), shard_size)]  # Bagi dokumen
+        try:
+            with ProcessPoolExecutor(max_workers=n_jobs) as executor:  # Tokenisasi tiap shard paralel
+                corpus = TokenizedCorpus.merge(list(executor.map(tokenize_shard, shards, [ngram_range] * len(shards))))
+        except Exception as e:  # Tangani error pemrosesan paralel
+            print(f"Error in parallel TF-IDF tokenization: {e}. Falling back to serial.")  # Tampilkan peringatan
+    if corpus is None:  # Serial
+        corpus = TokenizedCorpus.from_documents(raw_documents, ngram_range)
+    if use_cache:  # Simpan ke cache, buang entri terlama
+        _corpus_cache[key] = corpus
+        while len(_corpus_cache) > CORPUS_CACHE_SIZE:
+            _corpus_cache.popitem(last=False)
+    return corpus
+
+def clear_corpus_cache():
+    # Mengosongkan cache korpus tertokenisasi
+    _corpus_cache.clear()
 
 class CustomTfidf:
-    def __init__(self, max_features=1000, ngram_range=(1, 2), min_df=3, max_df_ratio=0.9):
+    def __init__(self, max_features=1000, ngram_range=(1, 2), min_df=3, max_df_ratio=0.9,
+                 n_buckets=None, alternate_sign=True, max_reverse_lookup=10000, n_jobs=1):
         # Inisialisasi parameter TF-IDF
         self.max_features = max_features  # Batas maksimum fitur
         self.ngram_range = ngram_range  # Rentang n-gram (uni-gram dan bi-gram)
         self.min_df = min_df  # Minimum frekuensi dokumen
         self.max_df_ratio = max_df_ratio  # Rasio maksimum frekuensi dokumen
+        self.n_buckets = n_buckets  # Jumlah bucket mode hashing (None = mode kamus biasa)
+        self.alternate_sign = alternate_sign  # Tanda +/- dari hash agar tabrakan saling meniadakan (mode hashing)
+        self.max_reverse_lookup = max_reverse_lookup  # Maksimum contoh term per bucket untuk tampilan (mode hashing)
+        self.n_jobs = n_jobs  # Jumlah proses untuk fit (None = semua CPU)
         self.vocabulary_ = {}  # Kamus untuk menyimpan term dan indeks
+        self.reverse_lookup_ = {}  # Bucket -> contoh term (mode hashing)
         self.idf_ = None  # Array IDF
         self.document_count_ = 0  # Jumlah dokumen
-        
+
+    @property
+    def hashing(self):
+        # True jika vectorizer memakai mode hashing (getattr untuk pickle lama tanpa atribut ini)
+        return bool(getattr(self, 'n_buckets', None))
+
+    @property
+    def n_features_(self):
+        # Jumlah kolom matriks hasil transform
+        if self.idf_ is None:
+            return len(self.vocabulary_)
+        return len(self.idf_)
+
+    def _hash_ngrams(self, ngrams):
+        # Memetakan n-gram ke bucket (crc32 stabil antar proses) dan tandanya
+        hashes = [zlib.crc32(term.encode('utf-8')) for term in ngrams]  # Hash 32-bit
+        buckets = [h % self.n_buckets for h in hashes]  # Bucket dari sisa bagi
+        if not self.alternate_sign:  # Tanpa tanda: semua positif
+            return buckets, None
+        return buckets, [-1.0 if h >> 31 else 1.0 for h in hashes]  # Tanda dari bit teratas
+
+    def _hash_corpus_terms(self, corpus):
+        # Bucket dan tanda untuk setiap term unik korpus (sekali per term, bukan per kemunculan)
+        buckets, signs = self._hash_ngrams(corpus.terms)
+        return np.array(buckets, dtype=np.int32), (np.array(signs) if signs is not None else None)
+
     def _generate_ngrams(self, tokens):
         # Menghasilkan n-gram dari token
         ngrams = []  # List untuk menyimpan n-gram
         min_n, max_n = self.ngram_range  # Ambil rentang n-gram
         for n in range(min_n, max_n + 1):  # Iterasi untuk setiap n
-            for i in range(len(tokens) - n + 1):  # Iterasi posisi token
-                ngrams.append(' '.join(tokens[i:i+n]))  # Tambah n-gram ke list
+            if n == 1:  # Uni-gram adalah token itu sendiri
+                ngrams.extend(tokens)
+            else:  # Gabungkan n token berurutan
+                ngrams.extend(map(' '.join, zip(*(tokens[i:] for i in range(n)))))
         return ngrams  # Kembalikan list n-gram
 
+    def tokenize(self, raw_documents, use_cache=True):
+        # Mengubah dokumen menjadi TokenizedCorpus (dengan cache) agar bisa dipakai ulang oleh fit/transform
+        if isinstance(raw_documents, TokenizedCorpus):  # Sudah tertokenisasi
+            return raw_documents
+        return tokenize_corpus(raw_documents, self.ngram_range, getattr(self, 'n_jobs', 1), use_cache)
+
     def fit(self, raw_documents):
         # Melatih vectorizer untuk membangun kamus dan IDF
+        if self.hashing:  # Mode hashing tidak membutuhkan kamus
+            return self._fit_hashing(raw_documents)
+        corpus = self.tokenize(raw_documents)  # n-gram sebagai id integer
         self.vocabulary_ = {}  # Reset kamus
-        document_frequency = Counter()  # Hitung frekuensi dokumen
-        term_frequency = Counter()  # Hitung frekuensi term
-        self.document_count_ = len(raw_documents)  # Simpan jumlah dokumen
-        for doc in raw_documents:  # Iterasi setiap dokumen
-            tokens = doc.split() if isinstance(doc, str) else doc  # Tokenisasi dokumen
-            ngrams = self._generate_ngrams(tokens)  # Buat n-gram
-            term_frequency.update(ngrams)  # Tambah frekuensi term
-            document_frequency.update(set(ngrams))  # Tambah frekuensi dokumen
+        self.document_count_ = len(corpus)  # Simpan jumlah dokumen
+        n_terms = len(corpus.terms)  # Jumlah n-gram unik
+        term_frequency = np.bincount(corpus.ids, minlength=n_terms).tolist()  # Frekuensi term
+        doc_term_pairs = np.unique(corpus.rows * n_terms + corpus.ids)  # Pasangan (dokumen, term) unik
+        document_frequency = np.bincount(doc_term_pairs % n_terms, minlength=n_terms).tolist() if n_terms else []  # Frekuensi dokumen
         max_df = self.document_count_ * self.max_df_ratio  # Hitung batas maksimum DF
-        valid_terms = {
-            term: freq for term, freq in document_frequency.items()
+        valid_terms = [
+            term_id for term_id, freq in enumerate(document_frequency)
             if self.min_df <= freq <= max_df  # Filter term berdasarkan min_df dan max_df
-        }
+        ]
         top_terms = sorted(
-            valid_terms.keys(),
-            key=lambda term: (-term_frequency[term], term)  # Urutkan berdasarkan frekuensi
+            valid_terms,
+            key=lambda term_id: (-term_frequency[term_id], corpus.terms[term_id])  # Urutkan berdasarkan frekuensi
         )[:self.max_features]  # Ambil hingga max_features
-        self.vocabulary_ = {term: idx for idx, term in enumerate(top_terms)}  # Buat kamus term-indeks
+        self.vocabulary_ = {corpus.terms[term_id]: idx for idx, term_id in enumerate(top_terms)}  # Buat kamus term-indeks
         self.idf_ = np.zeros(len(self.vocabulary_))  # Inisialisasi array IDF
-        for term, idx in self.vocabulary_.items():  # Iterasi term dalam kamus
-            df = document_frequency[term]  # Ambil frekuensi dokumen
+        for idx, term_id in enumerate(top_terms):  # Iterasi term dalam kamus
+            df = document_frequency[term_id]  # Ambil frekuensi dokumen
             self.idf_[idx] = np.log((1 + self.document_count_) / (1 + df)) + 1  # Hitung IDF
         return self  # Kembalikan instance
 
-    def transform(self, raw_documents, normalize=True):
-        # Mengubah dokumen menjadi matriks TF-IDF
-        if not self.vocabulary_:  # Periksa apakah kamus sudah ada
-            raise ValueError("Vocabulary not learned. Call fit() first.")  # Lempar error jika belum fit
-        n_samples = len(raw_documents)  # Jumlah dokumen
-        n_features = len(self.vocabulary_)  # Jumlah fitur
-        rows, cols, data = [], [], []  # List untuk matriks sparse
-        for doc_idx, doc in enumerate(raw_documents):  # Iterasi dokumen
+    def _fit_hashing(self, raw_documents):
+        # Menghitung IDF per bucket dalam satu lintasan; memori hanya sebesar jumlah bucket
+        self.vocabulary_ = {}  # Mode hashing tidak menyimpan kamus
+        self.reverse_lookup_ = {}  # Contoh term per bucket untuk tampilan
+        self.document_count_ = 0  # Jumlah dokumen
+        document_frequency = np.zeros(self.n_buckets, dtype=np.int64)  # Frekuensi dokumen per bucket
+        if isinstance(raw_documents, TokenizedCorpus):  # Korpus tertokenisasi: hash hanya term unik
+            term_buckets, _ = self._hash_corpus_terms(raw_documents)
+            pairs = np.unique(raw_documents.rows * self.n_buckets + term_buckets[raw_documents.ids])  # Pasangan (dokumen, bucket) unik
+            document_frequency += np.bincount(pairs % self.n_buckets, minlength=self.n_buckets)
+            for term, bucket in zip(raw_documents.terms[:self.max_reverse_lookup], term_buckets.tolist()):  # Contoh term untuk tampilan
+                self.reverse_lookup_.setdefault(bucket, term)
+            self.document_count_ = len(raw_documents)
+            raw_documents = ()  # Tidak ada dokumen mentah untuk lintasan streaming
+        pending = array('i')  # Bucket unik per dokumen yang belum diakumulasi
+        for doc in raw_documents:  # Iterasi setiap dokumen (boleh generator)
             tokens = doc.split() if isinstance(doc, str) else doc  # Tokenisasi dokumen
-            term_counts = Counter(self._generate_ngrams(tokens))  # Hitung frekuensi n-gram
-            for term, count in term_counts.items():  # Iterasi term dan frekuensi
-                if term in self.vocabulary_:  # Periksa apakah term ada di kamus
-                    term_idx = self.vocabulary_[term]  # Ambil indeks term
-                    tf = 1 + np.log(count)  # Hitung TF
-                    tfidf_score = tf * self.idf_[term_idx]  # Hitung skor TF-IDF
-                    rows.append(doc_idx)  # Tambah indeks baris
-                    cols.append(term_idx)  # Tambah indeks kolom
-                    data.append(tfidf_score)  # Tambah skor TF-IDF
-        X = sp.csr_matrix((data, (rows, cols)), shape=(n_samples, n_features))  # Buat matriks sparse
-        if not normalize:  # Periksa apakah normalisasi diperlukan
-            return X  # Kembalikan matriks tanpa normalisasi
-        norms = np.sqrt(X.power(2).sum(axis=1))  # Hitung norma L2
-        norms[norms == 0] = 1.0  # Hindari pembagian nol
-        inv_norms_diag = sp.diags(1.0 / np.array(norms).ravel())  # Buat matriks diagonal invers norma
-        X_normalized = inv_norms_diag @ X  # Normalisasi matriks
-        return X_normalized  # Kembalikan matriks ternormalisasi
+            ngrams = self._generate_ngrams(tokens)  # Buat n-gram
+            buckets, _ = self._hash_ngrams(ngrams)  # Petakan ke bucket
+            pending.extend(set(buckets))  # Satu hitungan per bucket per dokumen
+            if len(self.reverse_lookup_) < self.max_reverse_lookup:  # Simpan contoh term untuk tampilan
+                for term, bucket in zip(ngrams, buckets):
+                    self.reverse_lookup_.setdefault(bucket, term)
+            self.document_count_ += 1
+            if self.document_count_ % HASH_FIT_CHUNK_DOCS == 0:  # Akumulasi berkala agar buffer tetap kecil
+                document_frequency += np.bincount(np.frombuffer(pending, dtype=np.int32), minlength=self.n_buckets)
+                pending = array('i')
+        document_frequency += np.bincount(np.frombuffer(pending, dtype=np.int32), minlength=self.n_buckets)  # Sisa akumulasi
+        max_df = self.document_count_ * self.max_df_ratio  # Hitung batas maksimum DF
+        valid = (document_frequency >= self.min_df) & (document_frequency <= max_df)  # Bucket yang lolos min_df/max_df
+        self.idf_ = np.where(valid, np.log((1 + self.document_count_) / (1 + document_frequency)) + 1, 0.0)  # IDF (0 = bucket dibuang)
+        return self  # Kembalikan instance
+
+    def transform(self, raw_documents, normalize=True, use_cache=True):
+        # Mengubah dokumen menjadi matriks TF-IDF (use_cache=False untuk teks sekali pakai, misal penilaian/prediksi)
+        if not self.vocabulary_ and not (self.hashing and self.idf_ is not None):  # Periksa apakah kamus sudah ada
+            raise ValueError("Vocabulary not learned. Call fit() first.")  # Lempar error jika belum fit
+        corpus = self.tokenize(raw_documents, use_cache)  # n-gram sebagai id integer (dipakai ulang dari cache jika ada)
+        signs = None  # Tanda hash (mode hashing bertanda)
+        if self.hashing:  # Mode hashing: hash setiap term unik sekali
+            term_columns, term_signs = self._hash_corpus_terms(corpus)
+            if self.alternate_sign:
+                signs = term_signs[corpus.ids]
+        else:  # Mode kamus: peta id term korpus -> kolom (-1 jika tidak ada di kamus)
+            term_columns = np.full(len(corpus.terms), -1, dtype=np.int32)
+            for term, col in self.vocabulary_.items():  # Iterasi kamus (paling banyak max_features)
+                term_id = corpus.term_ids.get(term)
+                if term_id is not None:
+                    term_columns[term_id] = col
+        col_ids = term_columns[corpus.ids]  # Kolom untuk setiap n-gram
+        keep = col_ids >= 0  # Buang n-gram di luar kamus
+        doc_lengths = np.bincount(corpus.rows[keep], minlength=len(corpus))  # Jumlah n-gram dikenal per dokumen
+        return self._build_matrix(col_ids[keep], doc_lengths, normalize, signs[keep] if signs is not None else None)  # Bangun CSR secara vektor
+
+    def _build_matrix(self, col_ids, doc_lengths, normalize=True, signs=None):
+        # Membangun matriks CSR TF-IDF dari id kolom per dokumen (indptr/indices/data langsung, tanpa COO)
+        n_samples, n_features = len(doc_lengths), len(self.idf_)  # Ukuran matriks
+        rows = np.repeat(np.arange(n_samples, dtype=np.int64), doc_lengths)  # Indeks baris tiap n-gram
+        if signs is None:  # Frekuensi biasa
+            keys, counts = np.unique(rows * n_features + col_ids, return_counts=True)  # Hitung frekuensi (baris, kolom) sekaligus
+            tf = 1 + np.log(counts)  # TF (1 + log tf)
+        else:  # Mode hashing bertanda: jumlahkan tanda, lalu TF sublinear pada nilai absolut
+            keys, inverse = np.unique(rows * n_features + col_ids, return_inverse=True)
+            counts = np.bincount(inverse, weights=signs)  # Jumlah bertanda per (baris, bucket)
+            tf = np.sign(counts) * (1 + np.log(np.maximum(np.abs(counts), 1)))  # Tanda dipertahankan, 0 tetap 0
+        rows, cols = np.divmod(keys, n_features)  # Pisahkan kembali baris dan kolom (terurut)
+        data = tf * self.idf_[cols]  # TF dikali IDF
+        if self.hashing:  # Buang bucket yang saling meniadakan atau tidak lolos min_df/max_df
+            keep = data != 0
+            rows, cols, data = rows[keep], cols[keep], data[keep]
+        indptr = np.zeros(n_samples + 1, dtype=np.int64)  # Penunjuk awal baris
+        np.cumsum(np.bincount(rows, minlength=n_samples), out=indptr[1:])
+        if normalize:  # Normalisasi L2 per baris
+            norms = np.sqrt(np.bincount(rows, weights=data * data, minlength=n_samples))  # Norma L2 tiap baris
+            norms[norms == 0] = 1.0  # Hindari pembagian nol
+            data = data * (1.0 / norms)[rows]  # Skala setiap nilai dengan invers norma barisnya
+        return sp.csr_matrix((data, cols, indptr), shape=(n_samples, n_features))  # Kembalikan matriks sparse
 
     def fit_transform(self, raw_documents, normalize=True):
-        # Melatih dan mengubah dokumen menjadi matriks TF-IDF
-        self.fit(raw_documents)  # Panggil fit untuk membangun kamus dan IDF
-        return self.transform(raw_documents, normalize=normalize)  # Kembalikan matriks TF-IDF
+        # Melatih dan mengubah dokumen menjadi matriks TF-IDF (tokenisasi hanya sekali)
+        corpus = self.tokenize(raw_documents)  # n-gram sebagai id integer
+        self.fit(corpus)  # Panggil fit untuk membangun kamus dan IDF
+        return self.transform(corpus, normalize=normalize)  # Kembalikan matriks TF-IDF
 
     def get_feature_names_out(self):
         # Mengembalikan nama fitur dari kamus
+        if self.hashing:  # Mode hashing: contoh term per bucket, sisanya nama bucket
+            reverse_lookup = getattr(self, 'reverse_lookup_', {})
+            return np.array([reverse_lookup.get(idx, f'hash_{idx}') for idx in range(self.n_features_)], dtype=object)
         feature_names = np.empty(len(self.vocabulary_), dtype=object)  # Buat array untuk nama fitur
         for term, idx in self.vocabulary_.items():  # Iterasi kamus
             feature_names[idx] = term  # Isi array dengan term
@@ -103,7 +297,7 @@ def preprocess_text_for_vectorizers(text):
 
 def format_tfidf_for_display(texts, vectorizer):
     # Memformat hasil TF-IDF untuk tampilan
-    if not hasattr(vectorizer, 'vocabulary_') or not vectorizer.vocabulary_:  # Periksa apakah vectorizer sudah di-fit
+    if getattr(vectorizer, 'idf_', None) is None or not vectorizer.n_features_:  # Periksa apakah vectorizer sudah di-fit
         return [{"info": "Vectorizer belum di-fit."}] * len(texts)  # Kembalikan pesan error
     processed_texts = [preprocess_text_for_vectorizers(text) for text in texts]  # Pra-proses teks
     tfidf_matrix = vectorizer.transform(processed_texts)  # Transformasi ke matriks TF-IDF
@@ -0,0 +1,52 @@
+from flask import Blueprint, request, jsonify, current_app  # Impor modul Flask
+
+from app.module.preprocessing import preprocess_single_text  # Pipeline preprocessing satu teks
+from app.module.model_registry import MODEL_FILES, LABEL_SOURCES  # Daftar model dan sumber label tersimpan
+
+api_bp = Blueprint('api', __name__)  # Blueprint JSON untuk layanan lain
+
+def get_micro_batcher():
+    # Micro-batcher bersama milik aplikasi aktif (dibuat di create_app)
+    return current_app.extensions['micro_batcher']
+
+@api_bp.route('/predict', methods=['POST'])  # Rute prediksi massal dalam format JSON
+def predict():
+    # Body: {"texts": [...], "models": ["Naive Bayes", "SVM"], "label_source": "otomatis"}
+    payload = request.get_json(silent=True) or {}  # Ambil body JSON
+    texts = payload.get('texts')
+    model_names = payload.get('models') or sorted(MODEL_FILES)  # Default: semua model
+    source = payload.get('label_source', 'otomatis')
+    max_texts = current_app.config.get('API_PREDICT_MAX_TEXTS', 1000)
+    if not isinstance(texts, list) or not texts or not all(isinstance(text, str) for text in texts):
+        return jsonify({'error': "Field 'texts' harus berupa list teks yang tidak kosong."}), 400
+    if len(texts) > max_texts:
+        return jsonify({'error': f'Maksimal {max_texts} teks per permintaan.'}), 400
+    if isinstance(model_names, str):
+        model_names = [model_names]
+    if not all(name in MODEL_FILES for name in model_names) or source not in LABEL_SOURCES:
+        return jsonify({'error': f"Model harus salah satu dari {sorted(MODEL_FILES)} dan label_source salah satu dari {list(LABEL_SOURCES)}."}), 400
+
+    slang_path = current_app.config.get('SLANGWORDS_JSON_PATH')
+    stems = [preprocess_single_text(text, slang_path) for text in texts]  # Clean, slang, stopwords, stem
+    scored = [i for i, stem in enumerate(stems) if stem]  # Teks yang kosong setelah preprocessing tidak dinilai
+    results = [{'text': text, 'text_stem': stem, 'predictions': {}} for text, stem in zip(texts, stems)]
+    if scored:
+        batcher = get_micro_batcher()
+        futures = {name: batcher.submit(name, source, [stems[i] for i in scored]) for name in model_names}  # Antrekan semua model dulu
+        timeout = current_app.config.get('API_PREDICT_TIMEOUT', 30)
+        for name, future in futures.items():
+            try:
+                classes, proba = future.result(timeout=timeout)
+            except FileNotFoundError as fe:  # Model belum dilatih
+                return jsonify({'error': str(fe)}), 404
+            except Exception as e:
+                current_app.logger.error(f"API prediction error: {e}", exc_info=True)
+                return jsonify({'error': f'Terjadi kesalahan saat prediksi: {e}'}), 500
+            labels = [str(label) for label in classes]
+            for row, i in zip(proba, scored):
+                best = int(row.argmax())
+                results[i]['predictions'][name] = {
+                    'label': labels[best],
+                    'probabilities': {label: float(p) for label, p in zip(labels, row)},
+                }
+    return jsonify({'label_source': source, 'models': model_names, 'results': results})
@@ -1,5 +1,4 @@
 import csv  # Modul untuk membaca file CSV
-import os  # Modul untuk operasi sistem file
 import pandas as pd  # Modul untuk memproses data tabular
 from urllib.parse import urlparse, parse_qs, urlencode  # Modul untuk manipulasi URL
 from flask import Blueprint, render_template, request, redirect, url_for, flash, current_app, session  # Impor modul Flask
@@ -7,25 +6,13 @@ from sqlalchemy import or_, text  # Impor fungsi SQLAlchemy
 from werkzeug.utils import secure_filename  # Modul untuk keamanan nama file
 from .. import db  # Impor objek database
 from ..models import Preprocessing, DataPakar  # Impor model database
-from ..module.labelling import load_weighted_lexicon, sentiment_analysis_lexicon, count_labels, reset_labels  # Impor fungsi pelabelan
+from ..module.labelling import get_lexicon_service, auto_label_preprocessing, decode_lexicon_terms, reset_labels  # Impor fungsi pelabelan
+from ..module.label_stats import get_label_stats  # Statistik label tersimpan
 
 labeling_bp = Blueprint('labeling', __name__)  # Buat blueprint Flask
 
-def load_sentiment_lexicon(kamus_folder_path):
-    # Memuat kamus sentimen positif dan negatif
-    pos_lex = load_weighted_lexicon(os.path.join(kamus_folder_path, 'positive.csv'))  # Muat kamus positif
-    neg_lex = load_weighted_lexicon(os.path.join(kamus_folder_path, 'negative.csv'))  # Muat kamus negatif
-    
-    if not pos_lex and not neg_lex:  # Periksa apakah kedua kamus kosong
-        current_app.logger.warning(f"Satu atau kedua file kamus sentimen (positive.csv/negative.csv) tidak ditemukan di folder kamus: {kamus_folder_path}")  # Log peringatan
-    
-    return pos_lex, neg_lex  # Kembalikan kamus positif dan negatif
-
 @labeling_bp.route('/', methods=['GET', 'POST'])  # Rute untuk menampilkan atau melakukan pelabelan
 def show_or_perform_label():
-    kamus_folder = current_app.config['KAMUS_FOLDER_PATH']  # Ambil path folder kamus
-    pos_lex, neg_lex = load_sentiment_lexicon(kamus_folder)  # Muat kamus sentimen
-
     page = int(request.args.get("page", 1))  # Ambil nomor halaman
     search_query = request.args.get("search", "")  # Ambil kueri pencarian
     per_page = int(request.args.get("per_page", current_app.config['PER_PAGE']))  # Ambil jumlah data per halaman
@@ -39,24 +26,20 @@ def show_or_perform_label():
     )  # Kueri dasar untuk data dengan teks stemmed
     
     if request.method == 'POST':  # Tangani permintaan POST
-        data_to_label_auto = base_query_for_data.filter(
-            Preprocessing.label_otomatis == None
-        ).all()  # Ambil data tanpa label otomatis
+        scorer = get_lexicon_service().scorer()  # Kamus sentimen bersama (diparse ulang hanya bila file kamus berubah)
+        has_data_to_label = base_query_for_data.filter(
+            or_(Preprocessing.label_otomatis == None, Preprocessing.lexicon_score == None)
+        ).first() is not None  # Periksa apakah ada data tanpa label otomatis atau skor lexicon
 
-        if not data_to_label_auto:  # Periksa apakah tidak ada data untuk dilabeli
+        if not has_data_to_label:  # Periksa apakah tidak ada data untuk dilabeli
             flash("Tidak ada data hasil preprocessing yang siap untuk dilabeli (atau semua sudah memiliki label otomatis).", "info")  # Tampilkan info
-        elif not pos_lex and not neg_lex:  # Periksa apakah kamus kosong
+        elif not scorer:  # Periksa apakah kamus kosong
             flash("Kamus sentimen kosong atau tidak dapat dimuat. Pelabelan otomatis tidak dapat dilakukan.", "warning")  # Tampilkan peringatan
         else:
-            updated_count = 0  # Inisialisasi jumlah data yang diperbarui
             try:
-                for row_obj in data_to_label_auto:  # Iterasi data tanpa label
-                    score, label_lex = sentiment_analysis_lexicon(row_obj.text_stem)  # Analisis sentimen
-                    if label_lex:  # Jika label valid
-                        row_obj.label_otomatis = label_lex  # Set label otomatis
-                        updated_count += 1  # Tambah hitungan
-                if updated_count > 0:  # Jika ada data yang diperbarui
-                    db.session.commit()  # Simpan perubahan
+                updated_count = auto_label_preprocessing(scorer)  # Skor seluruh data sekaligus lalu UPDATE massal
+                db.session.commit()  # Simpan label dan skor lexicon
+                if updated_count > 0:  # Jika ada data yang dilabeli
                     flash(f"{updated_count} data berhasil dilabeli secara otomatis (data yang belum memiliki label telah diisi).", "success")  # Tampilkan sukses
                 else:
                     flash("Tidak ada label otomatis yang kosong yang berhasil diisi oleh lexicon, atau lexicon tidak menghasilkan label baru untuk data yang ada.", "info")  # Tampilkan info
@@ -64,25 +47,28 @@ def show_or_perform_label():
                 db.session.rollback()  # Batalkan perubahan
                 flash(f"Error saat pelabelan otomatis: {str(e)}", "danger")  # Tampilkan error
                 current_app.logger.error(f"Auto-label error: {e}", exc_info=True)  # Log error
+            get_label_stats().invalidate()  # Label otomatis berubah: hitung ulang statistik
         session['label_show_stats'] = '1'  # Tampilkan statistik setelah pelabelan
         session['lexicon_stats_ready'] = True  # Tandai statistik siap
         return redirect(url_for('labeling.show_or_perform_label', show_stats='1', page=1, per_page=per_page))  # Redirect ke halaman
     
-    total_data_for_labeling = base_query_for_data.count()  # Hitung total data untuk pelabelan
+    stats = get_label_stats().get()  # Seluruh statistik label dari cache (dua kueri GROUP BY saat cache kosong)
+    total_data_for_labeling = stats['total_data_for_labeling']  # Total data untuk pelabelan
+    total_unlabeled = stats['total_unlabeled']  # Data tanpa label
 
-    total_data, total_positif_otomatis, total_negatif_otomatis, total_netral_otomatis = count_labels()  # Hitung statistik label otomatis
+    total_positif_otomatis = stats['otomatis']['positif']  # Label positif otomatis
+    total_negatif_otomatis = stats['otomatis']['negatif']  # Label negatif otomatis
+    total_netral_otomatis = stats['otomatis']['netral']  # Label netral otomatis
 
-    total_positif_pakar = DataPakar.query.filter(DataPakar.label == 'positif').count()  # Hitung label positif pakar
-    total_negatif_pakar = DataPakar.query.filter(DataPakar.label == 'negatif').count()  # Hitung label negatif pakar
-    total_netral_pakar = DataPakar.query.filter(DataPakar.label == 'netral').count()  # Hitung label netral pakar
-    total_pakar_data = DataPakar.query.filter(DataPakar.label.isnot(None)).count()  # Hitung total data pakar berlabel
+    total_positif_pakar = stats['pakar']['positif']  # Label positif pakar
+    total_negatif_pakar = stats['pakar']['negatif']  # Label negatif pakar
+    total_netral_pakar = stats['pakar']['netral']  # Label netral pakar
+    total_pakar_data = stats['total_pakar_data']  # Total data pakar berlabel
 
     total_positif_lexicon = total_positif_otomatis  # Set statistik lexicon positif
     total_negatif_lexicon = total_negatif_otomatis  # Set statistik lexicon negatif
     total_netral_lexicon = total_netral_otomatis  # Set statistik lexicon netral
 
-    total_unlabeled = base_query_for_data.filter(Preprocessing.label_otomatis.is_(None)).count()  # Hitung data tanpa label
-
     if search_query:  # Jika ada kueri pencarian
         search_term = f"%{search_query}%"  # Format kueri pencarian
         filter_conditions = [
@@ -97,14 +83,13 @@ def show_or_perform_label():
             filter_conditions.append(Preprocessing.id == int(search_query))  # Tambah filter ID
         base_query_for_data = base_query_for_data.filter(or_(*filter_conditions))  # Terapkan filter pencarian
             
-    data_pagination = base_query_for_data.order_by(Preprocessing.id.asc()).paginate(page=page, per_page=per_page, error_out=False)  # Paginate data
+    label_pakar_query = db.select(DataPakar.label).where(
+        DataPakar.text_key == Preprocessing.text_key
+    ).order_by(DataPakar.id.desc()).limit(1).correlate(Preprocessing).scalar_subquery()  # Label pakar lewat kunci teks terindeks (entri terakhir)
+    data_pagination = base_query_for_data.add_columns(label_pakar_query.label('label_pakar')).order_by(Preprocessing.id.asc()).paginate(page=page, per_page=per_page, error_out=False)  # Paginate data beserta label pakar dalam satu kueri
 
     enhanced_items = []  # Inisialisasi list untuk data yang diperkaya
-    data_pakar_map = { (dp.full_text or '').strip().casefold(): dp.label for dp in DataPakar.query.all() }  # Buat kamus label pakar
-    
-    for item in data_pagination.items:  # Iterasi item pagination
-        score, polarity = sentiment_analysis_lexicon(item.text_stem)  # Analisis sentimen
-        label_pakar_for_display = data_pakar_map.get((item.full_text or '').strip().casefold())  # Ambil label pakar
+    for item, label_pakar_for_display in data_pagination.items:  # Iterasi item pagination
         enhanced_item = {
             'id': item.id,
             'full_text': item.full_text,
@@ -112,7 +97,9 @@ def show_or_perform_label():
             'text_stem': item.text_stem,
             'label_otomatis': item.label_otomatis,
             'label_pakar': label_pakar_for_display,  # Label pakar untuk tampilan
-            'polarity': polarity,
+            'polarity': item.lexicon_polarity,  # Polaritas lexicon tersimpan
+            'lexicon_score': item.lexicon_score,  # Skor lexicon tersimpan
+            'lexicon_terms': decode_lexicon_terms(item.lexicon_terms),  # Istilah kamus yang cocok (untuk penjelasan skor)
         }  # Buat item yang diperkaya
         enhanced_items.append(enhanced_item)  # Tambah ke list
     
@@ -222,6 +209,7 @@ def upload_expert_labels():
         db.session.rollback()  # Batalkan perubahan
         current_app.logger.error(f"Upload error: {str(e)}", exc_info=True)  # Log error
         flash(f"Terjadi kesalahan saat mengupload file: {str(e)}", 'danger')  # Tampilkan error
+    get_label_stats().invalidate()  # Data pakar dihapus/diganti (juga bila gagal setelah penghapusan)
     
     return redirect(url_for('labeling.show_or_perform_label'))  # Redirect ke halaman
 
@@ -234,6 +222,7 @@ def reset_all_otomatis_labels():  # Nama fungsi bisa membingungkan, lebih baik '
     except Exception as e:  # Tangani error
         db.session.rollback()  # Batalkan perubahan
         flash(f"Error saat mereset label: {str(e)}", "danger")  # Tampilkan error
+    get_label_stats().invalidate()  # Label otomatis direset
     return redirect(url_for('labeling.show_or_perform_label'))  # Redirect ke halaman
 
 @labeling_bp.route('/reset_data_pakar', methods=['POST'])  # Rute untuk reset data pakar
@@ -246,6 +235,7 @@ def reset_data_pakar():
         db.session.rollback()  # Batalkan perubahan
         flash(f"Error saat mereset data pakar: {str(e)}", "danger")  # Tampilkan error
         current_app.logger.error(f"Reset data pakar error: {e}", exc_info=True)  # Log error
+    get_label_stats().invalidate()  # Data pakar dihapus
     return redirect(url_for('labeling.show_or_perform_label'))  # Redirect ke halaman
 
 @labeling_bp.route('/edit_manual_label', methods=['POST'])  # Rute untuk edit label manual
@@ -270,6 +260,7 @@ def edit_manual_label():
             try:
                 row_to_edit.label_otomatis = new_label if new_label else None  # Set label baru
                 db.session.commit()  # Simpan perubahan
+                get_label_stats().invalidate()  # Label berubah: hitung ulang statistik
                 flash(f"Label untuk ID {row_id} berhasil diubah menjadi '{new_label if new_label else 'Kosong'}'.", "success")  # Tampilkan sukses
             except Exception as e:  # Tangani error
                 db.session.rollback()  # Batalkan perubahan
@@ -124,9 +124,13 @@ def classification_nb():
                     max_features=current_app.config.get('TFIDF_MAX_FEATURES', 1000),
                     min_df=current_app.config.get('TFIDF_MIN_DF', 3),
                     max_df_ratio=current_app.config.get('TFIDF_MAX_DF_RATIO', 0.9),
-                    ngram_range=current_app.config.get('TFIDF_NGRAM_RANGE', (1, 2))
+                    ngram_range=current_app.config.get('TFIDF_NGRAM_RANGE', (1, 2)),
+                    n_buckets=current_app.config.get('TFIDF_HASH_BUCKETS'),
+                    alternate_sign=False,
+                    n_jobs=current_app.config.get('TFIDF_N_JOBS', 1)
                 )
                 # Inisialisasi TF-IDF vectorizer dengan parameter dari konfigurasi.
+                # Mode hashing aktif jika TFIDF_HASH_BUCKETS diisi; tanpa tanda +/- karena Naive Bayes butuh fitur non-negatif.
                 X_train_tfidf = vectorizer.fit_transform(X_train_stem, normalize=False)
                 # Melatih dan mengubah data pelatihan menjadi matriks TF-IDF.
                 
@@ -171,7 +175,7 @@ def classification_nb():
                 report['vectorizer_params'] = {
                     'max_features': vectorizer.max_features, 'min_df': vectorizer.min_df,
                     'max_df_ratio': vectorizer.max_df_ratio, 'ngram_range': vectorizer.ngram_range,
-                    'vocab_size': len(vectorizer.vocabulary_)
+                    'vocab_size': vectorizer.n_features_
                 }
                 # Menyimpan parameter vectorizer.
               
@@ -4,8 +4,10 @@ import pandas as pd  # Modul untuk memproses data tabular
 import io  # Modul untuk menangani I/O di memori
 
 from .. import db  # Impor instance SQLAlchemy
-from ..models import Preprocessing, Dataset  # Impor model database
-from ..module.preprocessing import preprocess_workflow  # Impor fungsi preprocessing
+from ..models import Preprocessing, PreprocessingSkip, Dataset  # Impor model database
+from ..module.preprocessing import iter_preprocess_workflow, pipeline_fingerprint, text_fingerprint  # Impor fungsi preprocessing
+from ..module.preprocessing_store import load_existing_preprocessing, upsert_preprocessing_rows, relink_dataset_ids  # Impor penyimpanan massal
+from ..module.label_stats import get_label_stats  # Statistik label tersimpan
 
 preprocessing_bp = Blueprint('preprocessing', __name__)  # Buat blueprint Flask
 
@@ -39,46 +41,68 @@ def show_preprocessing_results():
                          search_query=search_query,  # Kueri pencarian
                          per_page=per_page)  # Jumlah data per halaman
 
+def with_source_keys(processed_results, pipeline_fp, dataset_id_by_text, processed_texts):
+    # Melengkapi hasil preprocessing dengan sidik jari dan dataset_id, sambil mencatat teks yang menghasilkan data
+    for data_dict in processed_results:  # Iterasi hasil preprocessing
+        full_text = data_dict.get('full_text')
+        data_dict['source_hash'] = text_fingerprint(full_text, pipeline_fp)  # Simpan sidik jari
+        data_dict['dataset_id'] = dataset_id_by_text.get(full_text)  # Tautkan ke Dataset
+        processed_texts.add(full_text)
+        yield data_dict
+
 @preprocessing_bp.route('/run', methods=['POST'])  # Rute untuk menjalankan preprocessing
 def run_preprocessing_pipeline():
-    dataset_entries = Dataset.query.all()  # Ambil semua data dari tabel Dataset
+    dataset_entries = db.session.query(Dataset.id, Dataset.username, Dataset.full_text, Dataset.created_at).all()  # Ambil semua data dari tabel Dataset
     if not dataset_entries:  # Periksa apakah data kosong
         flash("Tidak ada data di tabel Dataset untuk diproses.", "warning")  # Tampilkan peringatan
         return redirect(url_for('preprocessing.show_preprocessing_results'))  # Redirect ke halaman
     
+    full_reprocess = request.form.get('full_reprocess') == '1'  # Mode proses ulang semua data
     try:
         slangwords_path = current_app.config['SLANGWORDS_JSON_PATH']  # Ambil path file slangwords
-        processed_data_dicts = preprocess_workflow(dataset_entries, slangwords_path)  # Jalankan preprocessing
-        
-        if processed_data_dicts:  # Jika ada data yang diproses
-            for data_dict in processed_data_dicts:  # Iterasi hasil preprocessing
-                dataset = Dataset.query.filter_by(full_text=data_dict.get('full_text')).first()  # Cari data di Dataset
-                existing = Preprocessing.query.filter_by(
-                    full_text=data_dict.get('full_text')
-                ).first()  # Cari data di Preprocessing
-                
-                if existing:  # Jika data sudah ada
-                    for k, v in data_dict.items():  # Perbarui atribut
-                        if k not in ['label_otomatis', 'id']:  # Kecualikan label_otomatis dan id
-                            setattr(existing, k, v)
-                    if dataset:  # Jika data Dataset ada
-                        existing.dataset_id = dataset.id  # Set dataset_id
-                else:  # Jika data baru
-                    new_data = {
-                        'label_otomatis': None
-                    }  # Inisialisasi data baru
-                    new_data.update(data_dict)  # Tambah hasil preprocessing
-                    if dataset:  # Jika data Dataset ada
-                        new_data['dataset_id'] = dataset.id  # Set dataset_id
-                    db.session.add(Preprocessing(**new_data))  # Tambah ke sesi
-        
+        pipeline_fp = pipeline_fingerprint(slangwords_path)  # Sidik jari versi pipeline dan kamus
+        if full_reprocess:  # Proses ulang semua: lupakan teks yang sebelumnya menghasilkan data kosong
+            PreprocessingSkip.query.delete()
+        existing_rows = load_existing_preprocessing()  # Sidik jari, id, dan dataset_id data yang sudah diproses (satu kueri)
+        skipped_hashes = {row.source_hash for row in db.session.query(PreprocessingSkip.source_hash)}  # Teks yang hasilnya kosong
+
+        entries_to_process, dataset_id_by_text, relinks = [], {}, []  # Data baru/berubah, peta full_text -> id Dataset, tautan ulang
+        for entry in dataset_entries:  # Pilih data yang belum diproses dengan pipeline saat ini
+            if entry.full_text in dataset_id_by_text:  # Lewati teks duplikat
+                continue
+            dataset_id_by_text[entry.full_text] = entry.id
+            fingerprint = text_fingerprint(entry.full_text, pipeline_fp)  # Sidik jari teks
+            existing = existing_rows.get(entry.full_text)  # Hasil preprocessing sebelumnya
+            if not full_reprocess and (fingerprint in skipped_hashes or (existing and existing.source_hash == fingerprint)):
+                if existing and existing.dataset_id != entry.id:  # Dataset diunggah ulang: tautkan ke id baru
+                    relinks.append({'id': existing.id, 'dataset_id': entry.id})
+                continue
+            entries_to_process.append(entry)
+        skipped_count = len(dataset_id_by_text) - len(entries_to_process)  # Jumlah data yang tidak berubah
+        current_app.logger.info(f"Preprocessing inkremental: {len(entries_to_process)} data diproses, {skipped_count} dilewati.")  # Log ringkasan
+
+        processed_texts = set()  # Teks yang menghasilkan data
+        processed_results = iter_preprocess_workflow(entries_to_process, slangwords_path, stem_cache_path=current_app.config.get('STEM_CACHE_PATH')) if entries_to_process else []  # Jalankan preprocessing (streaming)
+        inserted_count, updated_count = upsert_preprocessing_rows(
+            with_source_keys(processed_results, pipeline_fp, dataset_id_by_text, processed_texts), existing_rows
+        )  # Simpan hasil secara massal per potongan, selagi worker masih memproses
+        current_app.logger.info(f"Preprocessing disimpan: {inserted_count} baris baru, {updated_count} baris diperbarui.")  # Log hasil simpan
+
+        empty_hashes = {
+            text_fingerprint(entry.full_text, pipeline_fp)
+            for entry in entries_to_process if entry.full_text not in processed_texts
+        } - skipped_hashes  # Teks yang hasilnya kosong dan belum tercatat
+        if empty_hashes:  # Catat agar tidak diproses ulang di klik berikutnya
+            db.session.bulk_insert_mappings(PreprocessingSkip, [{'source_hash': h} for h in empty_hashes])
+        relink_dataset_ids(relinks)  # Tautkan ulang dataset_id hanya untuk baris yang dilewati dan berubah
         db.session.commit()  # Simpan perubahan
-        flash("Preprocessing selesai dan data disimpan.", "success")  # Tampilkan pesan sukses
+        flash(f"Preprocessing selesai dan data disimpan ({len(processed_texts)} data diproses, {skipped_count} data tidak berubah dilewati).", "success")  # Tampilkan pesan sukses
         
     except Exception as e:  # Tangani error
         db.session.rollback()  # Batalkan perubahan
         flash(f"Error saat menjalankan proses preprocessing: {str(e)}", "danger")  # Tampilkan error
         current_app.logger.error(f"Preprocessing pipeline error: {e}", exc_info=True)  # Log error
+    get_label_stats().invalidate()  # Data preprocessing bertambah/berubah: hitung ulang statistik label
 
     return redirect(url_for('preprocessing.show_preprocessing_results'))  # Redirect ke halaman
 
@@ -86,6 +110,7 @@ def run_preprocessing_pipeline():
 def delete_all_preprocessing_data():
     try:
         deleted = Preprocessing.query.delete()  # Hapus semua data dari tabel Preprocessing
+        PreprocessingSkip.query.delete()  # Hapus juga catatan teks yang hasilnya kosong
         db.session.commit()  # Simpan perubahan sementara
         
         try:
@@ -103,6 +128,7 @@ def delete_all_preprocessing_data():
         db.session.rollback()  # Batalkan perubahan
         current_app.logger.error(f"Error saat menghapus data preprocessing: {str(e)}")  # Log error
         flash(f"Error saat menghapus data: {str(e)}", "danger")  # Tampilkan error
+    get_label_stats().invalidate()  # Data preprocessing dihapus
     
     return redirect(url_for('preprocessing.show_preprocessing_results'))  # Redirect ke halaman
 
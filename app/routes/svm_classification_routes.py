@@ -19,6 +19,8 @@ from app.module.naive_bayes import oversample_minority
 # Impor fungsi oversampling dari modul Naive Bayes.
 from app.module.tfidf_vectorizer import CustomTfidf, preprocess_text_for_vectorizers
 # Impor kelas dan fungsi untuk TF-IDF vectorizer.
+from app.module.model_registry import get_model_registry
+# Impor registry model bersama (cache model dan vectorizer tersimpan).
 from app.utils import generate_classification_report, get_sampled_tfidf, SENTIMENT_LABELS
 # Impor utilitas untuk laporan klasifikasi dan label sentimen.
 
@@ -158,9 +160,8 @@ def classification_svm():
                     # Peringatkan jika file vectorizer tidak ada.
                     continue
                 
-                with open(vectorizer_path, 'rb') as f_vec:
-                    vectorizer = pickle.load(f_vec)
-                # Muat vectorizer dari file.
+                vectorizer = get_model_registry().load(vectorizer_path)
+                # Muat vectorizer lewat registry model (dari cache bila file belum berubah).
 
                 X_train_vectorized = vectorizer.transform(X_train, normalize=True)
                 # Ubah data pelatihan menjadi matriks TF-IDF.
@@ -175,9 +176,11 @@ def classification_svm():
                 svm_classifier = SupportVectorMachine(
                     label_source=source,
                     random_state=42,
-                    use_oversampling=USE_OVERSAMPLING
+                    use_oversampling=USE_OVERSAMPLING,
+                    n_jobs=current_app.config.get('SVM_N_JOBS'),
+                    solver=current_app.config.get('SVM_SOLVER')
                 )
-                # Inisialisasi model SVM dengan sumber label dan status oversampling.
+                # Inisialisasi model SVM dengan sumber label, status oversampling, jumlah proses, dan solver.
               
                 svm_classifier.fit(X_train_vectorized, y_train)
                 # Latih model SVM.
@@ -195,11 +198,12 @@ def classification_svm():
                 report = generate_classification_report(y_test, y_pred)
                 # Buat laporan klasifikasi (akurasi, presisi, dll.).
                 report['model_params'] = svm_classifier.get_params()
-                # Simpan parameter model SVM.
+                report['model_params'].update(svm_classifier.training_summary())
+                # Simpan parameter model SVM beserta epoch yang dicapai dan kurva loss.
                 report['vectorizer_params'] = {
                     'max_features': vectorizer.max_features, 'min_df': vectorizer.min_df,
                     'max_df_ratio': vectorizer.max_df_ratio, 'ngram_range': vectorizer.ngram_range,
-                    'vocab_size': len(vectorizer.vocabulary_)
+                    'vocab_size': vectorizer.n_features_
                 }
                 # Simpan parameter vectorizer.
                 
@@ -1,30 +1,24 @@
 from flask import Blueprint, render_template, request, redirect, url_for, flash, current_app, session  # Impor modul Flask
 import os  # Modul untuk operasi sistem file
-import pickle  # Modul untuk serialisasi data
 import glob  # Modul untuk pencarian file
 from wordcloud import WordCloud, STOPWORDS  # Modul untuk membuat wordcloud
-import numpy as np  # Modul untuk operasi numerik
 
 from app.models import KlasifikasiNB, KlasifikasiSVM  # Impor model database
 from app.module.tfidf_vectorizer import CustomTfidf  # Impor vectorizer TF-IDF
+from app.module.model_registry import MODEL_FILES, LABEL_SOURCES, get_model_registry  # Registry model bersama dan daftar model tersimpan
+from app.module.label_stats import count_by_label  # Hitung label dengan GROUP BY
 
 utility_bp = Blueprint('utils', __name__, template_folder='../templates')  # Buat blueprint Flask
 
 def calculate_label_counts_from_db(model_name_for_chart):
     # Menghitung jumlah label dari database
     if model_name_for_chart == 'Naive Bayes':  # Jika model Naive Bayes
-        classification_data = KlasifikasiNB.query.all()  # Ambil semua data NB
+        counts = count_by_label(KlasifikasiNB.label_prediksi)  # Hitung per label dengan GROUP BY
     elif model_name_for_chart == 'SVM':  # Jika model SVM
-        classification_data = KlasifikasiSVM.query.all()  # Ambil semua data SVM
+        counts = count_by_label(KlasifikasiSVM.label_prediksi)  # Hitung per label dengan GROUP BY
     else:
-        classification_data = []  # Data kosong jika model tidak valid
-    
-    counts = {'positif': 0, 'negatif': 0, 'netral': 0}  # Inisialisasi counter label
-    for item in classification_data:  # Iterasi data klasifikasi
-        label = item.label_prediksi  # Ambil label prediksi
-        if label in counts: 
-            counts[label] += 1  # Tambah hitungan
-    return [counts['positif'], counts['negatif'], counts['netral']]  # Kembalikan list hitungan
+        counts = {}  # Data kosong jika model tidak valid
+    return [counts.get('positif', 0), counts.get('negatif', 0), counts.get('netral', 0)]  # Kembalikan list hitungan
 
 @utility_bp.route('/visualization', methods=['GET', 'POST'])  # Rute untuk visualisasi sentimen
 def sentiment_visualization():
@@ -151,71 +145,26 @@ def sentiment_visualization():
 def word_sentiment_prediction():
     input_text = ''  # Inisialisasi teks input
     selected_model_choice = 'Naive Bayes'  # Default model
+    selected_label_source = 'otomatis'  # Default sumber label model
     prediction = None  # Inisialisasi prediksi
     prediction_score = None  # Inisialisasi skor prediksi
     error = None  # Inisialisasi error
     if request.method == 'POST':  # Tangani permintaan POST
         input_text = request.form.get('input_text', '')  # Ambil teks input
         selected_model_choice = request.form.get('model_choice', 'Naive Bayes')  # Ambil pilihan model
+        selected_label_source = request.form.get('label_source', 'otomatis')  # Ambil sumber label model
         if not input_text.strip():  # Periksa apakah teks kosong
             error = 'Teks tidak boleh kosong.'  # Set error
+        elif selected_model_choice not in MODEL_FILES or selected_label_source not in LABEL_SOURCES:  # Periksa pilihan
+            error = 'Pilihan model atau sumber label tidak valid.'  # Set error
         else:
             try:
-                model_folder = os.path.join(current_app.root_path, '..', 'model')  # Path folder model
-                vectorizer_path = os.path.join(model_folder, 'tfidf_vectorizer.pkl')  # Path vectorizer
-
-                if selected_model_choice == 'Naive Bayes':  # Jika model Naive Bayes
-                    model_path = os.path.join(model_folder, 'nb', 'naive_bayes_model.pkl')  # Path model NB
-                    
-                    if not os.path.exists(model_path) or not os.path.exists(vectorizer_path):  # Periksa keberadaan file
-                        error = 'Model Naive Bayes atau Vectorizer bersama belum tersedia. Silakan lakukan klasifikasi terlebih dahulu.'  # Set error
-                    else:
-                        with open(model_path, 'rb') as f_model:  # Buka model NB
-                            nb_model = pickle.load(f_model)  # Muat model
-                        with open(vectorizer_path, 'rb') as f_vec:  # Buka vectorizer
-                            vectorizer = pickle.load(f_vec)  # Muat vectorizer
-                        
-                        X_input_tfidf = vectorizer.transform([input_text])  # Transformasi teks ke TF-IDF
-                        
-                        if hasattr(nb_model, 'predict_with_score'):  # Jika model punya predict_with_score
-                            label_score_list = nb_model.predict_with_score(X_input_tfidf)  # Prediksi dengan skor
-                            if label_score_list:  # Jika ada hasil
-                                prediction = label_score_list[0][0]  # Ambil label
-                                prediction_score = label_score_list[0][1]  # Ambil skor
-                            else:
-                                prediction = None  # Set prediksi kosong
-                                prediction_score = None  # Set skor kosong
-                        else:
-                            prediction = nb_model.predict(X_input_tfidf)[0]  # Prediksi label
-                            if hasattr(nb_model, 'predict_proba'):  # Jika model punya predict_proba
-                                proba = nb_model.predict_proba(X_input_tfidf)[0]  # Ambil probabilitas
-                                class_idx = list(nb_model.classes_).index(prediction)  # Ambil indeks kelas
-                                prediction_score = proba[class_idx]  # Ambil skor
-                            else:
-                                prediction_score = 'N/A'  # Skor tidak tersedia
-
-                elif selected_model_choice == 'SVM':  # Jika model SVM
-                    model_path = os.path.join(model_folder, 'svm', 'svm_model.pkl')  # Path model SVM
-
-                    if not os.path.exists(model_path) or not os.path.exists(vectorizer_path):  # Periksa keberadaan file
-                        error = 'Model SVM atau Vectorizer bersama belum tersedia. Silakan lakukan klasifikasi terlebih dahulu.'  # Set error
-                    else:
-                        with open(model_path, 'rb') as f_model:  # Buka model SVM
-                            svm_model = pickle.load(f_model)  # Muat model
-                        with open(vectorizer_path, 'rb') as f_vec:  # Buka vectorizer
-                            vectorizer = pickle.load(f_vec)  # Muat vectorizer
-                        
-                        X_input_tfidf = vectorizer.transform([input_text])  # Transformasi teks ke TF-IDF
-                        
-                        if hasattr(svm_model, 'predict_proba'):  # Jika model punya predict_proba
-                            prediction_proba = svm_model.predict_proba(X_input_tfidf)[0]  # Ambil probabilitas
-                            predicted_class_index = np.argmax(prediction_proba)  # Ambil indeks kelas
-                            prediction = svm_model.classes_[predicted_class_index]  # Ambil label
-                            prediction_score = prediction_proba[predicted_class_index]  # Ambil skor
-                        else:
-                            prediction = svm_model.predict(X_input_tfidf)[0]  # Prediksi label
-                            prediction_score = 'N/A'  # Skor tidak tersedia
-
+                # Model dan vectorizer diambil dari registry (di memori), bukan unpickle dari disk setiap request
+                labels, scores = get_model_registry().predict_texts(selected_model_choice, selected_label_source, [input_text])
+                prediction = labels[0]  # Ambil label
+                prediction_score = scores[0]  # Ambil skor (probabilitas kelas terpilih)
+            except FileNotFoundError as fe:  # Model belum dilatih untuk sumber label ini
+                error = str(fe)  # Set error
             except ValueError as ve:  # Tangani error nilai
                 error = f"Terjadi kesalahan saat prediksi: {ve}"  # Set error
                 current_app.logger.error(f"Prediction ValueError: {ve}", exc_info=True)  # Log error
@@ -227,6 +176,9 @@ def word_sentiment_prediction():
                             title='Uji Model',  # Judul halaman
                             input_text=input_text,  # Teks input
                             selected_model_choice=selected_model_choice,  # Pilihan model
+                            selected_label_source=selected_label_source,  # Sumber label model
+                            model_choices=sorted(MODEL_FILES),  # Pilihan model
+                            label_sources=LABEL_SOURCES,  # Pilihan sumber label (otomatis/pakar)
                             prediction=prediction,  # Hasil prediksi
                             prediction_score=prediction_score,  # Skor prediksi
                             error=error)  # Pesan error
\ No newline at end of file
@@ -0,0 +1,486 @@
+# /Tugas Akhir 1.3 NB + svm/benchmark.py
+# Skrip pengukuran kinerja tahap-tahap pipeline (dijalankan manual, bukan bagian dari aplikasi web).
+# Contoh:
+#   python benchmark.py slang --csv dataset.csv
+#   python benchmark.py slang --n 5000
+#   python benchmark.py clean --n 20000
+#   python benchmark.py tfidf --n 20000
+#   python benchmark.py tfidf_hash --n 20000
+#   python benchmark.py tfidf_fit --n 100000
+#   python benchmark.py stem --n 500
+#   python benchmark.py batch --n 2000
+#   python benchmark.py nb --n 100000
+#   python benchmark.py nb_incremental --n 100000
+#   python benchmark.py svm --n 3000 --iters 20
+#   python benchmark.py svm_early --n 3000 --iters 2000
+#   python benchmark.py svm_jobs --n 3000 --iters 200
+#   python benchmark.py svm_predict --n 20000
+#   python benchmark.py svm_solver --n 3000
+#   python benchmark.py upsert --n 20000 --database sqlite:////tmp/bench.db
+#   python benchmark.py label --n 100000
+
+import argparse
+import os
+import random
+import sys
+import time
+
+project_root = os.path.dirname(os.path.abspath(__file__))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from config import Config
+from app.module import preprocessing, tfidf_vectorizer
+
+
+def load_corpus(csv_path=None, n=5000, seed=42):
+    # Ambil teks dari CSV (kolom full_text) atau buat korpus sintetis dari kamus slang dan lexicon
+    if csv_path:
+        import pandas as pd
+        texts = pd.read_csv(csv_path)['full_text'].dropna().astype(str).tolist()
+        return texts[:n] if n else texts
+    rng = random.Random(seed)
+    slang = preprocessing.load_json_dict(Config.SLANGWORDS_JSON_PATH)
+    words = list(slang) + [w for v in slang.values() for w in v.split()]
+    with open(os.path.join(Config.KAMUS_FOLDER_PATH, 'positive.csv'), encoding='utf-8') as f:
+        words += [line.split(';')[0] for line in f.read().splitlines()[1:]]
+    words += ['RT', '@user', '#KaburAjaDulu', 'https://t.co/abc', 'gen z', '>= 10', 'A/B', '&amp;', '!!!', '😀', '2025']  # Derau khas tweet
+    return [' '.join(rng.choice(words) for _ in range(rng.randint(5, 40))) for _ in range(n)]
+
+
+def timed(func, *args):
+    # Jalankan fungsi dan kembalikan (hasil, detik)
+    t0 = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - t0
+
+
+def bench_slang(texts):
+    # Bandingkan penggantian slang berurutan (satu re.sub per entri) dengan SlangReplacer
+    kamus = preprocessing.load_json_dict(Config.SLANGWORDS_JSON_PATH)
+    cleaned = [preprocessing.clean_text_pipeline(t) for t in texts]
+    replacer, t_build = timed(preprocessing.SlangReplacer, kamus)
+    legacy, t_legacy = timed(lambda: [preprocessing.replace_taboo_words(t, kamus) for t in cleaned])
+    fast, t_fast = timed(lambda: [preprocessing.replace_taboo_words(t, replacer) for t in cleaned])
+    mismatches = sum(a != b for a, b in zip(legacy, fast))
+    print(f"Dokumen           : {len(cleaned)}")
+    print(f"Build engine      : {t_build:.3f} s")
+    print(f"Berurutan (lama)  : {t_legacy:.3f} s ({len(cleaned) / t_legacy:.0f} docs/s)")
+    print(f"SlangReplacer     : {t_fast:.3f} s ({len(cleaned) / t_fast:.0f} docs/s)")
+    print(f"Speedup           : {t_legacy / t_fast:.1f}x, hasil berbeda: {mismatches}")
+    return mismatches == 0
+
+
+def make_bench_app(database_url):
+    # Aplikasi Flask dengan database terpisah (default SQLite in-memory) agar data asli tidak tersentuh
+    Config.SQLALCHEMY_DATABASE_URI = database_url or 'sqlite://'
+    from app import create_app, db
+    app = create_app('default')
+    return app, db
+
+
+def bench_upsert(texts, database_url=None):
+    # Bandingkan penyimpanan per baris (2 kueri filter_by + session.add) dengan upsert massal berpotongan
+    from app.models import Preprocessing
+    from app.module.preprocessing_store import load_existing_preprocessing, upsert_preprocessing_rows
+    app, db = make_bench_app(database_url)
+    texts = list(dict.fromkeys(texts))
+    rows = [{'username': 'u', 'full_text': t, 'text_clean': t, 'text_baku': t, 'text_stopwords': t, 'text_stem': t, 'created_at': ''} for t in texts]
+    half = len(rows) // 2
+
+    def legacy():
+        for row in rows:
+            existing = Preprocessing.query.filter_by(full_text=row['full_text']).first()
+            if existing:
+                for k, v in row.items():
+                    setattr(existing, k, v)
+            else:
+                db.session.add(Preprocessing(label_otomatis=None, **row))
+        db.session.commit()
+
+    def bulk():
+        upsert_preprocessing_rows(rows, load_existing_preprocessing())
+        db.session.commit()
+
+    results = {}
+    with app.app_context():
+        for name, func in (('per baris (lama)', legacy), ('upsert massal', bulk)):
+            Preprocessing.query.delete()
+            upsert_preprocessing_rows(rows[:half], {})  # Separuh data sudah ada sebelumnya (campuran INSERT dan UPDATE)
+            db.session.commit()
+            _, results[name] = timed(func)
+            assert Preprocessing.query.count() == len(rows)
+        Preprocessing.query.delete()
+        db.session.commit()
+    print(f"Baris             : {len(rows)} ({half} sudah ada)")
+    for name, seconds in results.items():
+        print(f"{name:<18}: {seconds:.3f} s ({len(rows) / seconds:.0f} baris/s)")
+
+
+def bench_label(texts, database_url=None):
+    # Bandingkan pelabelan lexicon per objek ORM (sentiment_analysis_lexicon per baris) dengan LexiconScorer + UPDATE massal;
+    # hasil dibandingkan dengan mode token tunggal (tanpa frasa/negasi), mode default ikut diukur waktunya
+    from app.models import Preprocessing
+    from app.module.labelling import LexiconScorer, auto_label_preprocessing, load_weighted_lexicon, sentiment_analysis_lexicon
+    from app.module.preprocessing_store import upsert_preprocessing_rows
+    app, db = make_bench_app(database_url)
+    pos_lex = load_weighted_lexicon(os.path.join(Config.KAMUS_FOLDER_PATH, 'positive.csv'))
+    neg_lex = load_weighted_lexicon(os.path.join(Config.KAMUS_FOLDER_PATH, 'negative.csv'))
+    texts = [t.lower() for t in dict.fromkeys(texts)]
+    rows = [{'username': 'u', 'full_text': t, 'text_stem': t, 'created_at': ''} for t in texts]
+
+    def legacy():
+        for row_obj in Preprocessing.query.filter(Preprocessing.label_otomatis == None).all():
+            row_obj.label_otomatis = sentiment_analysis_lexicon(row_obj.text_stem, pos_lex, neg_lex)[1]
+        db.session.commit()
+
+    def bulk(**options):
+        auto_label_preprocessing(LexiconScorer(pos_lex, neg_lex, **options))
+        db.session.commit()
+
+    results, labels = {}, {}
+    with app.app_context():
+        for name, func in (('per objek (lama)', legacy),
+                           ('batch + UPDATE', lambda: bulk(phrases=False, negation=False)),
+                           ('+ frasa/negasi', bulk)):
+            Preprocessing.query.delete()
+            upsert_preprocessing_rows(rows, {})
+            db.session.commit()
+            _, results[name] = timed(func)
+            labels[name] = [row.label_otomatis for row in db.session.query(Preprocessing.label_otomatis).order_by(Preprocessing.full_text)]
+        Preprocessing.query.delete()
+        db.session.commit()
+    mismatches = sum(a != b for a, b in zip(labels['per objek (lama)'], labels['batch + UPDATE']))
+    print(f"Baris             : {len(rows)}")
+    for name, seconds in results.items():
+        print(f"{name:<18}: {seconds:.3f} s ({len(rows) / seconds:.0f} baris/s)")
+    print(f"Hasil berbeda     : {mismatches} (frasa/negasi mengubah {sum(a != b for a, b in zip(labels['batch + UPDATE'], labels['+ frasa/negasi']))} label)")
+    return mismatches == 0
+
+
+def bench_clean(texts):
+    # Waktu per tahap pembersihan asli, lalu total tahap demi tahap vs clean_text_pipeline gabungan
+    stage_times = dict.fromkeys([name for name, _ in preprocessing.CLEAN_TEXT_STAGES], 0.0)
+    for text in texts:
+        for name, stage in preprocessing.CLEAN_TEXT_STAGES:
+            t0 = time.perf_counter()
+            text = stage(text)
+            stage_times[name] += time.perf_counter() - t0
+    for name, seconds in stage_times.items():
+        print(f"  {name:<20}: {seconds * 1000:8.1f} ms")
+    reference, t_stages = timed(lambda: [preprocessing.clean_text_by_stages(t) for t in texts])
+    fused, t_fused = timed(lambda: [preprocessing.clean_text_pipeline(t) for t in texts])
+    mismatches = sum(a != b for a, b in zip(reference, fused))
+    print(f"Dokumen           : {len(texts)}")
+    print(f"Tahap demi tahap  : {t_stages:.3f} s ({len(texts) / t_stages:.0f} docs/s)")
+    print(f"Gabungan          : {t_fused:.3f} s ({len(texts) / t_fused:.0f} docs/s)")
+    print(f"Speedup           : {t_stages / t_fused:.1f}x, hasil berbeda: {mismatches}")
+    return mismatches == 0
+
+
+def make_vectorizer():
+    # CustomTfidf dengan parameter yang sama seperti rute klasifikasi
+    from app.module.tfidf_vectorizer import CustomTfidf
+    return CustomTfidf(max_features=Config.TFIDF_MAX_FEATURES, ngram_range=Config.TFIDF_NGRAM_RANGE,
+                       min_df=Config.TFIDF_MIN_DF, max_df_ratio=Config.TFIDF_MAX_DF_RATIO)
+
+
+def bench_tfidf(texts):
+    # Bandingkan transform lama (per term lewat COO) dengan transform vektor
+    import numpy as np
+    from tests.test_tfidf_vectorizer import reference_transform
+    docs = [preprocessing.clean_text_pipeline(t) for t in texts]
+    vectorizer, t_fit = timed(make_vectorizer().fit, docs)
+    expected, t_legacy = timed(reference_transform, vectorizer, docs)
+    actual, t_fast = timed(vectorizer.transform, docs)
+    max_diff = abs(expected - actual).max() if actual.nnz else 0.0
+    print(f"Dokumen           : {len(docs)}, fitur: {len(vectorizer.vocabulary_)}, fit: {t_fit:.3f} s")
+    print(f"Transform lama    : {t_legacy:.3f} s ({len(docs) / t_legacy:.0f} docs/s)")
+    print(f"Transform vektor  : {t_fast:.3f} s ({len(docs) / t_fast:.0f} docs/s)")
+    print(f"Speedup           : {t_legacy / t_fast:.1f}x, selisih maksimum: {max_diff:.2e}")
+    return bool(np.isclose(max_diff, 0.0))
+
+
+def bench_tfidf_hash(texts, n_buckets=2 ** 16):
+    # Bandingkan memori puncak fit dan ukuran pickle: mode kamus vs mode hashing
+    import pickle
+    import tracemalloc
+    docs = [preprocessing.clean_text_pipeline(t) for t in texts]
+    for name, vectorizer in (('kamus', make_vectorizer()), (f'hashing {n_buckets}', make_vectorizer())):
+        if name != 'kamus':
+            vectorizer.n_buckets = n_buckets
+        tracemalloc.start()
+        _, t_fit = timed(vectorizer.fit, docs)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        _, t_transform = timed(vectorizer.transform, docs)
+        print(f"{name:<18}: fit {t_fit:.3f} s (puncak {peak / 1e6:.1f} MB), transform {t_transform:.3f} s, pickle {len(pickle.dumps(vectorizer)) / 1e3:.0f} KB")
+
+
+def bench_tfidf_fit(texts):
+    # Bandingkan fit serial dengan fit paralel per shard (minimal 2 proses); kamus dan IDF harus identik
+    import numpy as np
+    docs = [preprocessing.clean_text_pipeline(t) for t in texts]
+    serial, parallel = make_vectorizer(), make_vectorizer()
+    serial.n_jobs, parallel.n_jobs = 1, max(2, os.cpu_count() or 1)
+    _, t_serial = timed(serial.fit, docs)
+    tfidf_vectorizer.clear_corpus_cache()  # Jangan ukur hasil cache tokenisasi
+    _, t_parallel = timed(parallel.fit, docs)
+    identical = serial.vocabulary_ == parallel.vocabulary_ and np.array_equal(serial.idf_, parallel.idf_)
+    print(f"Dokumen           : {len(docs)}, CPU: {os.cpu_count()}")
+    print(f"Fit serial        : {t_serial:.3f} s")
+    print(f"Fit paralel       : {t_parallel:.3f} s ({t_serial / t_parallel:.2f}x), identik: {identical}")
+    return identical
+
+
+def bench_tfidf_reuse(texts):
+    # Alur route NB lalu SVM: fit_transform + transform ulang data latih; tanpa cache vs dengan cache tokenisasi
+    import numpy as np
+    docs = [preprocessing.clean_text_pipeline(t) for t in texts]
+
+    def route_flow():
+        vectorizer = make_vectorizer()
+        X_nb = vectorizer.fit_transform(docs, normalize=False)  # Route NB
+        X_svm = vectorizer.transform(docs, normalize=True)  # Route SVM memakai vectorizer yang sama
+        return X_nb, X_svm
+
+    cache_min_docs = tfidf_vectorizer.CORPUS_CACHE_MIN_DOCS
+    tfidf_vectorizer.CORPUS_CACHE_MIN_DOCS = len(docs) + 1  # Matikan cache
+    (X_nb_old, X_svm_old), t_uncached = timed(route_flow)
+    tfidf_vectorizer.CORPUS_CACHE_MIN_DOCS = cache_min_docs
+    tfidf_vectorizer.clear_corpus_cache()
+    (X_nb, X_svm), t_cached = timed(route_flow)
+    identical = (X_nb != X_nb_old).nnz == 0 and (X_svm != X_svm_old).nnz == 0
+    print(f"Dokumen           : {len(docs)}")
+    print(f"Tanpa cache       : {t_uncached:.3f} s")
+    print(f"Dengan cache      : {t_cached:.3f} s ({t_uncached / t_cached:.2f}x), identik: {identical}")
+    return identical
+
+
+def bench_stem(texts):
+    # Jalankan preprocessing dua kali dengan cache stemming persisten baru: dingin lalu hangat
+    import tempfile
+    texts_data = [{'full_text': t} for t in texts]
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_path = os.path.join(tmp, 'stem_cache.sqlite')
+        _, t_cold = timed(preprocessing.preprocess_texts_batch, texts_data, Config.SLANGWORDS_JSON_PATH, None, cache_path)
+        cached_words = len(preprocessing.load_stem_cache(cache_path))
+        _, t_warm = timed(preprocessing.preprocess_texts_batch, texts_data, Config.SLANGWORDS_JSON_PATH, None, cache_path)
+    print(f"Dokumen           : {len(texts_data)}, kata di cache: {cached_words}")
+    print(f"Cache dingin      : {t_cold:.3f} s ({len(texts_data) / t_cold:.0f} docs/s)")
+    print(f"Cache hangat      : {t_warm:.3f} s ({len(texts_data) / t_warm:.0f} docs/s)")
+
+
+def bench_batch(texts):
+    # Bandingkan pengiriman satu dokumen per tugas (chunksize 1, perilaku lama) dengan potongan otomatis
+    # pada cache stemming hangat, sehingga yang terukur adalah overhead IPC dan bukan Sastrawi
+    import tempfile
+    import tracemalloc
+    texts_data = [{'full_text': t} for t in texts]
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_path = os.path.join(tmp, 'stem_cache.sqlite')
+        preprocessing.preprocess_texts_batch(texts_data, Config.SLANGWORDS_JSON_PATH, None, cache_path)  # Hangatkan cache stemming
+        timings = {}
+        for name, chunk_size in (('chunksize 1', 1), ('potongan otomatis', None)):
+            tracemalloc.start()
+            consumed, timings[name] = timed(lambda: sum(1 for _ in preprocessing.iter_preprocess_texts(texts_data, Config.SLANGWORDS_JSON_PATH, None, cache_path, chunk_size)))
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(f"{name:<18}: {timings[name]:.3f} s ({len(texts_data) / timings[name]:.0f} docs/s, {consumed} hasil, puncak memori induk {peak / 1e6:.1f} MB)")
+
+
+def make_svm_data(texts, seed=42):
+    # Matriks TF-IDF ternormalisasi (seperti route SVM) dengan label acak tiga kelas
+    import numpy as np
+    docs = [preprocessing.clean_text_pipeline(t) for t in texts]
+    X = make_vectorizer().fit_transform(docs, normalize=True)
+    y = np.array(['positif', 'negatif', 'netral'])[np.random.RandomState(seed).randint(0, 3, len(docs))]
+    return X, y
+
+
+def bench_svm(texts, n_iters=20):
+    # Bandingkan pelatihan SVM per kelas (lama) dengan mesin SGD semua kelas sekaligus
+    import contextlib
+    import io
+    import numpy as np
+    from app.module.svm import SupportVectorMachine
+    from tests.test_svm import reference_fit
+    X, y = make_svm_data(texts)
+    with contextlib.redirect_stdout(io.StringIO()):  # Redam log per epoch
+        reference, t_legacy = timed(reference_fit, SupportVectorMachine(n_iters=n_iters, early_stopping=False), X, y)
+        model, t_fast = timed(SupportVectorMachine(n_iters=n_iters, early_stopping=False).fit, X, y)
+    max_diff = max(np.abs(model.w[c] - reference.w[c]).max() for c in model.classes_)
+    same_predictions = bool(np.all(model.predict(X) == reference.predict(X)))
+    print(f"Data              : {X.shape[0]} x {X.shape[1]}, epoch: {n_iters}")
+    print(f"Per kelas (lama)  : {t_legacy:.3f} s")
+    print(f"Mesin SGD vektor  : {t_fast:.3f} s ({t_legacy / t_fast:.1f}x)")
+    print(f"Selisih bobot     : {max_diff:.2e}, prediksi sama: {same_predictions}")
+    return same_predictions
+
+
+def learnable_svm_data(texts):
+    # Data SVM dengan label dari kata penanda agar ada pola yang bisa dipelajari, dibagi 80/20
+    import numpy as np
+    X, y = make_svm_data(texts)
+    docs = [preprocessing.clean_text_pipeline(t) for t in texts]
+    y = np.where(['baik' in d or 'bagus' in d for d in docs], 'positif', np.where(['tidak' in d for d in docs], 'negatif', y))
+    split = int(len(y) * 0.8)
+    return X[:split], y[:split], X[split:], y[split:]
+
+
+def bench_svm_early(texts, n_iters=2000):
+    # Bandingkan pelatihan SVM penuh n_iters epoch dengan penghentian dini (akurasi pada data uji 20%)
+    import contextlib
+    import io
+    import numpy as np
+    from app.module.svm import SupportVectorMachine
+    X_train, y_train, X_test, y_test = learnable_svm_data(texts)
+    results = {}
+    for name, early_stopping in (('penuh', False), ('penghentian dini', True)):
+        with contextlib.redirect_stdout(io.StringIO()):
+            model, elapsed = timed(SupportVectorMachine(n_iters=n_iters, early_stopping=early_stopping).fit, X_train, y_train)
+        accuracy = float(np.mean(model.predict(X_test) == y_test))
+        results[name] = elapsed
+        print(f"{name:<18}: {elapsed:.3f} s, epoch {model.training_summary()['epochs_run']}, akurasi uji {accuracy:.4f}")
+    print(f"Speedup           : {results['penuh'] / results['penghentian dini']:.1f}x")
+
+
+def bench_svm_solver(texts, n_iters=2000):
+    # Bandingkan SGD (penuh dan penghentian dini) dengan dual coordinate descent: waktu, loss akhir, akurasi uji
+    import contextlib
+    import io
+    import numpy as np
+    from app.module.svm import SupportVectorMachine
+    X_train, y_train, X_test, y_test = learnable_svm_data(texts)
+    configs = (('sgd penuh', dict(early_stopping=False)), ('sgd dini', dict()), ('dual_cd', dict(solver='dual_cd')))
+    timings = {}
+    for name, params in configs:
+        with contextlib.redirect_stdout(io.StringIO()):
+            model, timings[name] = timed(SupportVectorMachine(n_iters=n_iters, **params).fit, X_train, y_train)
+        accuracy = float(np.mean(model.predict(X_test) == y_test))
+        final_loss = {c: round(curve[-1], 4) for c, curve in model.training_summary()['loss_curve'].items()}
+        print(f"{name:<18}: {timings[name]:.3f} s, lintasan {model.training_summary()['epochs_run']}, loss {final_loss}, akurasi uji {accuracy:.4f}")
+    print(f"dual_cd vs sgd    : {timings['sgd penuh'] / timings['dual_cd']:.1f}x (penuh), {timings['sgd dini'] / timings['dual_cd']:.1f}x (dini)")
+
+
+def bench_svm_jobs(texts, n_iters=200):
+    # Bandingkan pelatihan SVM serial (semua kelas dalam satu proses) dengan satu proses per kelas
+    import contextlib
+    import io
+    import numpy as np
+    from app.module.svm import SupportVectorMachine
+    X, y = make_svm_data(texts)
+    models, timings = {}, {}
+    for n_jobs in (1, 3):
+        with contextlib.redirect_stdout(io.StringIO()):
+            models[n_jobs], timings[n_jobs] = timed(SupportVectorMachine(n_iters=n_iters, early_stopping=False, n_jobs=n_jobs).fit, X, y)
+    identical = all(np.array_equal(models[1].w[c], models[3].w[c]) for c in models[1].classes_)
+    print(f"Data              : {X.shape[0]} x {X.shape[1]}, epoch: {n_iters}, CPU: {os.cpu_count()}")
+    print(f"Serial            : {timings[1]:.3f} s")
+    print(f"3 proses          : {timings[3]:.3f} s ({timings[1] / timings[3]:.2f}x), identik: {identical}")
+    return identical
+
+
+def bench_svm_predict(texts, n_iters=20):
+    # Bandingkan skor per kelas (satu dot per kelas, layout dict lama) dengan satu X @ W + b
+    import contextlib
+    import io
+    import numpy as np
+    from app.module.svm import SupportVectorMachine
+    X, y = make_svm_data(texts)
+    with contextlib.redirect_stdout(io.StringIO()):
+        model = SupportVectorMachine(n_iters=n_iters).fit(X, y)
+    w, b = model.w, model.b
+
+    def legacy_scores(X_input):
+        return np.column_stack([X_input.dot(w[c]) + b[c] for c in model.classes_])
+
+    single = X[:1]
+    repeats = 2000
+    _, t_legacy_single = timed(lambda: [legacy_scores(single) for _ in range(repeats)])
+    _, t_stacked_single = timed(lambda: [model.decision_function(single) for _ in range(repeats)])
+    legacy, t_legacy_bulk = timed(legacy_scores, X)
+    stacked, t_stacked_bulk = timed(model.decision_function, X)
+    print(f"Satu teks (x{repeats}) : lama {t_legacy_single * 1e6 / repeats:.1f} us, bertumpuk {t_stacked_single * 1e6 / repeats:.1f} us")
+    print(f"Massal ({X.shape[0]})    : lama {t_legacy_bulk * 1e3:.2f} ms, bertumpuk {t_stacked_bulk * 1e3:.2f} ms")
+    print(f"Selisih skor       : {np.abs(legacy - stacked).max():.2e}")
+
+
+def bench_nb(texts):
+    # Bandingkan fit Naive Bayes per kelas (X[y == kelas]) dengan satu perkalian Y.T @ X, termasuk puncak memori
+    import tracemalloc
+    import numpy as np
+    from app.module.naive_bayes import MultinomialNaiveBayesClassifier
+    from tests.test_naive_bayes import reference_fit
+    X, y = make_svm_data(texts)
+    X = X.multiply(20).floor().tocsr()  # Bobot bulat mirip frekuensi
+    results = {}
+    for name, fit in (('per kelas (lama)', lambda: reference_fit(MultinomialNaiveBayesClassifier(), X, y)),
+                      ('Y.T @ X', lambda: MultinomialNaiveBayesClassifier().fit(X, y))):
+        tracemalloc.start()
+        results[name], elapsed = timed(fit)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"{name:<18}: {elapsed:.3f} s, puncak memori {peak / 1e6:.1f} MB")
+    legacy, fast = results.values()
+    identical = bool(np.all(legacy.predict(X) == fast.predict(X)))
+    print(f"Data              : {X.shape[0]} x {X.shape[1]}, prediksi identik: {identical}")
+    return identical
+
+
+def bench_nb_incremental(texts, daily=500):
+    # Bandingkan melatih ulang NB dari awal dengan partial_fit untuk data harian baru, dan fit per shard + merge
+    import numpy as np
+    from app.module.naive_bayes import MultinomialNaiveBayesClassifier
+    X, y = make_svm_data(texts)
+    X = X.multiply(20).floor().tocsr()  # Bobot bulat mirip frekuensi
+    X_base, y_base, X_day, y_day = X[:-daily], y[:-daily], X[-daily:], y[-daily:]
+    base = MultinomialNaiveBayesClassifier().fit(X_base, y_base)
+    full, t_full = timed(MultinomialNaiveBayesClassifier().fit, X, y)
+    incremental, t_partial = timed(base.partial_fit, X_day, y_day)
+    shards, t_shards = timed(lambda: [MultinomialNaiveBayesClassifier().fit(X[i:i + 10000], y[i:i + 10000]) for i in range(0, X.shape[0], 10000)])
+    merged, t_merge = timed(MultinomialNaiveBayesClassifier.merge, shards)
+    same = bool(np.all(incremental.predict(X) == full.predict(X)) and np.all(merged.predict(X) == full.predict(X)))
+    print(f"Data              : {X.shape[0]} x {X.shape[1]}, data harian: {daily}")
+    print(f"Latih ulang penuh : {t_full * 1e3:.1f} ms")
+    print(f"partial_fit harian: {t_partial * 1e3:.1f} ms ({t_full / t_partial:.0f}x)")
+    print(f"{len(shards)} shard + merge   : {t_shards * 1e3:.1f} ms + {t_merge * 1e3:.1f} ms, prediksi identik: {same}")
+    return same
+
+
+BENCHMARKS = {
+    'slang': bench_slang,
+    'clean': bench_clean,
+    'tfidf': bench_tfidf,
+    'tfidf_hash': bench_tfidf_hash,
+    'tfidf_fit': bench_tfidf_fit,
+    'tfidf_reuse': bench_tfidf_reuse,
+    'stem': bench_stem,
+    'batch': bench_batch,
+    'upsert': bench_upsert,
+    'label': bench_label,
+    'nb': bench_nb,
+    'nb_incremental': bench_nb_incremental,
+    'svm': bench_svm,
+    'svm_early': bench_svm_early,
+    'svm_jobs': bench_svm_jobs,
+    'svm_solver': bench_svm_solver,
+    'svm_predict': bench_svm_predict,
+}
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark pipeline analisis sentimen.')
+    parser.add_argument('target', choices=sorted(BENCHMARKS))
+    parser.add_argument('--csv', help='CSV dataset dengan kolom full_text (default: korpus sintetis)')
+    parser.add_argument('--n', type=int, default=5000, help='Jumlah dokumen')
+    parser.add_argument('--database', help='URL database untuk benchmark penyimpanan (default: SQLite in-memory)')
+    parser.add_argument('--iters', type=int, help='Jumlah epoch untuk benchmark SVM (default: 20 untuk svm, 200 untuk svm_jobs, 2000 untuk svm_early/svm_solver)')
+    args = parser.parse_args()
+    kwargs = {}
+    if args.target in ('upsert', 'label'):
+        kwargs['database_url'] = args.database
+    elif args.target.startswith('svm'):
+        if args.iters:
+            kwargs['n_iters'] = args.iters
+    ok = BENCHMARKS[args.target](load_corpus(args.csv, args.n), **kwargs)
+    sys.exit(0 if ok is not False else 1)
@@ -23,6 +23,22 @@ class Config:
     TFIDF_MAX_DF_RATIO = 0.85
     # Menggunakan unigram, bigram, dan trigram untuk menangkap frasa yang lebih panjang.
     TFIDF_NGRAM_RANGE = (1, 2)
+    # Jumlah bucket untuk mode hashing (feature hashing) TF-IDF; None = mode kamus biasa.
+    # Mode hashing membatasi memori fit dan ukuran pickle vectorizer pada korpus besar (contoh: 2 ** 16).
+    TFIDF_HASH_BUCKETS = None
+    # Jumlah proses untuk fit TF-IDF paralel (None = semua CPU); korpus kecil tetap diproses serial.
+    TFIDF_N_JOBS = None
+    # Jumlah proses untuk melatih kelas SVM one-vs-rest secara paralel (None = semua CPU, paling banyak satu per kelas).
+    # Default 1: mesin SGD serial sudah melatih semua kelas sekaligus; proses terpisah hanya menguntungkan di server multi-core.
+    SVM_N_JOBS = 1
+    # Mesin optimasi SVM: 'sgd' (mini-batch, default) atau 'dual_cd' (dual coordinate descent, konvergen dalam puluhan lintasan).
+    SVM_SOLVER = 'sgd'
+    # /api/predict: jendela waktu (ms) untuk menggabungkan permintaan bersamaan menjadi satu batch, dan ukuran batch maksimum.
+    PREDICT_BATCH_WINDOW_MS = 5
+    PREDICT_MAX_BATCH = 256
+    # Jumlah teks maksimum per permintaan /api/predict dan batas waktu tunggu hasil (detik).
+    API_PREDICT_MAX_TEXTS = 1000
+    API_PREDICT_TIMEOUT = 30
     # Definisikan nama folder relatif terhadap BASE_DIR (ada di root proyek)
    
     MODEL_FOLDER_NAME = 'model'
@@ -40,6 +56,9 @@ class Config:
     SLANGWORDS_JSON_PATH = os.path.join(BASE_DIR, 'app', 'module', 'slangwords.json') # Pastikan nama file ini benar
     PREPROCESSING_JSON_PATH = SLANGWORDS_JSON_PATH
 
+    # Cache stemming persisten (SQLite) yang dipakai bersama oleh worker preprocessing
+    STEM_CACHE_PATH = os.path.join(KAMUS_FOLDER_PATH, 'stem_cache.sqlite')
+
     # Default items per page untuk pagination
     PER_PAGE = 10
 
@@ -0,0 +1,37 @@
+# /Tugas Akhir 1.3 NB + svm/score.py
+# Penilaian massal seluruh tabel Preprocessing dengan model NB/SVM tersimpan; hasil ditulis ke tabel prediksi_batch.
+# Contoh:
+#   python score.py
+#   python score.py --model SVM --source pakar --chunk-size 5000
+
+import argparse
+import os
+import sys
+
+project_root = os.path.dirname(os.path.abspath(__file__))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from app import create_app
+from app.module.batch_scoring import SCORING_CHUNK_SIZE, score_preprocessing
+from app.module.model_registry import MODEL_FILES, LABEL_SOURCES, get_model_registry
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Penilaian massal tabel Preprocessing dengan model tersimpan.')
+    parser.add_argument('--model', choices=sorted(MODEL_FILES), help='Model yang dipakai (default: semua)')
+    parser.add_argument('--source', choices=LABEL_SOURCES, help='Sumber label model (default: semua)')
+    parser.add_argument('--chunk-size', type=int, default=SCORING_CHUNK_SIZE, help='Jumlah baris per potongan')
+    args = parser.parse_args()
+
+    app = create_app(os.getenv('FLASK_CONFIG') or 'default')
+    failed = False
+    with app.app_context():
+        for model_name in ([args.model] if args.model else sorted(MODEL_FILES)):
+            for source in ([args.source] if args.source else LABEL_SOURCES):
+                try:
+                    result = score_preprocessing(get_model_registry(), model_name, source, args.chunk_size)
+                    print(f"[Scoring] {model_name} ({source}): {result['rows']} rows in {result['seconds']:.2f} s ({result['rows_per_sec']:.0f} rows/sec).")
+                except FileNotFoundError as e:  # Model untuk kombinasi ini belum dilatih
+                    print(f"[Scoring] Lewati {model_name} ({source}): {e}")
+                    failed = failed or bool(args.model and args.source)
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,48 @@
+import os
+import pickle
+
+import pytest
+from flask import Flask
+
+from app.models import db
+from app.module.label_stats import LabelStatsService
+from app.module.naive_bayes import MultinomialNaiveBayesClassifier
+from app.module.tfidf_vectorizer import CustomTfidf
+
+MODEL_TEXTS = ['kerja bagus gaji besar', 'pajak jelek gaji kecil', 'kabur luar negeri', 'senang kerja luar negeri', 'sedih pajak naik']
+MODEL_LABELS = ['positif', 'negatif', 'netral', 'positif', 'negatif']
+
+
+def _save_models(folder, labels=MODEL_LABELS, source='otomatis'):
+    # Latih dan simpan model NB + vectorizer dengan tata letak folder model aplikasi
+    vectorizer = CustomTfidf(min_df=1)
+    model = MultinomialNaiveBayesClassifier().fit(vectorizer.fit_transform(MODEL_TEXTS, normalize=False), labels)
+    os.makedirs(os.path.join(folder, 'nb'), exist_ok=True)
+    with open(os.path.join(folder, 'nb', f'naive_bayes_model_{source}.pkl'), 'wb') as f:
+        pickle.dump(model, f)
+    with open(os.path.join(folder, f'tfidf_vectorizer_{source}.pkl'), 'wb') as f:
+        pickle.dump(vectorizer, f)
+    return model, vectorizer
+
+
+@pytest.fixture
+def model_texts():
+    return list(MODEL_TEXTS)
+
+
+@pytest.fixture
+def save_models():
+    return _save_models
+
+
+@pytest.fixture
+def sqlite_app():
+    # Aplikasi Flask minimal dengan database SQLite di memori
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    db.init_app(app)
+    app.extensions['label_stats'] = LabelStatsService()
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
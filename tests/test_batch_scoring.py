@@ -0,0 +1,44 @@
+import pytest
+
+from app.models import db, Preprocessing, PrediksiBatch
+from app.module import tfidf_vectorizer
+from app.module.batch_scoring import score_preprocessing
+from app.module.model_registry import ModelRegistry
+
+
+@pytest.fixture
+def scored_table(sqlite_app, model_texts):
+    texts = [model_texts[i % len(model_texts)] for i in range(1200)] + ['', None]
+    db.session.bulk_insert_mappings(Preprocessing, [{'full_text': f'teks {i}', 'text_stem': text} for i, text in enumerate(texts)])
+    db.session.commit()
+    return sqlite_app
+
+
+def test_scores_every_stemmed_row(scored_table, tmp_path, save_models):
+    model, vectorizer = save_models(str(tmp_path))
+    tfidf_vectorizer.clear_corpus_cache()
+    result = score_preprocessing(ModelRegistry(str(tmp_path)), 'Naive Bayes', 'otomatis')
+    assert result['rows'] == 1200
+    assert len(tfidf_vectorizer._corpus_cache) == 0  # Potongan penilaian tidak masuk cache korpus
+
+    rows = db.session.execute(
+        db.select(Preprocessing.text_stem, PrediksiBatch.label_prediksi, PrediksiBatch.label_source)
+        .join(Preprocessing, Preprocessing.id == PrediksiBatch.preprocessing_id)
+        .where(PrediksiBatch.model_name == 'Naive Bayes')
+    ).all()
+    assert len(rows) == 1200
+    expected = dict(zip([row.text_stem for row in rows],
+                        model.predict(vectorizer.transform([row.text_stem for row in rows], normalize=False))))
+    assert all(label == expected[stem] and source == 'otomatis' for stem, label, source in rows)
+
+    score_preprocessing(ModelRegistry(str(tmp_path)), 'Naive Bayes', 'otomatis', chunk_size=500)  # Penilaian ulang mengganti hasil lama
+    assert PrediksiBatch.query.count() == 1200
+
+
+def test_missing_model_keeps_previous_results(scored_table, tmp_path, save_models):
+    save_models(str(tmp_path))
+    registry = ModelRegistry(str(tmp_path))
+    score_preprocessing(registry, 'Naive Bayes', 'otomatis')
+    with pytest.raises(FileNotFoundError):
+        score_preprocessing(registry, 'Naive Bayes', 'pakar')
+    assert PrediksiBatch.query.count() == 1200
@@ -0,0 +1,34 @@
+import random
+
+from app.module.preprocessing import clean_text_by_stages, clean_text_pipeline
+
+GOLDEN = [
+    '',
+    '   ',
+    'RT @user: #KaburAjaDulu dulu ah!!! https://t.co/abc123 😀😀',
+    'Kabur   aja   dulu, gen z >= 10 tahun <5 orang > 3 <= 7',
+    'email saya a.b@mail.co.id atau cek www.instagram.com/akun ya',
+    'x@https://t.co/abcdomain.com user@ @ @_a',
+    '#kabur aja dulu #gen z #kaburajadulunya #KaburinDuitDulu #KaburSelamanya',
+    'ibu/bapak dan A / B serta /x y/ a//b',
+    '&amp; &lt;3 &gt;= 5 &nbsp;spasi nbsp – — … selesai',
+    'Hebaaaat sekaliii!!! ?? wkwkwkwk mantap mantap mantap',
+    'angka 123abc 4,5 ٣ CJK 中文 한국어 café naïve',
+    'teks—dengan…simbol ~`^*()[]{}|\\ <> => =< lagi lagi',
+    'rtx RT rt Rt art RT:',
+    'İstanbul ŞEHİR ß Straße',
+]
+
+
+def test_golden_corpus_identical():
+    for text in GOLDEN:
+        assert clean_text_pipeline(text) == clean_text_by_stages(text), text
+
+
+def test_random_corpus_identical():
+    rng = random.Random(0)
+    pieces = ['kabur', 'aja', 'dulu', '#kaburajadulu', 'gen', 'z', '>=', '<', '>', '5', '12', '/', '@u', 'a@b.com',
+              'https://t.co/x', 'RT', 'aaa', '!!', '?', '&amp;', ' ', '…', '😀', '中', 'é', '_', '-', 'x', 'x']
+    for _ in range(3000):
+        text = ''.join(rng.choice(pieces) + rng.choice(['', ' ', '  ', '\n']) for _ in range(rng.randint(1, 15)))
+        assert clean_text_pipeline(text) == clean_text_by_stages(text), repr(text)
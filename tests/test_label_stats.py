@@ -0,0 +1,62 @@
+import pytest
+
+from app.models import db, Preprocessing, DataPakar, KlasifikasiNB
+from app.module.label_stats import count_by_label, get_label_stats
+from app.module.labelling import count_labels
+
+
+@pytest.fixture
+def app(sqlite_app):
+    db.session.add_all([
+        Preprocessing(full_text='a', text_stem='a', label_otomatis='positif'),
+        Preprocessing(full_text='b', text_stem='b', label_otomatis='negatif'),
+        Preprocessing(full_text='c', text_stem='c', label_otomatis=None),
+        Preprocessing(full_text='d', text_stem='', label_otomatis=None),
+        Preprocessing(full_text='e', text_stem=None, label_otomatis='netral'),
+        DataPakar(full_text='a', label='positif'),
+        DataPakar(full_text='b', label='positif'),
+        DataPakar(full_text='c', label='netral'),
+    ])
+    db.session.commit()
+    return sqlite_app
+
+
+def reference_stats():
+    # Hitungan COUNT terpisah seperti halaman label sebelumnya
+    stemmed = Preprocessing.query.filter(Preprocessing.text_stem.isnot(None), Preprocessing.text_stem != '')
+    return {
+        'total_data': Preprocessing.query.count(),
+        'total_data_for_labeling': stemmed.count(),
+        'total_unlabeled': stemmed.filter(Preprocessing.label_otomatis.is_(None)).count(),
+        'otomatis': {label: Preprocessing.query.filter_by(label_otomatis=label).count() for label in ('positif', 'negatif', 'netral')},
+        'pakar': {label: DataPakar.query.filter_by(label=label).count() for label in ('positif', 'negatif', 'netral')},
+        'total_pakar_data': DataPakar.query.filter(DataPakar.label.isnot(None)).count(),
+    }
+
+
+def as_dict(stats):
+    return {key: dict(value) if key in ('otomatis', 'pakar') else value for key, value in stats.items()}
+
+
+def test_stats_match_separate_counts(app):
+    assert as_dict(get_label_stats().get()) == reference_stats()
+    assert count_labels() == (5, 1, 1, 1)
+
+
+def test_stats_cached_until_invalidated(app):
+    service = get_label_stats()
+    first = service.get()
+    Preprocessing.query.filter_by(full_text='c').update({Preprocessing.label_otomatis: 'netral'})
+    db.session.commit()
+    assert service.get() is first
+    assert service.computations == 1
+    service.invalidate()
+    assert as_dict(service.get()) == reference_stats()
+    assert service.get()['total_unlabeled'] == 0
+    assert service.computations == 2
+
+
+def test_count_by_label(app):
+    db.session.add_all([KlasifikasiNB(full_text=str(i), label_prediksi=label, model_name='nb') for i, label in enumerate(['positif', 'positif', 'netral'])])
+    db.session.commit()
+    assert count_by_label(KlasifikasiNB.label_prediksi) == {'positif': 2, 'netral': 1}
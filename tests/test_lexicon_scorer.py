@@ -0,0 +1,152 @@
+import os
+import random
+
+import numpy as np
+
+from app.models import db, Preprocessing
+from app.module.labelling import (NEGATION_SCOPE, NEGATION_WORDS, LexiconScorer, LexiconService, auto_label_preprocessing,
+                                  decode_lexicon_terms, sentiment_analysis_lexicon)
+from app.module.preprocessing import preprocess_texts_batch
+from app.module.preprocessing_store import upsert_preprocessing_rows
+
+SLANGWORDS_PATH = os.path.join(os.path.dirname(__file__), '..', 'app', 'module', 'slangwords.json')
+
+POSITIVE = {'bagus': 3, 'senang': 2, 'mantap': 4, 'lumayan': 1}
+NEGATIVE = {'jelek': -3, 'sedih': -2, 'lumayan': -2, 'kabur': -1}
+PHRASE_POSITIVE = dict(POSITIVE, **{'kasih sayang': 5, 'bukan main': 4, 'tidak segan': 2, 'kerja keras sekali': 3})
+PHRASE_NEGATIVE = dict(NEGATIVE, **{'tidak': -5, 'kurang': -3, 'kurang ajar': -5, 'kerja keras': -1})
+
+
+def reference_analyze(text, positive, negative):
+    # Satu dokumen, loop per token: kecocokan terpanjang kiri ke kanan, lalu negasi membalik kecocokan berikutnya
+    entries = {}
+    for lexicon in (positive, negative):
+        for word, weight in lexicon.items():
+            entries[tuple(word.split())] = entries.get(tuple(word.split()), 0) + weight
+    longest = max(map(len, entries))
+    tokens, events, i = text.lower().split(), [], 0
+    while i < len(tokens):
+        for size in range(min(longest, len(tokens) - i), 0, -1):
+            if tuple(tokens[i:i + size]) in entries:
+                events.append([i, i + size, entries[tuple(tokens[i:i + size])], True])
+                i += size
+                break
+        else:
+            if tokens[i] in NEGATION_WORDS:
+                events.append([i, i + 1, 0, False])
+            i += 1
+    applies = [end - start == 1 and tokens[start] in NEGATION_WORDS and k + 1 < len(events) and events[k + 1][0] - end < NEGATION_SCOPE
+               for k, (start, end, _, _) in enumerate(events)]
+    return sum((0 if applies[k] else weight) * (-1 if k and applies[k - 1] else 1)
+               for k, (_, _, weight, real) in enumerate(events) if real)
+
+
+def test_scores_match_per_text_lexicon():
+    rng = random.Random(0)
+    words = list(POSITIVE) + list(NEGATIVE) + ['kerja', 'Bagus', 'JELEK', 'gaji']
+    texts = [' '.join(rng.choice(words) for _ in range(rng.randint(0, 12))) for _ in range(500)] + ['', '  ', None]
+    scores, polarities = LexiconScorer(POSITIVE, NEGATIVE).score_texts(texts)
+    expected = [sentiment_analysis_lexicon(text or '', POSITIVE, NEGATIVE) for text in texts]
+    np.testing.assert_array_equal(scores, [score for score, _ in expected])
+    assert list(polarities) == [polarity for _, polarity in expected]
+
+
+def test_separator_inside_text_falls_back_to_per_document():
+    texts = ['bagus \x00 jelek', 'senang\x00', 'kabur']
+    scores, _ = LexiconScorer(POSITIVE, NEGATIVE).score_texts(texts)
+    np.testing.assert_array_equal(scores, [sentiment_analysis_lexicon(text, POSITIVE, NEGATIVE)[0] for text in texts])
+
+
+def test_empty_inputs():
+    scorer = LexiconScorer({}, {})
+    assert not scorer
+    scores, polarities = scorer.score_texts(['bagus sekali'])
+    assert list(scores) == [0] and list(polarities) == ['netral']
+    assert len(LexiconScorer(POSITIVE, NEGATIVE).score_texts([])[0]) == 0
+
+
+def write_lexicon(path, entries):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('word;weight\n' + ''.join(f'{word};{weight}\n' for word, weight in entries.items()))
+
+
+def test_service_parses_once_and_reloads_on_change(tmp_path):
+    write_lexicon(tmp_path / 'positive.csv', POSITIVE)
+    write_lexicon(tmp_path / 'negative.csv', NEGATIVE)
+    service = LexiconService(str(tmp_path))
+    scorer = service.scorer()
+    assert service.scorer() is scorer and service.disk_loads == 1
+    assert dict(scorer.positive_lexicon) == POSITIVE
+    write_lexicon(tmp_path / 'negative.csv', {'bagus': -10})
+    stat = os.stat(tmp_path / 'negative.csv')
+    os.utime(tmp_path / 'negative.csv', ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert list(service.scorer().score_texts(['bagus'])[0]) == [-7]
+    assert service.disk_loads == 2
+
+
+def test_service_missing_files_give_empty_scorer(tmp_path):
+    assert not LexiconService(str(tmp_path)).scorer()
+
+
+def test_phrase_and_negation_match_reference():
+    rng = random.Random(1)
+    words = ['bagus', 'senang', 'jelek', 'kasih', 'sayang', 'bukan', 'main', 'tidak', 'tak', 'segan', 'kurang', 'ajar',
+             'kerja', 'keras', 'sekali', 'gaji', 'pajak']
+    texts = [' '.join(rng.choice(words) for _ in range(rng.randint(0, 12))) for _ in range(2000)]
+    scores, _ = LexiconScorer(PHRASE_POSITIVE, PHRASE_NEGATIVE).score_texts(texts)
+    np.testing.assert_array_equal(scores, [reference_analyze(text, PHRASE_POSITIVE, PHRASE_NEGATIVE) for text in texts])
+
+
+def test_legacy_mode_ignores_phrases_and_negation():
+    texts = ['tidak bagus', 'kasih sayang', 'kurang ajar sekali', 'bukan main senang']
+    scores, _ = LexiconScorer(PHRASE_POSITIVE, PHRASE_NEGATIVE, phrases=False, negation=False).score_texts(texts)
+    np.testing.assert_array_equal(scores, [sentiment_analysis_lexicon(text, PHRASE_POSITIVE, PHRASE_NEGATIVE)[0] for text in texts])
+
+
+def test_analyze_returns_spans():
+    scores, polarities, spans = LexiconScorer(PHRASE_POSITIVE, PHRASE_NEGATIVE).analyze(['kasih sayang tidak gaji bagus', 'tidak', ''])
+    assert list(scores) == [2, -5, 0]
+    assert list(polarities) == ['positif', 'negatif', 'netral']
+    assert spans[0] == [
+        {'term': 'kasih sayang', 'start': 0, 'end': 2, 'weight': 5, 'negated': False},
+        {'term': 'tidak', 'start': 2, 'end': 3, 'weight': 0, 'negated': False},
+        {'term': 'bagus', 'start': 4, 'end': 5, 'weight': -3, 'negated': True},
+    ]
+    assert spans[1] == [{'term': 'tidak', 'start': 0, 'end': 1, 'weight': -5, 'negated': False}]
+    assert spans[2] == []
+
+
+def test_analyze_json_round_trips_spans():
+    texts = ['kasih sayang tidak gaji bagus', '', 'kurang ajar "sekali"', 'tak senang']
+    scorer = LexiconScorer(PHRASE_POSITIVE, PHRASE_NEGATIVE)
+    scores, polarities, spans = scorer.analyze(texts)
+    json_scores, json_polarities, terms = scorer.analyze_json(texts)
+    np.testing.assert_array_equal(json_scores, scores)
+    assert list(json_polarities) == list(polarities)
+    for stored, doc_spans in zip(terms, spans):
+        assert decode_lexicon_terms(stored) == [{key: span[key] for key in ('term', 'weight', 'negated')} for span in doc_spans]
+
+
+def test_negation_survives_real_pipeline(sqlite_app):
+    texts = ['tidak bagus pemerintah jelek', 'Gak segan buat kabur', 'Pemerintahnya bagus']
+    rows = preprocess_texts_batch([{'full_text': text} for text in texts], SLANGWORDS_PATH, max_workers=1)
+    upsert_preprocessing_rows(rows, {})
+    db.session.commit()
+    assert auto_label_preprocessing(LexiconScorer(PHRASE_POSITIVE, PHRASE_NEGATIVE)) == 3
+    db.session.commit()
+    stored = {row.full_text: row for row in Preprocessing.query}
+
+    first = stored['tidak bagus pemerintah jelek']
+    assert first.text_stem == 'tidak bagus perintah jelek'
+    assert decode_lexicon_terms(first.lexicon_terms) == [
+        {'term': 'tidak', 'weight': 0, 'negated': False},
+        {'term': 'bagus', 'weight': -3, 'negated': True},
+        {'term': 'jelek', 'weight': -3, 'negated': False},
+    ]
+    assert (first.lexicon_score, first.label_otomatis) == (-6, 'negatif')
+
+    second = stored['Gak segan buat kabur']  # Slang 'gak' -> 'tidak', lalu frasa 'tidak segan' cocok
+    assert [term['term'] for term in decode_lexicon_terms(second.lexicon_terms)] == ['tidak segan', 'kabur']
+    assert second.lexicon_score == 1
+    assert stored['Pemerintahnya bagus'].label_otomatis == 'positif'
+
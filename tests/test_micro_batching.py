@@ -0,0 +1,34 @@
+import threading
+
+import numpy as np
+import pytest
+
+from app.module.micro_batching import MicroBatcher
+from app.module.model_registry import ModelRegistry
+
+
+def test_concurrent_requests_are_coalesced(tmp_path, save_models, model_texts):
+    save_models(str(tmp_path))
+    registry = ModelRegistry(str(tmp_path))
+    batcher = MicroBatcher(registry, window_ms=50)
+    results = {}
+
+    def request(i):
+        results[i] = batcher.submit('Naive Bayes', 'otomatis', [model_texts[i % len(model_texts)]]).result(timeout=10)
+
+    threads = [threading.Thread(target=request, args=(i,)) for i in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert batcher.batches_run < 20
+    classes, expected = registry.predict_proba_texts('Naive Bayes', 'otomatis', model_texts)
+    for i, (got_classes, proba) in results.items():
+        np.testing.assert_array_equal(got_classes, classes)
+        np.testing.assert_allclose(proba, expected[[i % len(model_texts)]])
+
+
+def test_missing_model_error_reaches_caller(tmp_path):
+    batcher = MicroBatcher(ModelRegistry(str(tmp_path)), window_ms=1)
+    with pytest.raises(FileNotFoundError):
+        batcher.submit('SVM', 'pakar', ['kerja bagus']).result(timeout=10)
@@ -0,0 +1,41 @@
+import os
+
+import numpy as np
+import pytest
+
+from app.module.model_registry import ModelRegistry
+
+
+def test_predict_texts_loads_once_and_matches_model(tmp_path, save_models, model_texts):
+    model, vectorizer = save_models(str(tmp_path))
+    registry = ModelRegistry(str(tmp_path))
+    for _ in range(3):
+        labels, scores = registry.predict_texts('Naive Bayes', 'otomatis', model_texts)
+    assert registry.disk_loads == 2
+    X = vectorizer.transform(model_texts, normalize=False)
+    np.testing.assert_array_equal(labels, model.predict(X))
+    np.testing.assert_allclose(scores, model.predict_proba(X).max(axis=1))
+
+
+def test_reloads_after_retraining(tmp_path, save_models, model_texts):
+    registry = ModelRegistry(str(tmp_path))
+    save_models(str(tmp_path))
+    first, _ = registry.get('Naive Bayes', 'otomatis')
+    model_path = os.path.join(str(tmp_path), 'nb', 'naive_bayes_model_otomatis.pkl')
+    save_models(str(tmp_path), labels=['netral'] * len(model_texts))
+    stat = os.stat(model_path)
+    os.utime(model_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))  # Pastikan mtime berubah di filesystem kasar
+    second, _ = registry.get('Naive Bayes', 'otomatis')
+    assert second is not first
+    assert list(second.classes_) == ['netral']
+
+
+def test_missing_model_raises(tmp_path, save_models):
+    save_models(str(tmp_path))
+    registry = ModelRegistry(str(tmp_path))
+    with pytest.raises(FileNotFoundError):
+        registry.get('Naive Bayes', 'pakar')
+    with pytest.raises(FileNotFoundError):
+        registry.get('SVM', 'otomatis')
+    with pytest.raises(ValueError):
+        registry.get('KNN', 'otomatis')
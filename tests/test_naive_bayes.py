@@ -0,0 +1,74 @@
+import math
+
+import numpy as np
+import pytest
+import scipy.sparse as sp
+
+from app.module.naive_bayes import MultinomialNaiveBayesClassifier
+
+
+def reference_fit(model, X, y):
+    # Pelatihan lama: X disalin per kelas lewat X[y == kelas]
+    y = np.asarray(y)
+    model.classes_ = np.unique(y)
+    model.n_features_ = X.shape[1]
+    model.class_priors_ = np.zeros(len(model.classes_))
+    counts = np.zeros((len(model.classes_), X.shape[1]))
+    for i, current_class in enumerate(model.classes_):
+        X_class = X[y == current_class]
+        model.class_priors_[i] = math.log(X_class.shape[0] / X.shape[0])
+        counts[i, :] = X_class.sum(axis=0)
+    model.feature_log_prob_ = np.log(counts + model.alpha) - np.log(counts.sum(axis=1)[:, np.newaxis] + model.alpha * X.shape[1])
+    return model
+
+
+def synthetic_data(n=500, n_features=80, seed=0):
+    rng = np.random.RandomState(seed)
+    X = sp.random(n, n_features, density=0.1, format='csr', random_state=rng, data_rvs=lambda k: rng.randint(1, 4, k))
+    y = np.array(['positif', 'negatif', 'netral'])[rng.randint(0, 3, n)]
+    return X, y
+
+
+def test_fit_matches_per_class_reference():
+    X, y = synthetic_data()
+    model = MultinomialNaiveBayesClassifier(alpha=0.5).fit(X, list(y))
+    reference = reference_fit(MultinomialNaiveBayesClassifier(alpha=0.5), X, y)
+    np.testing.assert_array_equal(model.classes_, reference.classes_)
+    np.testing.assert_allclose(model.class_priors_, reference.class_priors_, rtol=1e-15)
+    np.testing.assert_allclose(model.feature_log_prob_, reference.feature_log_prob_, rtol=1e-12)
+    X_new, _ = synthetic_data(n=200, seed=1)
+    np.testing.assert_array_equal(model.predict(X_new), reference.predict(X_new))
+    np.testing.assert_allclose(model.predict_proba(X_new), reference.predict_proba(X_new), rtol=1e-10)
+
+
+def test_partial_fit_batches_match_full_fit():
+    X, y = synthetic_data()
+    full = MultinomialNaiveBayesClassifier().fit(X, y)
+    incremental = MultinomialNaiveBayesClassifier()
+    for start in range(0, X.shape[0], 120):
+        incremental.partial_fit(X[start:start + 120], y[start:start + 120], classes=['positif', 'negatif', 'netral'])
+    np.testing.assert_allclose(incremental.feature_count_, full.feature_count_)
+    np.testing.assert_allclose(incremental.feature_log_prob_, full.feature_log_prob_, rtol=1e-12)
+    np.testing.assert_allclose(incremental.class_priors_, full.class_priors_, rtol=1e-12)
+
+
+def test_partial_fit_requires_classes_and_rejects_unknown_labels():
+    X, y = synthetic_data(n=30)
+    model = MultinomialNaiveBayesClassifier()
+    with pytest.raises(ValueError):
+        model.partial_fit(X, y)
+    model.partial_fit(X, y, classes=['positif', 'negatif', 'netral'])
+    with pytest.raises(ValueError):
+        model.partial_fit(X[:2], np.array(['positif', 'lainnya']))
+
+
+def test_merge_shards_matches_full_fit():
+    X, y = synthetic_data()
+    full = MultinomialNaiveBayesClassifier().fit(X, y)
+    shards = [MultinomialNaiveBayesClassifier().fit(X[i:i + 200], y[i:i + 200]) for i in range(0, X.shape[0], 200)]
+    merged = MultinomialNaiveBayesClassifier.merge(shards)
+    np.testing.assert_array_equal(merged.classes_, full.classes_)
+    np.testing.assert_allclose(merged.feature_log_prob_, full.feature_log_prob_, rtol=1e-12)
+    np.testing.assert_array_equal(merged.predict(X), full.predict(X))
+    partial = MultinomialNaiveBayesClassifier().fit(X[:50][y[:50] != 'netral'], y[:50][y[:50] != 'netral'])
+    assert list(MultinomialNaiveBayesClassifier.merge([partial, full]).classes_) == list(full.classes_)
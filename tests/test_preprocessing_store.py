@@ -0,0 +1,105 @@
+import os
+
+import pytest
+
+from app.models import db, Dataset, Preprocessing, PreprocessingSkip
+from app.module.preprocessing_store import load_existing_preprocessing, relink_dataset_ids, upsert_preprocessing_rows
+from app.routes import preprocessing_routes
+from app.routes.preprocessing_routes import preprocessing_bp
+
+SLANGWORDS_PATH = os.path.join(os.path.dirname(__file__), '..', 'app', 'module', 'slangwords.json')
+
+
+@pytest.fixture
+def app(sqlite_app, tmp_path, monkeypatch):
+    sqlite_app.config.update(SECRET_KEY='test', SLANGWORDS_JSON_PATH=SLANGWORDS_PATH,
+                             STEM_CACHE_PATH=str(tmp_path / 'stem_cache.sqlite'))
+    sqlite_app.register_blueprint(preprocessing_bp, url_prefix='/preprocessing')
+    sqlite_app.processed_batches = []
+    real_workflow = preprocessing_routes.iter_preprocess_workflow
+
+    def recording_workflow(entries, slangwords_path, max_workers=None, stem_cache_path=None):
+        # Catat teks yang benar-benar dikirim ke pipeline, lalu jalankan pipeline asli
+        sqlite_app.processed_batches.append(sorted(entry.full_text for entry in entries))
+        return real_workflow(entries, slangwords_path, max_workers=1, stem_cache_path=stem_cache_path)
+
+    monkeypatch.setattr(preprocessing_routes, 'iter_preprocess_workflow', recording_workflow)
+    return sqlite_app
+
+
+def add_dataset(*texts):
+    db.session.add_all([Dataset(username='u', full_text=text, created_at='2025-01-01') for text in texts])
+    db.session.commit()
+
+
+def run_pipeline(app, **form):
+    assert app.test_client().post('/preprocessing/run', data=form).status_code == 302
+
+
+def test_unchanged_rows_are_skipped_and_appended_rows_processed(app):
+    add_dataset('Gaji di luar negeri lebih besar', 'Pajak naik terus, mending kabur')
+    run_pipeline(app)
+    assert app.processed_batches == [['Gaji di luar negeri lebih besar', 'Pajak naik terus, mending kabur']]
+    assert Preprocessing.query.count() == 2
+
+    run_pipeline(app)  # Tidak ada yang berubah: pipeline tidak dipanggil
+    assert len(app.processed_batches) == 1
+
+    add_dataset('Kerja di Jepang enak sekali')
+    run_pipeline(app)
+    assert app.processed_batches[-1] == ['Kerja di Jepang enak sekali']
+    assert Preprocessing.query.count() == 3
+
+    run_pipeline(app, full_reprocess='1')
+    assert len(app.processed_batches[-1]) == 3
+    assert Preprocessing.query.count() == 3
+
+
+def test_empty_output_is_recorded_as_skip(app):
+    add_dataset('https://t.co/abc 123', 'Kabur saja dari sini')
+    run_pipeline(app)
+    assert [row.full_text for row in Preprocessing.query] == ['Kabur saja dari sini']
+    assert PreprocessingSkip.query.count() == 1
+
+    run_pipeline(app)  # Teks kosong tidak diproses ulang
+    assert len(app.processed_batches) == 1
+
+
+def test_reuploaded_dataset_is_relinked_without_processing(app):
+    add_dataset('Kabur saja dari sini')
+    run_pipeline(app)
+    Dataset.query.delete()
+    add_dataset('Kabur saja dari sini')
+    new_id = Dataset.query.one().id
+    run_pipeline(app)
+    assert len(app.processed_batches) == 1
+    assert Preprocessing.query.one().dataset_id == new_id
+
+
+def test_update_preserves_label_and_clears_lexicon_columns(sqlite_app):
+    upsert_preprocessing_rows([{'full_text': 'gaji besar', 'text_stem': 'gaji besar'}], {})
+    db.session.commit()
+    row = Preprocessing.query.one()
+    row.label_otomatis, row.lexicon_score, row.lexicon_polarity, row.lexicon_terms = 'positif', 3, 'positif', '[["besar",3,false]]'
+    db.session.commit()
+
+    inserted, updated = upsert_preprocessing_rows(
+        [{'full_text': 'gaji besar', 'text_stem': 'gaji kecil'}, {'full_text': 'pajak naik', 'text_stem': 'pajak naik'}],
+        load_existing_preprocessing(), chunk_size=1)
+    db.session.commit()
+    assert (inserted, updated) == (1, 1)
+    row = db.session.get(Preprocessing, row.id)
+    assert row.text_stem == 'gaji kecil'
+    assert row.label_otomatis == 'positif'
+    assert (row.lexicon_score, row.lexicon_polarity, row.lexicon_terms) == (None, None, None)
+
+
+def test_relink_dataset_ids(sqlite_app):
+    add_dataset('a', 'b')
+    upsert_preprocessing_rows([{'full_text': 'a'}, {'full_text': 'b'}], {})
+    db.session.commit()
+    ids = [row.id for row in Preprocessing.query.order_by(Preprocessing.id)]
+    dataset_ids = [row.id for row in Dataset.query.order_by(Dataset.id)]
+    assert relink_dataset_ids([{'id': ids[0], 'dataset_id': dataset_ids[1]}, {'id': ids[1], 'dataset_id': dataset_ids[0]}], chunk_size=1) == 2
+    db.session.commit()
+    assert [row.dataset_id for row in Preprocessing.query.order_by(Preprocessing.id)] == dataset_ids[::-1]
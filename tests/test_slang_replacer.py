@@ -0,0 +1,44 @@
+import random
+
+import pytest
+
+from app.module.preprocessing import SlangReplacer, replace_taboo_words
+
+CASES = [
+    # Rantai: kata baku hasil penggantian cocok lagi dengan entri berikutnya
+    ({'x': 'a', 'a b': 'c'}, ['x b', 'X B x', 'a b x']),
+    ({'daah': 'dah', 'dah': 'sudah'}, ['daah deh', 'dah', 'Daah dah']),
+    ({'gk': 'ga', 'ga': 'tidak', 'tidak': 'nggak'}, ['gk mau', 'ga gk tidak']),
+    # Frasa multi-kata
+    ({'problem solving': 'pemecahan masalah', 'mr p': 'mister p', 'p': 'pe'}, ['problem solving itu', 'Mr P datang', 'mr  p p']),
+    # Entri bersimbol dan spasi di akhir kunci
+    ({'@': 'di', 'a@b': 'ab', 'ngaku"': 'mengaku', 'will be one of it ': 'akan', 'ajep-ajep': 'dugem'},
+     ['a@b @ c', 'ngaku"x', 'will be one of it x', 'malam ajep-ajep', 'ajep ajep']),
+    # Huruf besar/kecil dan nilai kosong
+    ({'learning': 'belajar', 'nya': ''}, ['Learning LEARNING learning', 'rumah nya bagus', 'nya-nya']),
+]
+
+
+@pytest.mark.parametrize('kamus,texts', CASES)
+def test_replace_matches_sequential(kamus, texts):
+    replacer = SlangReplacer(kamus)
+    for text in texts:
+        assert replacer.replace(text) == replace_taboo_words(text, kamus)
+
+
+def test_replace_matches_sequential_random_dictionary():
+    rng = random.Random(0)
+    words = ['a', 'b', 'c', 'ab', 'ba', 'abc', 'x', 'y']
+    for _ in range(200):
+        kamus = {}
+        for _ in range(rng.randint(1, 8)):
+            key = ' '.join(rng.choice(words) for _ in range(rng.randint(1, 2)))
+            kamus[key] = ' '.join(rng.choice(words) for _ in range(rng.randint(0, 2)))
+        replacer = SlangReplacer(kamus)
+        for _ in range(20):
+            text = ''.join(rng.choice(words) + rng.choice([' ', ' ', '-', ', ']) for _ in range(rng.randint(1, 8)))
+            assert replacer.replace(text) == replace_taboo_words(text, kamus)
+
+
+def test_empty_dictionary_returns_text():
+    assert SlangReplacer({}).replace('gk tau') == 'gk tau'
@@ -0,0 +1,59 @@
+import os
+
+import pytest
+
+from app.module import preprocessing
+from app.module.preprocessing import load_stem_cache, preprocess_texts_batch, save_stem_cache
+
+SLANGWORDS_PATH = os.path.join(os.path.dirname(__file__), '..', 'app', 'module', 'slangwords.json')
+
+
+@pytest.fixture(autouse=True)
+def reset_worker():
+    yield
+    preprocessing.init_worker(SLANGWORDS_PATH)  # Kembalikan stemmer global tanpa file cache untuk tes lain
+
+
+def test_new_stems_persist_to_next_run(tmp_path):
+    cache_path = str(tmp_path / 'stem_cache.sqlite')
+    results = preprocess_texts_batch([{'full_text': 'Mereka bekerja di luar negeri'}], SLANGWORDS_PATH, max_workers=1, stem_cache_path=cache_path)
+    assert results[0]['text_stem'] == 'kerja luar negeri'
+    assert load_stem_cache(cache_path)['bekerja'] == 'kerja'
+
+    preprocessing.init_worker(SLANGWORDS_PATH, cache_path)  # Run berikutnya memuat cache dari file
+    assert preprocessing.cached_stem('bekerja') == 'kerja'
+    assert preprocessing.new_stems_worker == {}  # Dilayani dari cache persisten
+    assert preprocessing.cached_stem('permainan') == 'main'
+    assert preprocessing.new_stems_worker == {'permainan': 'main'}
+    assert save_stem_cache(cache_path, preprocessing.new_stems_worker) == 1
+    assert load_stem_cache(cache_path) == {'bekerja': 'kerja', 'luar': 'luar', 'negeri': 'negeri', 'permainan': 'main'}
+
+
+def test_missing_cache_file(tmp_path):
+    cache_path = str(tmp_path / 'missing' / 'stem_cache.sqlite')
+    assert load_stem_cache(cache_path) == {}
+    assert load_stem_cache(None) == {}
+    assert save_stem_cache(None, {'bekerja': 'kerja'}) == 0
+    assert save_stem_cache(cache_path, {'bekerja': 'kerja'}) == 0  # Folder tidak ada: peringatan, bukan error
+    cache_path = str(tmp_path / 'stem_cache.sqlite')
+    assert save_stem_cache(cache_path, {'bekerja': 'kerja'}) == 1  # File dibuat saat pertama disimpan
+    assert load_stem_cache(cache_path) == {'bekerja': 'kerja'}
+
+
+def test_corrupt_cache_file_is_ignored(tmp_path):
+    cache_path = tmp_path / 'stem_cache.sqlite'
+    cache_path.write_bytes(b'bukan database sqlite' * 100)
+    assert load_stem_cache(str(cache_path)) == {}
+    assert save_stem_cache(str(cache_path), {'bekerja': 'kerja'}) == 0
+    results = preprocess_texts_batch([{'full_text': 'Mereka bekerja di luar negeri'}], SLANGWORDS_PATH, max_workers=1, stem_cache_path=str(cache_path))
+    assert results[0]['text_stem'] == 'kerja luar negeri'
+
+
+def test_single_text_stem_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(preprocessing, 'STEM_LRU_CACHE_SIZE', 3)
+    preprocessing.init_worker(SLANGWORDS_PATH)  # Seperti proses web: tanpa file cache stemming
+    for word in ['bekerja', 'permainan', 'pekerjaan', 'berlari', 'menulis', 'bekerja']:
+        preprocessing.cached_stem(word)
+    assert preprocessing.cached_stem('bekerja') == 'kerja'
+    assert preprocessing.cached_stem.cache_info().currsize == 3
+    assert preprocessing.new_stems_worker == {}  # Tidak ada file untuk menampung kata baru
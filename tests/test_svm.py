@@ -0,0 +1,160 @@
+import pickle
+
+import numpy as np
+import scipy.sparse as sp
+
+from app.module.svm import SupportVectorMachine
+
+
+def reference_fit(model, X, y):
+    # Pelatihan lama: satu kelas per kali, X diacak dan dipotong per batch setiap epoch
+    y = np.asarray(y)
+    model.classes_ = np.array(['positif', 'negatif', 'netral'])
+    counts = {cls: int(np.sum(y == cls)) for cls in model.classes_}
+    model.class_weights_ = {cls: len(y) / (3 * count) for cls, count in counts.items()}
+    w, b = {}, {}
+    for class_label in model.classes_:
+        w[class_label], b[class_label] = model._init_weights(X.shape[1]), 0.0
+        y_binary = np.where(y == class_label, 1, -1)
+        neg_weight = sum(w for c, w in model.class_weights_.items() if c != class_label) / 2
+        sample_weights = np.where(y_binary == 1, model.class_weights_[class_label], neg_weight)
+        for epoch in range(model.n_iters):
+            lr = model._get_learning_rate(epoch)
+            indices = np.random.permutation(X.shape[0])
+            X_shuffled, y_shuffled, w_shuffled = X[indices], y_binary[indices], sample_weights[indices]
+            for i in range(0, X.shape[0], model.batch_size):
+                _, grad_w, grad_b = model._hinge_loss(
+                    w[class_label], b[class_label],
+                    X_shuffled[i:i + model.batch_size], y_shuffled[i:i + model.batch_size], w_shuffled[i:i + model.batch_size])
+                w[class_label] -= lr * grad_w
+                b[class_label] -= lr * grad_b
+    model.W_ = np.column_stack([w[c] for c in model.classes_])
+    model.b_ = np.array([b[c] for c in model.classes_])
+    return model
+
+
+def synthetic_data(n=150, n_features=40, seed=0):
+    rng = np.random.RandomState(seed)
+    X = sp.random(n, n_features, density=0.15, format='lil', random_state=rng)
+    y = np.array(['positif', 'negatif', 'netral'])[rng.randint(0, 3, n)]
+    X[y == 'positif', 0] = 1.0
+    return sp.csr_matrix(X), y
+
+
+def test_fit_matches_per_class_reference():
+    X, y = synthetic_data()
+    params = dict(n_iters=15, batch_size=16, learning_rate=0.05, early_stopping=False)
+    model = SupportVectorMachine(**params).fit(X, y)
+    reference = reference_fit(SupportVectorMachine(**params), X, y)
+    for class_label in reference.classes_:
+        np.testing.assert_allclose(model.w[class_label], reference.w[class_label], rtol=1e-9, atol=1e-12)
+        np.testing.assert_allclose(model.b[class_label], reference.b[class_label], rtol=1e-9, atol=1e-12)
+    np.testing.assert_array_equal(model.predict(X), reference.predict(X))
+
+
+def test_fit_accepts_dense_input_and_uneven_last_batch():
+    X, y = synthetic_data(n=37)
+    sparse_model = SupportVectorMachine(n_iters=5, batch_size=8, early_stopping=False).fit(X, y)
+    dense_model = SupportVectorMachine(n_iters=5, batch_size=8, early_stopping=False).fit(X.toarray(), y)
+    for class_label in sparse_model.classes_:
+        np.testing.assert_allclose(dense_model.w[class_label], sparse_model.w[class_label])
+
+
+def test_early_stopping_records_epochs_and_loss_curve():
+    X, y = synthetic_data()
+    model = SupportVectorMachine(n_iters=500, learning_rate=0.05, tol=1e-3, n_iter_no_change=3).fit(X, y)
+    summary = model.training_summary()
+    for class_label in model.classes_:
+        epochs = summary['epochs_run'][class_label]
+        assert 3 <= epochs < 500
+        assert len(summary['loss_curve'][class_label]) == epochs + 1
+    full = SupportVectorMachine(n_iters=20, learning_rate=0.05, early_stopping=False).fit(X, y)
+    assert all(epochs == 20 for epochs in full.n_iter_.values())
+    assert all(len(curve) == 20 for curve in full.loss_curve_.values())
+
+
+def test_fit_leaves_global_rng_untouched():
+    X, y = synthetic_data()
+    for early_stopping in (True, False):
+        model = SupportVectorMachine(n_iters=30, learning_rate=0.05, tol=1e-3, n_iter_no_change=3, early_stopping=early_stopping)
+        before = np.random.get_state()[1].copy()
+        model.fit(X, y)
+        np.testing.assert_array_equal(np.random.get_state()[1], before)
+        again = SupportVectorMachine(**model.get_params()).fit(X, y)
+        np.testing.assert_array_equal(again.W_, model.W_)
+
+
+def test_early_stopping_with_validation_slice():
+    X, y = synthetic_data(n=200)
+    model = SupportVectorMachine(n_iters=300, learning_rate=0.05, tol=1e-3, n_iter_no_change=3,
+                                 validation_fraction=0.2).fit(X, y)
+    assert all(epochs < 300 for epochs in model.n_iter_.values())
+    assert model.get_params()['validation_fraction'] == 0.2
+
+
+def test_parallel_fit_identical_to_serial():
+    X, y = synthetic_data()
+    params = dict(n_iters=40, learning_rate=0.05, tol=1e-3, n_iter_no_change=3)
+    serial = SupportVectorMachine(n_jobs=1, **params).fit(X, y)
+    parallel = SupportVectorMachine(n_jobs=3, **params).fit(X, y)
+    for class_label in serial.classes_:
+        np.testing.assert_array_equal(parallel.w[class_label], serial.w[class_label])
+        assert parallel.b[class_label] == serial.b[class_label]
+        assert parallel.n_iter_[class_label] == serial.n_iter_[class_label]
+        assert parallel.loss_curve_[class_label] == serial.loss_curve_[class_label]
+
+
+def test_predict_uses_stacked_weights_and_loads_dict_layout_pickles():
+    X, y = synthetic_data()
+    model = SupportVectorMachine(n_iters=10, early_stopping=False).fit(X, y)
+    assert model.W_.shape == (X.shape[1], 3) and model.W_.flags['C_CONTIGUOUS']
+    per_class = np.column_stack([X.dot(model.w[c]) + model.b[c] for c in model.classes_])
+    np.testing.assert_allclose(model.decision_function(X), per_class)
+    # Pickle lama: bobot dalam dict per kelas, tanpa W_/b_
+    legacy_state = {k: v for k, v in model.__dict__.items() if k not in ('W_', 'b_')}
+    legacy_state['w'], legacy_state['b'] = dict(model.w), dict(model.b)
+    legacy = SupportVectorMachine.__new__(SupportVectorMachine)
+    legacy.__dict__.update(legacy_state)
+    restored = pickle.loads(pickle.dumps(legacy))
+    np.testing.assert_array_equal(restored.W_, model.W_)
+    np.testing.assert_array_equal(restored.predict(X), model.predict(X))
+    np.testing.assert_allclose(restored.predict_proba(X), model.predict_proba(X))
+
+
+def test_old_pickle_gets_new_constructor_attributes():
+    X, y = synthetic_data()
+    model = SupportVectorMachine(label_source='pakar', n_iters=10, early_stopping=False).fit(X, y)
+    added = ('early_stopping', 'tol', 'n_iter_no_change', 'validation_fraction', 'solver', 'n_jobs', 'n_iter_', 'loss_curve_')
+    old_state = {k: v for k, v in model.__dict__.items() if k not in added}
+    old = SupportVectorMachine.__new__(SupportVectorMachine)
+    old.__dict__.update(old_state)
+    restored = pickle.loads(pickle.dumps(old))
+    expected = SupportVectorMachine(label_source='pakar', n_iters=10).get_params()
+    assert restored.get_params() == expected
+    assert restored.training_summary() == {'epochs_run': {}, 'loss_curve': {}}
+    np.testing.assert_array_equal(restored.predict(X), model.predict(X))
+
+
+def test_dual_cd_reaches_small_duality_gap():
+    from app.module.svm import train_binary_dual_cd
+    X, y = synthetic_data(n=120)
+    y_binary = np.where(y == 'positif', 1.0, -1.0)
+    sample_weights = np.where(y_binary == 1, 1.5, 0.75)
+    lambda_param = 0.01
+    w, b, alpha, losses = train_binary_dual_cd(X, y_binary, sample_weights, lambda_param, np.random.RandomState(0), 1000, tol=1e-6)
+    C = 1 / (lambda_param * X.shape[0])
+    assert np.all(alpha >= 0) and np.all(alpha <= C * sample_weights + 1e-12)
+    norm = w @ w + b * b
+    primal = 0.5 * norm + C * np.sum(sample_weights * np.maximum(0, 1 - y_binary * (X @ w + b)))
+    dual = alpha.sum() - 0.5 * norm
+    assert primal - dual <= 1e-4 * primal
+    assert len(losses) < 1000
+
+
+def test_dual_cd_solver_fits_and_predicts():
+    X, y = synthetic_data()
+    model = SupportVectorMachine(solver='dual_cd').fit(X, y)
+    assert model.get_params()['solver'] == 'dual_cd'
+    assert model.W_.shape == (X.shape[1], 3)
+    assert all(n < model.n_iters for n in model.n_iter_.values())
+    assert np.mean(model.predict(X)[y == 'positif'] == 'positif') > 0.9
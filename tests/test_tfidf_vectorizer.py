@@ -0,0 +1,108 @@
+import random
+from collections import Counter
+
+import numpy as np
+import scipy.sparse as sp
+
+from app.module import tfidf_vectorizer as tfidf_module
+from app.module.tfidf_vectorizer import CustomTfidf, TokenizedCorpus
+
+
+def reference_transform(vectorizer, documents, normalize=True):
+    # Implementasi transform lama (per term, lewat COO) sebagai acuan
+    rows, cols, data = [], [], []
+    for doc_idx, doc in enumerate(documents):
+        tokens = doc.split() if isinstance(doc, str) else doc
+        ngrams = [' '.join(tokens[i:i + n]) for n in range(vectorizer.ngram_range[0], vectorizer.ngram_range[1] + 1)
+                  for i in range(len(tokens) - n + 1)]
+        for term, count in Counter(ngrams).items():
+            if term in vectorizer.vocabulary_:
+                rows.append(doc_idx)
+                cols.append(vectorizer.vocabulary_[term])
+                data.append((1 + np.log(count)) * vectorizer.idf_[vectorizer.vocabulary_[term]])
+    X = sp.csr_matrix((data, (rows, cols)), shape=(len(documents), len(vectorizer.vocabulary_)))
+    if not normalize:
+        return X
+    norms = np.sqrt(X.power(2).sum(axis=1))
+    norms[norms == 0] = 1.0
+    return sp.diags(1.0 / np.array(norms).ravel()) @ X
+
+
+def synthetic_documents(n, seed=0):
+    rng = random.Random(seed)
+    words = [f'kata{i}' for i in range(60)]
+    return [' '.join(rng.choice(words) for _ in range(rng.randint(0, 25))) for _ in range(n)]
+
+
+def test_transform_matches_reference():
+    documents = synthetic_documents(400)
+    vectorizer = CustomTfidf(max_features=300, ngram_range=(1, 2), min_df=2, max_df_ratio=0.9).fit(documents)
+    unseen = synthetic_documents(50, seed=1) + ['', 'tidak dikenal sama sekali']
+    for docs in (documents, unseen, [doc.split() for doc in unseen]):
+        for normalize in (True, False):
+            expected = reference_transform(vectorizer, docs, normalize).toarray()
+            np.testing.assert_allclose(vectorizer.transform(docs, normalize=normalize).toarray(), expected, rtol=1e-12)
+
+
+def test_generate_ngrams_order():
+    vectorizer = CustomTfidf(ngram_range=(1, 3))
+    assert vectorizer._generate_ngrams(['a', 'b', 'c']) == ['a', 'b', 'c', 'a b', 'b c', 'a b c']
+    assert vectorizer._generate_ngrams(['a']) == ['a']
+
+
+def test_hashing_mode_without_vocabulary():
+    documents = synthetic_documents(300)
+    vectorizer = CustomTfidf(ngram_range=(1, 2), min_df=2, n_buckets=512).fit(iter(documents))
+    X = vectorizer.transform(documents)
+    assert vectorizer.vocabulary_ == {}
+    assert X.shape == (300, 512)
+    np.testing.assert_allclose(sp.linalg.norm(X[X.getnnz(axis=1) > 0], axis=1), 1.0)
+    names = vectorizer.get_feature_names_out()
+    assert len(names) == 512 and 'kata1' in set(names)
+
+
+def test_hashing_mode_unsigned_matches_vocabulary_mode_without_collisions():
+    documents = synthetic_documents(200)
+    plain = CustomTfidf(max_features=10 ** 6, ngram_range=(1, 1), min_df=1, max_df_ratio=1.0).fit(documents)
+    hashed = CustomTfidf(ngram_range=(1, 1), min_df=1, max_df_ratio=1.0, n_buckets=2 ** 20, alternate_sign=False).fit(documents)
+    X_plain = plain.transform(documents, normalize=False)
+    X_hashed = hashed.transform(documents, normalize=False)
+    assert X_hashed.min() >= 0
+    for term, col in plain.vocabulary_.items():
+        bucket = int(hashed._hash_ngrams([term])[0][0])
+        np.testing.assert_allclose(X_hashed[:, bucket].toarray(), X_plain[:, col].toarray())
+
+
+def test_parallel_fit_identical_to_serial(monkeypatch):
+    monkeypatch.setattr(tfidf_module, 'PARALLEL_FIT_MIN_DOCS', 0)
+    documents = synthetic_documents(500)
+    serial = CustomTfidf(max_features=200, min_df=2, n_jobs=1).fit(documents)
+    parallel = CustomTfidf(max_features=200, min_df=2, n_jobs=3).fit(documents)
+    assert parallel.vocabulary_ == serial.vocabulary_
+    assert list(parallel.vocabulary_) == list(serial.vocabulary_)
+    np.testing.assert_array_equal(parallel.idf_, serial.idf_)
+
+
+def test_tokenized_corpus_reused_across_fit_and_transform(monkeypatch):
+    monkeypatch.setattr(tfidf_module, 'CORPUS_CACHE_MIN_DOCS', 0)
+    tfidf_module.clear_corpus_cache()
+    documents = synthetic_documents(300)
+    vectorizer = CustomTfidf(max_features=200, min_df=2)
+    corpus = vectorizer.tokenize(documents)
+    assert isinstance(corpus, TokenizedCorpus) and len(corpus) == 300
+    assert vectorizer.tokenize(list(documents)) is corpus
+    assert vectorizer.tokenize([doc.split() for doc in documents]) is not corpus
+    X = vectorizer.fit_transform(corpus, normalize=False)
+    np.testing.assert_allclose(X.toarray(), reference_transform(vectorizer, documents, False).toarray(), rtol=1e-12)
+    fresh = CustomTfidf(max_features=200, min_df=2).fit(synthetic_documents(300))
+    assert list(fresh.vocabulary_) == list(vectorizer.vocabulary_)
+    tfidf_module.clear_corpus_cache()
+
+
+def test_tokenized_corpus_merge_matches_single_pass():
+    documents = synthetic_documents(120)
+    single = TokenizedCorpus.from_documents(documents, (1, 2))
+    merged = TokenizedCorpus.merge([TokenizedCorpus.from_documents(documents[i:i + 50], (1, 2)) for i in range(0, 120, 50)])
+    assert merged.terms == single.terms
+    np.testing.assert_array_equal(merged.ids, single.ids)
+    np.testing.assert_array_equal(merged.doc_lengths, single.doc_lengths)
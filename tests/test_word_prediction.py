@@ -0,0 +1,29 @@
+import pytest
+
+import config
+from app import create_app
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch, save_models):
+    monkeypatch.setattr(config.DevelopmentConfig, 'SQLALCHEMY_DATABASE_URI', 'sqlite://')
+    monkeypatch.setattr(config.DevelopmentConfig, 'MODEL_FOLDER_PATH', str(tmp_path))
+    save_models(str(tmp_path), labels=['netral'] * 5, source='pakar')
+    return create_app('default').test_client()
+
+
+def test_form_offers_label_source(client):
+    page = client.get('/utils/word_prediction').get_data(as_text=True)
+    assert 'name="label_source"' in page
+    assert '<option value="pakar"' in page
+    assert 'name="model_choice"' in page
+
+
+def test_pakar_model_is_reachable(client):
+    page = client.post('/utils/word_prediction', data={
+        'input_text': 'kerja bagus', 'model_choice': 'Naive Bayes', 'label_source': 'pakar'}).get_data(as_text=True)
+    assert 'Netral' in page
+    assert '<option value="pakar" selected>' in page
+    page = client.post('/utils/word_prediction', data={
+        'input_text': 'kerja bagus', 'model_choice': 'Naive Bayes', 'label_source': 'otomatis'}).get_data(as_text=True)
+    assert 'belum tersedia' in page